@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import argparse
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from profile_utils import read_json, text_metrics, write_json
 
@@ -18,9 +23,38 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--endpoint", default=None)
     parser.add_argument("--model", default=None)
     parser.add_argument("--timeout", type=float, default=180.0)
+    parser.add_argument("--parallel", type=int, default=4, help="Clips transcribed concurrently.")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per clip on connection errors, 429 and 5xx.")
+    parser.add_argument("--backoff", type=float, default=0.5, help="Retry backoff factor in seconds.")
     return parser.parse_args()
 
 
+class SessionPool:
+    """One pooled, retrying requests.Session per worker thread."""
+
+    def __init__(self, retries: int, backoff: float):
+        self.retries = retries
+        self.backoff = backoff
+        self._local = threading.local()
+
+    def get(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            retry = Retry(
+                total=self.retries,
+                backoff_factor=self.backoff,
+                status_forcelist=(429, 500, 502, 503, 504),
+                # Transcription is idempotent, so POSTs are safe to retry
+                allowed_methods=None,
+                raise_on_status=False,
+            )
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(max_retries=retry))
+            session.mount("https://", HTTPAdapter(max_retries=retry))
+            self._local.session = session
+        return session
+
+
 def read_env_file(path: Path) -> dict[str, str]:
     values: dict[str, str] = {}
     if not path.exists():
@@ -93,17 +127,20 @@ def choose_model(cli_model: str | None, models: list[str]) -> str:
     return models[0] if models else "parakeet"
 
 
-def transcribe(endpoint: str, model: str, audio_path: str, timeout: float) -> tuple[str | None, str | None]:
+def transcribe(
+    session: requests.Session, endpoint: str, model: str, audio_path: str, timeout: float
+) -> tuple[str | None, str | None]:
     url = f"{endpoint}/audio/transcriptions"
     try:
         with open(audio_path, "rb") as audio_file:
-            response = requests.post(
+            response = session.post(
                 url,
                 data={"model": model, "response_format": "json"},
                 files={"file": (Path(audio_path).name, audio_file, "audio/wav")},
                 timeout=timeout,
             )
-    except requests.RequestException as exc:
+    except (OSError, requests.RequestException) as exc:
+        # A missing clip fails its own row instead of the whole pool
         return None, str(exc)
     if response.status_code >= 400:
         return None, f"HTTP {response.status_code}: {response.text[:1000]}"
@@ -117,23 +154,42 @@ def transcribe(endpoint: str, model: str, audio_path: str, timeout: float) -> tu
     return None, f"No transcript field in response: {payload}"
 
 
-def validate_set(label: str, results: dict[str, Any], endpoint: str, model: str, timeout: float) -> list[dict[str, Any]]:
-    rows = []
-    for record in results.get("records", []):
-        transcript, error = transcribe(endpoint, model, record["output_path"], timeout)
-        metric_values = text_metrics(record["input_text"], transcript or "") if transcript else None
-        rows.append(
-            {
-                "label": label,
-                "word_count": record["word_count"],
-                "audio_path": record["output_path"],
-                "input_text": record["input_text"],
-                "transcript": transcript,
-                "error": error,
-                "metrics": metric_values,
-            }
-        )
-    return rows
+def validate_record(
+    label: str, record: dict[str, Any], pool: SessionPool, endpoint: str, model: str, timeout: float
+) -> dict[str, Any]:
+    start = time.perf_counter()
+    transcript, error = transcribe(pool.get(), endpoint, model, record["output_path"], timeout)
+    elapsed = time.perf_counter() - start
+    metric_values = text_metrics(record["input_text"], transcript or "") if transcript else None
+    return {
+        "label": label,
+        "word_count": record["word_count"],
+        "audio_path": record["output_path"],
+        "input_text": record["input_text"],
+        "transcript": transcript,
+        "error": error,
+        "metrics": metric_values,
+        "transcribe_seconds": elapsed,
+    }
+
+
+def validate_sets(
+    sets: list[tuple[str, dict[str, Any]]], endpoint: str, model: str, args: argparse.Namespace
+) -> dict[str, list[dict[str, Any]]]:
+    """Transcribe every record of every set, ``--parallel`` clips at a time.
+
+    Rows keep the order of the records, whatever order the clips finish in.
+    """
+    pool = SessionPool(args.retries, args.backoff)
+    with ThreadPoolExecutor(max_workers=max(1, args.parallel)) as executor:
+        futures = {
+            label: [
+                executor.submit(validate_record, label, record, pool, endpoint, model, args.timeout)
+                for record in results.get("records", [])
+            ]
+            for label, results in sets
+        }
+        return {label: [future.result() for future in pending] for label, pending in futures.items()}
 
 
 def main() -> int:
@@ -144,8 +200,12 @@ def main() -> int:
     models, models_payload, models_error = get_models(endpoint, args.timeout)
     model = choose_model(args.model, models)
 
-    baseline_rows = validate_set("baseline", baseline, endpoint, model, args.timeout)
-    optimized_rows = validate_set("optimized", optimized, endpoint, model, args.timeout)
+    start = time.perf_counter()
+    rows = validate_sets([("baseline", baseline), ("optimized", optimized)], endpoint, model, args)
+    wall_time = time.perf_counter() - start
+    baseline_rows = rows["baseline"]
+    optimized_rows = rows["optimized"]
+    clips = len(baseline_rows) + len(optimized_rows)
     output = {
         "endpoint": endpoint,
         "endpoint_source": endpoint_source,
@@ -154,10 +214,14 @@ def main() -> int:
         "model_used": model,
         "baseline": baseline_rows,
         "optimized": optimized_rows,
+        "parallel": args.parallel,
+        "retries": args.retries,
+        "wall_time_seconds": wall_time,
     }
     write_json(args.output, output)
     print(f"ASR endpoint used: {endpoint} ({endpoint_source})")
     print(f"ASR model used: {model}")
+    print(f"Transcribed {clips} clips in {wall_time:.1f}s with {args.parallel} in parallel")
     print(f"Wrote ASR validation to {args.output}")
     errors = [row for row in baseline_rows + optimized_rows if row["error"]]
     return 1 if errors else 0
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+
+
+# (n_fft, hop) pairs for the multi-resolution STFT distance at 44.1 kHz
+DEFAULT_RESOLUTIONS = ((512, 128), (1024, 256), (2048, 512))
+
+# Metric -> (limit, "max" or "min"). Identical seeded output scores 0 on
+# every distance; the limits allow the drift of approximate optimizations
+# (e.g. INT8 weights or a few fewer steps) but not broken or silent audio.
+DEFAULT_TOLERANCES: dict[str, tuple[float, str]] = {
+    "duration_ratio_error": (0.05, "max"),
+    "spectral_convergence": (0.5, "max"),
+    "log_magnitude_distance": (2.0, "max"),
+    "mel_cepstral_distortion_db": (8.0, "max"),
+    "envelope_correlation": (0.9, "min"),
+    "envelope_mae_db": (3.0, "max"),
+}
+
+
+def load_wav(path: str | Path) -> tuple[np.ndarray, int]:
+    audio, sample_rate = sf.read(str(path), dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return audio, sample_rate
+
+
+def stft_magnitude(audio: np.ndarray, n_fft: int, hop: int) -> np.ndarray:
+    """Magnitude spectrogram, shape (frames, n_fft // 2 + 1), Hann window."""
+    if len(audio) < n_fft:
+        audio = np.pad(audio, (0, n_fft - len(audio)))
+    frames = np.lib.stride_tricks.sliding_window_view(audio, n_fft)[::hop]
+    return np.abs(np.fft.rfft(frames * np.hanning(n_fft), axis=1)).astype(np.float32)
+
+
+def align_frames(frames: np.ndarray, count: int) -> np.ndarray:
+    """Linearly resample ``frames`` along time to ``count`` frames.
+
+    A linear time normalization instead of DTW: cheap, and enough because
+    duration changes are checked on their own.
+    """
+    if len(frames) == count:
+        return frames
+    source = np.linspace(0.0, 1.0, len(frames))
+    target = np.linspace(0.0, 1.0, count)
+    return np.stack([np.interp(target, source, frames[:, column]) for column in range(frames.shape[1])], axis=1)
+
+
+def multi_resolution_stft_distance(
+    reference: np.ndarray, candidate: np.ndarray, resolutions: tuple[tuple[int, int], ...] = DEFAULT_RESOLUTIONS
+) -> dict[str, float]:
+    """Spectral convergence and mean absolute log-magnitude difference, averaged over resolutions."""
+    convergence = []
+    log_distance = []
+    for n_fft, hop in resolutions:
+        ref = stft_magnitude(reference, n_fft, hop)
+        cand = align_frames(stft_magnitude(candidate, n_fft, hop), len(ref))
+        convergence.append(float(np.linalg.norm(cand - ref) / max(np.linalg.norm(ref), 1e-8)))
+        log_distance.append(float(np.mean(np.abs(np.log(cand + 1e-5) - np.log(ref + 1e-5)))))
+    return {
+        "spectral_convergence": float(np.mean(convergence)),
+        "log_magnitude_distance": float(np.mean(log_distance)),
+    }
+
+
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int = 80, fmax: float | None = None) -> np.ndarray:
+    """Slaney-style triangular mel filters up to ``fmax``, shape (n_mels, n_fft // 2 + 1)."""
+
+    def hz_to_mel(hz: np.ndarray) -> np.ndarray:
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel: np.ndarray) -> np.ndarray:
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    edges = mel_to_hz(np.linspace(hz_to_mel(np.array(0.0)), hz_to_mel(np.array(fmax or sample_rate / 2)), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    filters = np.maximum(0.0, np.minimum(rising, falling))
+    return filters * (2.0 / (upper - lower))
+
+
+def mel_cepstrum(
+    audio: np.ndarray,
+    sample_rate: int,
+    n_fft: int = 2048,
+    hop: int = 512,
+    n_mels: int = 40,
+    order: int = 24,
+    fmax: float = 8000.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Mel cepstral coefficients 1..order (c0, the energy term, is dropped) and per-frame energy in dB.
+
+    Only the speech band up to ``fmax`` is used, as usual for MCD, so noise
+    in the near-empty top octaves of 44.1 kHz audio does not dominate.
+    """
+    power = stft_magnitude(audio, n_fft, hop) ** 2
+    mel_power = power @ mel_filterbank(sample_rate, n_fft, n_mels, fmax).T
+    # Log amplitude, floored 60 dB below the loudest band so silence stays finite
+    log_mel = 0.5 * np.log(np.maximum(mel_power, mel_power.max() * 1e-6 + 1e-12))
+    # Orthonormal DCT-II over the mel axis
+    k = np.arange(n_mels)
+    basis = np.cos(np.pi / n_mels * (k[None, :] + 0.5) * np.arange(order + 1)[:, None]) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    energy_db = 10.0 * np.log10(power.sum(axis=1) + 1e-12)
+    return (log_mel @ basis.T)[:, 1:], energy_db
+
+
+def mel_cepstral_distortion(reference: np.ndarray, candidate: np.ndarray, sample_rate: int, floor_db: float = 50.0) -> float:
+    """Mean MCD in dB over time-normalized speech frames.
+
+    Frames more than ``floor_db`` below the loudest reference frame are
+    skipped, as pauses carry no spectral envelope worth comparing.
+    """
+    ref, energy_db = mel_cepstrum(reference, sample_rate)
+    cand, _ = mel_cepstrum(candidate, sample_rate)
+    cand = align_frames(cand, len(ref))
+    speech = energy_db > energy_db.max() - floor_db
+    # The natural-log cepstra are converted to the dB scale used for MCD
+    per_frame = (10.0 / np.log(10.0)) * np.sqrt(2.0 * np.sum((ref - cand) ** 2, axis=1))
+    return float(np.mean(per_frame[speech]))
+
+
+def energy_envelope_db(audio: np.ndarray, sample_rate: int, frame_seconds: float = 0.02) -> np.ndarray:
+    frame = max(1, int(sample_rate * frame_seconds))
+    usable = len(audio) // frame * frame
+    if usable == 0:
+        return np.array([-120.0])
+    rms = np.sqrt(np.mean(audio[:usable].reshape(-1, frame) ** 2, axis=1))
+    return 20.0 * np.log10(rms + 1e-6)
+
+
+def envelope_metrics(reference: np.ndarray, candidate: np.ndarray, sample_rate: int, floor_db: float = 50.0) -> dict[str, float]:
+    """Correlation and mean absolute dB difference of the energy envelopes.
+
+    Frames more than ``floor_db`` below the loudest reference frame are
+    ignored so near-silence does not dominate the difference.
+    """
+    ref = energy_envelope_db(reference, sample_rate)
+    cand = align_frames(energy_envelope_db(candidate, sample_rate)[:, None], len(ref))[:, 0]
+    voiced = ref > ref.max() - floor_db
+    if voiced.sum() < 2:
+        return {"envelope_correlation": 0.0, "envelope_mae_db": float("inf")}
+    if np.std(cand[voiced]) == 0 or np.std(ref[voiced]) == 0:
+        correlation = 0.0
+    else:
+        correlation = np.corrcoef(ref[voiced], cand[voiced])[0, 1]
+    return {
+        "envelope_correlation": float(np.nan_to_num(correlation)),
+        "envelope_mae_db": float(np.mean(np.abs(ref[voiced] - cand[voiced]))),
+    }
+
+
+def compare_audio(reference: np.ndarray, candidate: np.ndarray, sample_rate: int) -> dict[str, float]:
+    """Every quality metric of ``candidate`` against ``reference``."""
+    reference_seconds = len(reference) / sample_rate
+    candidate_seconds = len(candidate) / sample_rate
+    metrics: dict[str, float] = {
+        "reference_seconds": reference_seconds,
+        "candidate_seconds": candidate_seconds,
+        "duration_ratio_error": abs(candidate_seconds / reference_seconds - 1.0) if reference_seconds else float("inf"),
+    }
+    if len(candidate) == 0:
+        metrics.update(
+            {
+                "spectral_convergence": float("inf"),
+                "log_magnitude_distance": float("inf"),
+                "mel_cepstral_distortion_db": float("inf"),
+                "envelope_correlation": 0.0,
+                "envelope_mae_db": float("inf"),
+            }
+        )
+        return metrics
+    metrics.update(multi_resolution_stft_distance(reference, candidate))
+    metrics["mel_cepstral_distortion_db"] = mel_cepstral_distortion(reference, candidate, sample_rate)
+    metrics.update(envelope_metrics(reference, candidate, sample_rate))
+    return metrics
+
+
+def tolerance_failures(metrics: dict[str, float], tolerances: dict[str, tuple[float, str]] = DEFAULT_TOLERANCES) -> list[str]:
+    failures = []
+    for name, (limit, kind) in tolerances.items():
+        value = metrics.get(name)
+        if value is None:
+            continue
+        if (kind == "max" and not value <= limit) or (kind == "min" and not value >= limit):
+            failures.append(f"{name}={value:.4g} ({kind} {limit:g})")
+    return failures
+
+
+def compare_files(reference_path: str | Path, candidate_path: str | Path) -> dict[str, Any]:
+    reference, sample_rate = load_wav(reference_path)
+    candidate, candidate_rate = load_wav(candidate_path)
+    if candidate_rate != sample_rate:
+        raise ValueError(f"Sample rate mismatch: {reference_path} {sample_rate} Hz, {candidate_path} {candidate_rate} Hz")
+    return compare_audio(reference, candidate, sample_rate)
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from profile_utils import TEST_TEXTS, collect_environment, percentile, write_json
+
+
+SCRIPT_REPO_ROOT = Path(__file__).resolve().parents[1]
+TARGET_REPO_ROOT = Path(os.getenv("SUPERTONIC_REPO_ROOT", str(SCRIPT_REPO_ROOT))).resolve()
+PY_ROOT = TARGET_REPO_ROOT / "py"
+
+# Environment the tuner controls; inherited values would override the candidate
+TUNED_ENV = (
+    "OMP_NUM_THREADS",
+    "ORT_INTRA_OP_NUM_THREADS",
+    "ORT_INTER_OP_NUM_THREADS",
+    "ORT_EXECUTION_MODE",
+    "SUPERTONIC_ORT_PROFILE",
+    "SUPERTONIC_CPU_AFFINITY",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Sweep ONNX Runtime threading, affinity, concurrency and batch size; write the best as a tuning profile."
+    )
+    parser.add_argument("--onnx-dir", default=str(TARGET_REPO_ROOT / "assets"))
+    parser.add_argument("--profile", default="ort_profile.json", help="Tuning profile to write (load it with SUPERTONIC_ORT_PROFILE).")
+    parser.add_argument("--results", default=None, help="Optional JSON with every measured configuration.")
+    parser.add_argument(
+        "--objective",
+        choices=["throughput", "latency"],
+        default="throughput",
+        help="throughput: audio seconds per wall second under concurrency/batching. "
+        "latency: mean single-request latency (concurrency and batch size stay 1).",
+    )
+    parser.add_argument("--intra-threads", default=None, help="Comma-separated intra-op thread counts (default: powers of two up to the CPU count, plus the physical core count).")
+    parser.add_argument("--inter-threads", default="1,2", help="Comma-separated inter-op thread counts; >1 runs with ORT_PARALLEL.")
+    parser.add_argument("--concurrency", default="1,2,4", help="Comma-separated inference_concurrency values.")
+    parser.add_argument("--batch-sizes", default="1,2,4", help="Comma-separated texts per generate() call.")
+    parser.add_argument(
+        "--affinity-sets",
+        default=None,
+        help="Semicolon-separated taskset-style CPU lists to try, e.g. '0-7;0-15' for P-cores vs all "
+        "(default: all allowed CPUs and one hyperthread per physical core).",
+    )
+    parser.add_argument("--words", default="20,50", help="TEST_TEXTS word counts forming the workload.")
+    parser.add_argument("--requests", type=int, default=8, help="generate() calls measured per configuration.")
+    parser.add_argument("--steps", type=int, default=15)
+    parser.add_argument("--voice", default="M1")
+    parser.add_argument("--timeout", type=float, default=900.0, help="Seconds before a configuration is abandoned.")
+    parser.add_argument("--package-manager", default="uv")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def parse_ints(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def parse_cpu_list(value: str) -> list[int]:
+    cpus: set[int] = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def allowed_cpus() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def one_thread_per_core(cpus: list[int]) -> list[int]:
+    """First hyperthread sibling of each physical core among ``cpus``."""
+    chosen = []
+    seen: set[str] = set()
+    for cpu in cpus:
+        path = Path(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list")
+        try:
+            siblings = path.read_text().strip()
+        except OSError:
+            return cpus
+        if siblings not in seen:
+            seen.add(siblings)
+            chosen.append(cpu)
+    return chosen
+
+
+def affinity_candidates(args: argparse.Namespace) -> dict[str, list[int]]:
+    if args.affinity_sets:
+        return {spec.strip(): parse_cpu_list(spec) for spec in args.affinity_sets.split(";") if spec.strip()}
+    cpus = allowed_cpus()
+    candidates = {"all": cpus}
+    physical = one_thread_per_core(cpus)
+    if physical != cpus:
+        candidates["one_per_core"] = physical
+    return candidates
+
+
+def intra_candidates(args: argparse.Namespace, cpu_count: int, physical_cores: int) -> list[int]:
+    if args.intra_threads:
+        return parse_ints(args.intra_threads)
+    values = {physical_cores, cpu_count}
+    value = 1
+    while value < cpu_count:
+        values.add(value)
+        value *= 2
+    return sorted(values)
+
+
+def workload(words: list[int]) -> list[str]:
+    by_words = {sample["word_count"]: sample["text"] for sample in TEST_TEXTS}
+    missing = [count for count in words if count not in by_words]
+    if missing:
+        raise SystemExit(f"No TEST_TEXTS entry with word_count {missing}; choose from {sorted(by_words)}")
+    return [by_words[count] for count in words]
+
+
+def run_worker(config: dict[str, Any]) -> dict[str, Any]:
+    """Measure one configuration; runs in a fresh process set up by measure()."""
+    sys.path.insert(0, str(PY_ROOT))
+    from helper import load_text_to_speech
+
+    if config["cpu_affinity"] and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, config["cpu_affinity"])
+    tts = load_text_to_speech(config["onnx_dir"], use_gpu=False, backend="cpu")
+    texts = config["texts"]
+    batch_size = config["batch_size"]
+    calls = [
+        [texts[(index * batch_size + offset) % len(texts)] for offset in range(batch_size)]
+        for index in range(config["requests"])
+    ]
+
+    def generate(batch: list[str]) -> float:
+        audio = tts.generate(batch, voice=config["voice"], steps=config["steps"])
+        return sum(len(wav) for wav in audio) / tts.sample_rate
+
+    for batch in calls[: config["concurrency"]]:
+        generate(batch)
+
+    latencies: list[float] = []
+    audio_seconds = 0.0
+    lock = threading.Lock()
+    pending = list(calls)
+
+    def loop() -> None:
+        nonlocal audio_seconds
+        while True:
+            with lock:
+                if not pending:
+                    return
+                batch = pending.pop()
+            start = time.perf_counter()
+            seconds = generate(batch)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                audio_seconds += seconds
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=loop) for _ in range(config["concurrency"])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    return {
+        "wall_seconds": wall,
+        "audio_seconds": audio_seconds,
+        "throughput_audio_per_second": audio_seconds / wall if wall else None,
+        "latency_mean_seconds": sum(latencies) / len(latencies),
+        "latency_p50_seconds": percentile(latencies, 50),
+        "latency_p95_seconds": percentile(latencies, 95),
+    }
+
+
+def measure(args: argparse.Namespace, candidate: dict[str, Any], texts: list[str]) -> dict[str, Any]:
+    env = {key: value for key, value in os.environ.items() if key not in TUNED_ENV}
+    env["ORT_INTRA_OP_NUM_THREADS"] = str(candidate["intra_op_num_threads"])
+    env["ORT_INTER_OP_NUM_THREADS"] = str(candidate["inter_op_num_threads"])
+    env["ORT_EXECUTION_MODE"] = "1" if candidate["execution_mode"] == "parallel" else "0"
+    config = {
+        **candidate,
+        "onnx_dir": args.onnx_dir,
+        "texts": texts,
+        "requests": args.requests,
+        "steps": args.steps,
+        "voice": args.voice,
+    }
+    result = dict(candidate)
+    try:
+        completed = subprocess.run(
+            [sys.executable, __file__, "--worker", json.dumps(config)],
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=args.timeout,
+        )
+    except subprocess.TimeoutExpired:
+        result["error"] = f"timed out after {args.timeout:g}s"
+        return result
+    if completed.returncode != 0:
+        result["error"] = completed.stderr.strip().splitlines()[-1:] or ["worker failed"]
+        return result
+    result.update(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return result
+
+
+def score(result: dict[str, Any], objective: str) -> float:
+    """Higher is better; failed configurations rank last."""
+    if "error" in result:
+        return float("-inf")
+    if objective == "latency":
+        return -result["latency_mean_seconds"]
+    return result["throughput_audio_per_second"]
+
+
+def describe(candidate: dict[str, Any]) -> str:
+    return (
+        f"intra={candidate['intra_op_num_threads']} inter={candidate['inter_op_num_threads']} "
+        f"mode={candidate['execution_mode']} affinity={candidate['affinity']} "
+        f"concurrency={candidate['concurrency']} batch={candidate['batch_size']}"
+    )
+
+
+def tune(args: argparse.Namespace) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Coordinate search: threads and mode, then affinity, then concurrency, then batch size.
+
+    Each stage keeps the best configuration of the previous ones, so the
+    sweep costs the sum rather than the product of the candidate counts.
+    """
+    texts = workload(parse_ints(args.words))
+    affinities = affinity_candidates(args)
+    cpus = allowed_cpus()
+    physical_cores = len(one_thread_per_core(cpus))
+    measured: list[dict[str, Any]] = []
+    cache: dict[str, dict[str, Any]] = {}
+
+    def evaluate(candidate: dict[str, Any], stage: str) -> dict[str, Any]:
+        key = describe(candidate)
+        if key not in cache:
+            print(f"[{stage}] {key}", flush=True)
+            result = measure(args, candidate, texts)
+            result["stage"] = stage
+            cache[key] = result
+            measured.append(result)
+            if "error" in result:
+                print(f"    failed: {result['error']}")
+            else:
+                print(
+                    f"    {result['throughput_audio_per_second']:.2f} audio s/s, "
+                    f"mean latency {result['latency_mean_seconds']:.3f}s"
+                )
+        return cache[key]
+
+    def best_of(candidates: list[dict[str, Any]], stage: str) -> dict[str, Any]:
+        results = [evaluate(candidate, stage) for candidate in candidates]
+        return max(results, key=lambda result: score(result, args.objective))
+
+    best: dict[str, Any] = {
+        "intra_op_num_threads": physical_cores,
+        "inter_op_num_threads": 1,
+        "execution_mode": "sequential",
+        "affinity": "all" if "all" in affinities else next(iter(affinities)),
+        "cpu_affinity": None,
+        "concurrency": 1,
+        "batch_size": 1,
+    }
+    best["cpu_affinity"] = affinities[best["affinity"]]
+
+    def keys(result: dict[str, Any]) -> dict[str, Any]:
+        return {key: result[key] for key in best}
+
+    threads = [
+        {
+            **best,
+            "intra_op_num_threads": intra,
+            "inter_op_num_threads": inter,
+            "execution_mode": "parallel" if inter > 1 else "sequential",
+        }
+        for intra in intra_candidates(args, len(cpus), physical_cores)
+        for inter in parse_ints(args.inter_threads)
+    ]
+    best = keys(best_of(threads, "threads"))
+    pinned = [{**best, "affinity": name, "cpu_affinity": cpu_list} for name, cpu_list in affinities.items()]
+    best = keys(best_of(pinned, "affinity"))
+    if args.objective == "throughput":
+        # Concurrent sessions share the cores, so also try splitting the intra-op threads
+        concurrency = []
+        for workers in parse_ints(args.concurrency):
+            concurrency.append({**best, "concurrency": workers})
+            split = max(1, best["intra_op_num_threads"] // workers)
+            if split != best["intra_op_num_threads"]:
+                concurrency.append({**best, "concurrency": workers, "intra_op_num_threads": split})
+        best = keys(best_of(concurrency, "concurrency"))
+        best = keys(best_of([{**best, "batch_size": size} for size in parse_ints(args.batch_sizes)], "batch"))
+    return cache[describe(best)], measured
+
+
+def build_profile(best: dict[str, Any], args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "kind": "ort_profile",
+        "created_at_unix": time.time(),
+        "objective": args.objective,
+        "session_options": {
+            "intra_op_num_threads": best["intra_op_num_threads"],
+            "inter_op_num_threads": best["inter_op_num_threads"],
+            "execution_mode": best["execution_mode"],
+        },
+        # Pinning to every allowed CPU is left to the deployment's own mask
+        "cpu_affinity": None if best["affinity"] == "all" else best["cpu_affinity"],
+        "inference_concurrency": best["concurrency"],
+        # generate() batch size that gave the best throughput (for batch callers;
+        # the API server synthesizes one request per call)
+        "batch_size": best["batch_size"],
+        "measurement": {
+            key: best[key]
+            for key in ("throughput_audio_per_second", "latency_mean_seconds", "latency_p50_seconds", "latency_p95_seconds")
+        },
+        "workload": {"words": parse_ints(args.words), "steps": args.steps, "requests": args.requests},
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    if args.worker is not None:
+        print(json.dumps(run_worker(json.loads(args.worker))))
+        return 0
+
+    best, measured = tune(args)
+    if "error" in best:
+        print("Every configuration failed; no profile written.")
+        return 1
+
+    profile = build_profile(best, args)
+    environment = collect_environment(command=" ".join(sys.argv), package_manager=args.package_manager)
+    profile["host"] = {key: environment.get(key) for key in ("os", "machine", "cpu_model", "cpu_count") if key in environment}
+    write_json(args.profile, profile)
+    if args.results:
+        write_json(args.results, {"kind": "autotune", "best": best, "measured": measured, "environment": environment})
+
+    print(f"Best: {describe(best)}")
+    print(f"Wrote tuning profile to {args.profile}; start the server with SUPERTONIC_ORT_PROFILE={args.profile}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import soundfile as sf
+
+from profile_utils import collect_environment, write_json
+
+
+SCRIPT_REPO_ROOT = Path(__file__).resolve().parents[1]
+TARGET_REPO_ROOT = Path(os.getenv("SUPERTONIC_REPO_ROOT", str(SCRIPT_REPO_ROOT))).resolve()
+PY_ROOT = TARGET_REPO_ROOT / "py"
+if str(PY_ROOT) not in sys.path:
+    sys.path.insert(0, str(PY_ROOT))
+
+from api.src.services.audio_converter import ENCODER_BACKENDS  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark per-chunk audio encoder backends.")
+    parser.add_argument(
+        "--inputs",
+        nargs="+",
+        default=sorted(str(path) for path in (SCRIPT_REPO_ROOT / "benchmarks" / "optimized").glob("*.wav")),
+        help="WAV files used as synthesized chunks.",
+    )
+    parser.add_argument("--formats", nargs="+", default=["mp3", "opus", "flac"])
+    parser.add_argument("--backends", nargs="+", default=sorted(ENCODER_BACKENDS))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--results", required=True)
+    parser.add_argument("--package-manager", default="uv")
+    return parser.parse_args()
+
+
+def children_cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def load_chunks(paths: list[str]) -> list[dict[str, Any]]:
+    chunks = []
+    for path in paths:
+        data, sample_rate = sf.read(path, dtype="float32")
+        buffer = io.BytesIO()
+        sf.write(buffer, data, sample_rate, format="WAV")
+        chunks.append(
+            {
+                "path": path,
+                "wav_bytes": buffer.getvalue(),
+                "sample_rate": sample_rate,
+                "audio_duration_seconds": len(data) / sample_rate,
+            }
+        )
+    return chunks
+
+
+def bench_backend(backend: Any, output_format: str, chunk: dict[str, Any], repeats: int) -> dict[str, Any]:
+    latencies = []
+    cpu_times = []
+    output_bytes = 0
+    error = None
+    for _ in range(repeats):
+        cpu_start = time.process_time() + children_cpu_seconds()
+        start = time.perf_counter()
+        try:
+            output = backend.encode(chunk["wav_bytes"], output_format, chunk["sample_rate"])
+        except Exception as exc:  # noqa: BLE001 - recorded in the results
+            error = str(exc)
+            break
+        latencies.append(time.perf_counter() - start)
+        cpu_times.append(time.process_time() + children_cpu_seconds() - cpu_start)
+        output_bytes = len(output)
+
+    return {
+        "backend": backend.name,
+        "format": output_format,
+        "input_path": chunk["path"],
+        "audio_duration_seconds": chunk["audio_duration_seconds"],
+        "repeats": len(latencies),
+        "median_latency_seconds": statistics.median(latencies) if latencies else None,
+        "min_latency_seconds": min(latencies) if latencies else None,
+        "median_cpu_seconds": statistics.median(cpu_times) if cpu_times else None,
+        "output_bytes": output_bytes if latencies else None,
+        "error": error,
+    }
+
+
+def summarize(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    grouped: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for row in rows:
+        if row["error"] is None:
+            grouped.setdefault((row["backend"], row["format"]), []).append(row)
+
+    summary = []
+    for (backend, output_format), group in sorted(grouped.items()):
+        summary.append(
+            {
+                "backend": backend,
+                "format": output_format,
+                "chunks": len(group),
+                "mean_latency_seconds": statistics.mean(row["median_latency_seconds"] for row in group),
+                "mean_cpu_seconds": statistics.mean(row["median_cpu_seconds"] for row in group),
+                "latency_per_audio_second": sum(row["median_latency_seconds"] for row in group)
+                / sum(row["audio_duration_seconds"] for row in group),
+            }
+        )
+    return summary
+
+
+def main() -> int:
+    args = parse_args()
+    chunks = load_chunks(args.inputs)
+    if not chunks:
+        print("No input WAV files found; pass --inputs")
+        return 1
+
+    rows = []
+    for name in args.backends:
+        backend = ENCODER_BACKENDS.get(name)
+        if backend is None:
+            print(f"Skipping unknown backend {name}")
+            continue
+        for output_format in args.formats:
+            if not backend.supports(output_format):
+                continue
+            # Warm up once so lazy library loading is not measured.
+            try:
+                backend.encode(chunks[0]["wav_bytes"], output_format, chunks[0]["sample_rate"])
+            except Exception as exc:  # noqa: BLE001
+                print(f"{name}/{output_format} unavailable: {exc}")
+                continue
+            for chunk in chunks:
+                rows.append(bench_backend(backend, output_format, chunk, args.repeats))
+
+    summary = summarize(rows)
+    write_json(
+        args.results,
+        {
+            "created_at_unix": time.time(),
+            "environment": collect_environment(
+                command=" ".join(sys.argv),
+                package_manager=args.package_manager,
+                repo_root=TARGET_REPO_ROOT,
+            ),
+            "records": rows,
+            "summary": summary,
+        },
+    )
+    for row in summary:
+        print(
+            f"{row['backend']:>10} {row['format']:>5}: "
+            f"{row['mean_latency_seconds'] * 1000:.2f} ms/chunk, "
+            f"{row['mean_cpu_seconds'] * 1000:.2f} ms CPU/chunk"
+        )
+    print(f"Wrote results to {args.results}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
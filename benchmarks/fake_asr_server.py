@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import soundfile as sf
+
+from profile_utils import read_json
+
+
+MODEL_ID = "parakeet-stand-in"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Stand-in for the Parakeet ASR server: the OpenAI-style transcription route, without a model."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5092)
+    parser.add_argument(
+        "--results",
+        nargs="*",
+        default=[],
+        help="tts_benchmark.py results whose WAVs are 'transcribed' as their input text; other audio gets --unknown-text.",
+    )
+    parser.add_argument("--unknown-text", default="", help="Transcript for audio that is not in --results.")
+    parser.add_argument("--realtime-factor", type=float, default=50.0, help="Audio seconds 'transcribed' per second of sleep (0: no delay).")
+    parser.add_argument("--max-concurrency", type=int, default=4, help="Requests served at once; the rest queue, like a GPU-bound server.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503, to exercise client retries.")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def audio_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_transcripts(paths: list[str]) -> dict[str, str]:
+    """sha256 of each generated WAV -> the text it was synthesized from."""
+    transcripts = {}
+    for path in paths:
+        for record in read_json(path).get("records", []):
+            audio_path = Path(record["output_path"])
+            if audio_path.exists():
+                transcripts[audio_key(audio_path.read_bytes())] = record["input_text"]
+    return transcripts
+
+
+def parse_multipart(content_type: str, body: bytes) -> dict[str, Any]:
+    """Form fields as str and uploaded files as bytes."""
+    message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    fields: dict[str, Any] = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True) or b""
+        fields[name] = payload if part.get_filename() else payload.decode("utf-8", errors="replace")
+    return fields
+
+
+class FakeASRServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], args: argparse.Namespace):
+        super().__init__(address, FakeASRHandler)
+        self.transcripts = load_transcripts(args.results)
+        self.unknown_text = args.unknown_text
+        self.realtime_factor = args.realtime_factor
+        self.error_rate = args.error_rate
+        self.slots = threading.Semaphore(max(1, args.max_concurrency))
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "errors_injected": 0, "unknown_audio": 0}
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.stats[key] += 1
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+
+class FakeASRHandler(BaseHTTPRequestHandler):
+    server: FakeASRServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def send_json(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/v1/models":
+            self.send_json(200, {"object": "list", "data": [{"id": MODEL_ID, "object": "model"}]})
+        elif self.path.rstrip("/") == "/stats":
+            self.send_json(200, self.server.stats)
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown route {self.path}"}})
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/v1/audio/transcriptions":
+            self.send_json(404, {"error": {"message": f"Unknown route {self.path}"}})
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.count("requests")
+        if self.server.should_fail():
+            self.server.count("errors_injected")
+            self.send_json(503, {"error": {"message": "Injected failure"}})
+            return
+        fields = parse_multipart(self.headers.get("Content-Type", ""), body)
+        audio = fields.get("file")
+        if not isinstance(audio, bytes):
+            self.send_json(400, {"error": {"message": "Missing file field"}})
+            return
+        try:
+            duration = sf.info(io.BytesIO(audio)).duration
+        except RuntimeError as exc:
+            self.send_json(400, {"error": {"message": f"Unreadable audio: {exc}"}})
+            return
+
+        text = self.server.transcripts.get(audio_key(audio))
+        if text is None:
+            self.server.count("unknown_audio")
+            text = self.server.unknown_text
+        with self.server.slots:
+            if self.server.realtime_factor > 0:
+                time.sleep(duration / self.server.realtime_factor)
+        if fields.get("response_format") == "text":
+            payload = text.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        self.send_json(200, {"text": text, "duration": duration, "model": fields.get("model", MODEL_ID)})
+
+
+def main() -> int:
+    args = parse_args()
+    server = FakeASRServer((args.host, args.port), args)
+    print(f"Stand-in ASR on http://{args.host}:{args.port}/v1 with {len(server.transcripts)} known clips")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
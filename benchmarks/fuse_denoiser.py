@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import onnx
+import onnxruntime as ort
+from onnx import TensorProto, external_data_helper, helper as onnx_helper
+
+from profile_utils import TEST_TEXTS, collect_environment, write_json
+from split_denoiser import RecordingDenoiser, save, split_denoiser
+
+
+SCRIPT_REPO_ROOT = Path(__file__).resolve().parents[1]
+TARGET_REPO_ROOT = Path(os.getenv("SUPERTONIC_REPO_ROOT", str(SCRIPT_REPO_ROOT))).resolve()
+PY_ROOT = TARGET_REPO_ROOT / "py"
+if str(PY_ROOT) not in sys.path:
+    sys.path.insert(0, str(PY_ROOT))
+
+from helper import SupertonicTTS  # noqa: E402
+
+
+LATENTS = "noisy_latents"
+TIMESTEP = "timestep"
+OUTPUT = "denoised_latents"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Wrap latent_denoiser.onnx in an ONNX Loop so a block of denoising steps is one session call."
+    )
+    parser.add_argument("--onnx-dir", default=str(TARGET_REPO_ROOT / "assets"), help="The fused model is written to <onnx-dir>/onnx.")
+    parser.add_argument(
+        "--precision",
+        choices=list(SupertonicTTS.PRECISIONS),
+        default="fp32",
+        help="Which denoiser file to fuse (INT8 variants come from quantize.py).",
+    )
+    parser.add_argument(
+        "--no-hoist",
+        action="store_true",
+        help="Keep the per-request conditioning inside the loop instead of computing it once before it.",
+    )
+    parser.add_argument("--skip-verification", action="store_true")
+    parser.add_argument("--voice", default="M1")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--steps", type=int, default=15)
+    parser.add_argument("--speed", type=float, default=1.05)
+    parser.add_argument("--seed", type=int, default=20260502)
+    parser.add_argument("--repeats", type=int, default=5, help="Timed denoising passes per sample (best is kept).")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="Largest allowed absolute difference from the step-by-step loop.")
+    parser.add_argument("--results", default=None, help="Optional JSON with the fusion and verification details.")
+    parser.add_argument("--package-manager", default="uv")
+    return parser.parse_args()
+
+
+def rename(nodes: list[onnx.NodeProto], mapping: dict[str, str]) -> None:
+    """Rename tensors in place, including references from control-flow bodies."""
+    for node in nodes:
+        node.input[:] = [mapping.get(name, name) for name in node.input]
+        node.output[:] = [mapping.get(name, name) for name in node.output]
+        for attribute in node.attribute:
+            if attribute.type == onnx.AttributeProto.GRAPH:
+                rename(list(attribute.g.node), mapping)
+            elif attribute.type == onnx.AttributeProto.GRAPHS:
+                for graph in attribute.graphs:
+                    rename(list(graph.node), mapping)
+
+
+def fuse_denoiser(model: onnx.ModelProto, hoist: bool = True) -> tuple[onnx.ModelProto, dict[str, Any]]:
+    """Wrap the one-step denoiser in a Loop over ``num_steps`` steps.
+
+    The fused model has the denoiser's inputs plus an int64 scalar
+    ``num_steps``; ``timestep`` is the first step's and advances by one per
+    iteration. With ``hoist``, nodes that depend only on per-request inputs
+    (see split_denoiser) run once before the loop and the body reads their
+    outputs from the enclosing graph.
+    """
+    graph = model.graph
+    inputs = {value.name: value for value in graph.input}
+    if {LATENTS, TIMESTEP} - set(inputs) or [value.name for value in graph.output] != [OUTPUT]:
+        raise ValueError(f"Expected a denoiser with {LATENTS} and {TIMESTEP} inputs and a single {OUTPUT} output")
+
+    outer_nodes: list[onnx.NodeProto] = []
+    body_nodes = [onnx.NodeProto.FromString(node.SerializeToString()) for node in graph.node]
+    hoisted = 0
+    if hoist:
+        try:
+            condition, step, _ = split_denoiser(model)
+        except ValueError:
+            pass
+        else:
+            outer_nodes = list(condition.graph.node)
+            defined = {name for node in outer_nodes for name in node.output}
+            # Constant-only nodes are in both halves; the body reads the outer copy
+            body_nodes = [node for node in step.graph.node if not set(node.output) <= defined]
+            hoisted = len(outer_nodes)
+
+    rename(body_nodes, {LATENTS: "loop_latents", TIMESTEP: "loop_timestep", OUTPUT: "loop_denoised_latents"})
+    body_nodes = [
+        onnx_helper.make_node("Cast", ["loop_iteration"], ["loop_offset"], to=TensorProto.FLOAT),
+        onnx_helper.make_node("Add", [TIMESTEP, "loop_offset"], ["loop_timestep"]),
+        *body_nodes,
+        onnx_helper.make_node("Identity", ["loop_condition"], ["loop_condition_out"]),
+    ]
+    body = onnx_helper.make_graph(
+        body_nodes,
+        "denoise_step",
+        [
+            onnx_helper.make_tensor_value_info("loop_iteration", TensorProto.INT64, []),
+            onnx_helper.make_tensor_value_info("loop_condition", TensorProto.BOOL, []),
+            onnx_helper.make_tensor_value_info("loop_latents", TensorProto.FLOAT, None),
+        ],
+        [
+            onnx_helper.make_tensor_value_info("loop_condition_out", TensorProto.BOOL, []),
+            onnx_helper.make_tensor_value_info("loop_denoised_latents", TensorProto.FLOAT, None),
+        ],
+    )
+    loop = onnx_helper.make_node("Loop", ["num_steps", "", LATENTS], [OUTPUT], body=body)
+    fused_graph = onnx_helper.make_graph(
+        outer_nodes + [loop],
+        f"{graph.name}_loop",
+        list(graph.input) + [onnx_helper.make_tensor_value_info("num_steps", TensorProto.INT64, [])],
+        list(graph.output),
+        list(graph.initializer),
+    )
+    fused = onnx_helper.make_model(fused_graph, opset_imports=model.opset_import, producer_name="fuse_denoiser")
+    fused.ir_version = model.ir_version
+    fused.functions.extend(model.functions)
+    onnx.checker.check_model(fused)
+    return fused, {"nodes": len(graph.node), "hoisted_nodes": hoisted, "loop_body_nodes": len(body_nodes) - 3}
+
+
+def denoise_stepwise(session: Any, feeds: dict[str, np.ndarray], steps: int) -> np.ndarray:
+    """The _generate_cpu loop: one session call per step."""
+    latents = feeds[LATENTS]
+    timestep = feeds[TIMESTEP]
+    for step in range(steps):
+        latents = session.run(None, {**feeds, LATENTS: latents, TIMESTEP: timestep + step})[0]
+    return latents
+
+
+def verify(args: argparse.Namespace, fused_path: Path) -> list[dict[str, Any]]:
+    """Denoise the first-step inputs of a short and a long sample both ways; compare and time them."""
+    tts = SupertonicTTS(args.onnx_dir, backend="cpu", precision=args.precision)
+    stepwise = tts._create_session("latent_denoiser")
+    # Record through the one-step model even if a fused one is loaded
+    tts.latent_denoiser_loop = None
+    fused = ort.InferenceSession(
+        str(fused_path), sess_options=tts._create_session_options("cpu"), providers=tts.providers
+    )
+    samples = sorted(TEST_TEXTS, key=lambda item: item["word_count"])
+    rows = []
+    for sample in (samples[0], samples[-1]):
+        recorder = RecordingDenoiser(stepwise)
+        tts.latent_denoiser = recorder
+        np.random.seed(args.seed)
+        tts(sample["text"], args.language, args.voice, args.steps, args.speed)
+        # First step of the first chunk
+        feeds = recorder.feeds[0]
+        fused_feeds = {**feeds, "num_steps": np.array(args.steps, dtype=np.int64)}
+
+        expected = denoise_stepwise(stepwise, feeds, args.steps)
+        actual = fused.run(None, fused_feeds)[0]
+
+        def best(run) -> float:
+            times = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        stepwise_seconds = best(lambda: denoise_stepwise(stepwise, feeds, args.steps))
+        fused_seconds = best(lambda: fused.run(None, fused_feeds))
+        rows.append(
+            {
+                "word_count": sample["word_count"],
+                "frames": int(feeds[LATENTS].shape[-1]),
+                "max_abs_error": float(np.max(np.abs(expected - actual))),
+                "stepwise_seconds": stepwise_seconds,
+                "fused_seconds": fused_seconds,
+                "overhead_per_step_ms": (stepwise_seconds - fused_seconds) / args.steps * 1000,
+            }
+        )
+    return rows
+
+
+def main() -> int:
+    args = parse_args()
+    onnx_dir = Path(args.onnx_dir) / "onnx"
+    stem = "latent_denoiser" if args.precision == "fp32" else f"latent_denoiser_{args.precision}"
+    source_path = onnx_dir / f"{stem}.onnx"
+    if not source_path.exists():
+        print(f"No {source_path}")
+        return 2
+
+    model = onnx.load(source_path)
+    external = any(external_data_helper.uses_external_data(tensor) for tensor in model.graph.initializer)
+    try:
+        fused, report = fuse_denoiser(model, hoist=not args.no_hoist)
+    except ValueError as exc:
+        print(f"Cannot fuse {source_path.name}: {exc}")
+        return 1
+    fused_path = onnx_dir / f"{stem}_{SupertonicTTS.FUSED_DENOISER_SUFFIX}.onnx"
+    save(fused, fused_path, external)
+
+    print(f"# Fused {source_path.name}")
+    print("")
+    print(f"- Loop body: {report['loop_body_nodes']} of {report['nodes']} nodes; {report['hoisted_nodes']} conditioning nodes run once before the loop")
+    print(f"- Wrote {fused_path.name}; SupertonicTTS runs blocks of steps through it on CPU")
+
+    verification = None
+    if not args.skip_verification:
+        verification = verify(args, fused_path)
+        print("")
+        print("| words | frames | step-by-step ms | fused ms | saved per step ms | max abs error |")
+        print("|---:|---:|---:|---:|---:|---:|")
+        for row in verification:
+            print(
+                f"| {row['word_count']} | {row['frames']} | {row['stepwise_seconds'] * 1000:.2f} | "
+                f"{row['fused_seconds'] * 1000:.2f} | {row['overhead_per_step_ms']:.3f} | {row['max_abs_error']:.3g} |"
+            )
+
+    if args.results:
+        write_json(
+            args.results,
+            {
+                "kind": "fuse_denoiser",
+                "source": str(source_path),
+                "output": str(fused_path),
+                "steps": args.steps,
+                "fusion": report,
+                "verification": verification,
+                "environment": collect_environment(
+                    command=" ".join(sys.argv), package_manager=args.package_manager, repo_root=TARGET_REPO_ROOT
+                ),
+            },
+        )
+
+    if verification is not None and max(row["max_abs_error"] for row in verification) > args.tolerance:
+        print(f"Fused model differs from the step-by-step loop by more than {args.tolerance:g}; removing it.")
+        fused_path.unlink()
+        fused_path.with_name(f"{fused_path.name}.data").unlink(missing_ok=True)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
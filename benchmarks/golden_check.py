@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+
+from audio_quality import DEFAULT_TOLERANCES, compare_files, tolerance_failures
+from profile_utils import ProfilingSession, StageProfiler, TEST_TEXTS, collect_environment, read_json, write_json
+
+
+SCRIPT_REPO_ROOT = Path(__file__).resolve().parents[1]
+TARGET_REPO_ROOT = Path(os.getenv("SUPERTONIC_REPO_ROOT", str(SCRIPT_REPO_ROOT))).resolve()
+PY_ROOT = TARGET_REPO_ROOT / "py"
+if str(PY_ROOT) not in sys.path:
+    sys.path.insert(0, str(PY_ROOT))
+
+MANIFEST = "manifest.json"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare seeded synthesis against stored golden waveforms without an ASR service."
+    )
+    parser.add_argument("--golden-dir", required=True, help="Directory with manifest.json and NNN_words.wav goldens.")
+    parser.add_argument("--update", action="store_true", help="Write new goldens from the current model instead of checking.")
+    parser.add_argument(
+        "--candidate-dir",
+        default=None,
+        help="Compare existing NNN_words.wav files (e.g. tts_benchmark.py output) instead of synthesizing.",
+    )
+    parser.add_argument("--output-dir", default=None, help="Where synthesized candidates are written (default: temporary).")
+    parser.add_argument("--onnx-dir", default=str(TARGET_REPO_ROOT / "assets"))
+    parser.add_argument("--device", choices=["cpu", "gpu"], default="cpu")
+    parser.add_argument("--voice", default=None, help="Default: the manifest's voice, or M1 with --update.")
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--steps", type=int, default=None)
+    parser.add_argument("--speed", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--early-exit-tolerance",
+        type=float,
+        default=0.0,
+        help="Synthesize candidates with early-exit denoising to check a tolerance before enabling it.",
+    )
+    parser.add_argument("--words", type=int, nargs="*", default=None, help="Only these TEST_TEXTS word counts.")
+    parser.add_argument("--tolerances", default=None, help='JSON file overriding limits, e.g. {"mel_cepstral_distortion_db": [10, "max"]}.')
+    parser.add_argument("--results", default=None, help="Optional JSON with every metric per sample.")
+    parser.add_argument("--package-manager", default="uv")
+    return parser.parse_args()
+
+
+def load_tolerances(path: str | None) -> dict[str, tuple[float, str]]:
+    tolerances = dict(DEFAULT_TOLERANCES)
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            for name, (limit, kind) in json.load(handle).items():
+                tolerances[name] = (float(limit), kind)
+    return tolerances
+
+
+def synthesis_settings(args: argparse.Namespace, manifest: dict[str, Any]) -> dict[str, Any]:
+    """Command-line values win; otherwise the goldens' own settings, so a check reproduces them."""
+    defaults = {"voice": "M1", "language": "en", "steps": 15, "speed": 1.05, "seed": 20260502}
+    return {
+        key: getattr(args, key) if getattr(args, key) is not None else manifest.get(key, default)
+        for key, default in defaults.items()
+    }
+
+
+def synthesize(
+    samples: list[dict[str, Any]], settings: dict[str, Any], args: argparse.Namespace, output_dir: Path, early_exit: float = 0.0
+) -> dict[str, Any]:
+    """Write seeded synthesis of ``samples`` to ``output_dir`` and count the denoiser steps run."""
+    from helper import load_text_to_speech
+
+    tts = load_text_to_speech(args.onnx_dir, use_gpu=args.device == "gpu", early_exit_tolerance=early_exit)
+    if getattr(tts, "latent_denoiser_loop", None) is not None:
+        # Run steps one call at a time so every one is counted; the fused
+        # model gives the same latents
+        tts.latent_denoiser_loop = None
+    profiler = StageProfiler()
+    for name in ("text_encoder", "latent_denoiser"):
+        setattr(tts, name, ProfilingSession(name, getattr(tts, name), profiler))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for sample in samples:
+        # Same seeds as tts_benchmark.py, so its outputs can serve as goldens too
+        np.random.seed(settings["seed"] + 100 + sample["index"])
+        wav, duration = tts(sample["text"], settings["language"], settings["voice"], settings["steps"], settings["speed"])
+        audio = wav[0, : int(tts.sample_rate * float(duration[0]))]
+        sf.write(output_dir / sample["file"], audio, tts.sample_rate)
+    # One encoder run per sentence chunk, each chunk a batch of one
+    full_steps = profiler.counts["text_encoder"] * settings["steps"]
+    steps_run = profiler.counts["latent_denoiser"]
+    return {
+        "early_exit_tolerance": early_exit,
+        "denoiser_steps_run": steps_run,
+        "denoiser_steps_saved": full_steps - steps_run,
+        "steps_saved_ratio": (full_steps - steps_run) / full_steps if full_steps else 0.0,
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    golden_dir = Path(args.golden_dir)
+    manifest_path = golden_dir / MANIFEST
+    manifest = read_json(manifest_path) if manifest_path.exists() and not args.update else {}
+    if not manifest and not args.update:
+        print(f"No {MANIFEST} in {golden_dir}; create goldens with --update first.")
+        return 2
+    settings = synthesis_settings(args, manifest)
+
+    samples = [
+        {"index": index, "word_count": sample["word_count"], "text": sample["text"], "file": f"{sample['word_count']:03d}_words.wav"}
+        for index, sample in enumerate(TEST_TEXTS)
+        if args.words is None or sample["word_count"] in args.words
+    ]
+
+    if args.update:
+        synthesize(samples, settings, args, golden_dir)
+        write_json(
+            manifest_path,
+            {
+                **settings,
+                "onnx_dir": args.onnx_dir,
+                "samples": [{key: sample[key] for key in ("word_count", "file")} for sample in samples],
+                "environment": collect_environment(
+                    command=" ".join(sys.argv), package_manager=args.package_manager, repo_root=TARGET_REPO_ROOT
+                ),
+            },
+        )
+        print(f"Wrote {len(samples)} goldens to {golden_dir}")
+        return 0
+
+    stored = {sample["file"] for sample in manifest.get("samples", [])}
+    samples = [sample for sample in samples if sample["file"] in stored]
+    synthesis = None
+    if args.candidate_dir:
+        candidate_dir = Path(args.candidate_dir)
+    else:
+        candidate_dir = Path(args.output_dir or tempfile.mkdtemp(prefix="golden-check-"))
+        synthesis = synthesize(samples, settings, args, candidate_dir, args.early_exit_tolerance)
+
+    tolerances = load_tolerances(args.tolerances)
+    rows = []
+    for sample in samples:
+        candidate_path = candidate_dir / sample["file"]
+        if not candidate_path.exists():
+            rows.append({"word_count": sample["word_count"], "metrics": {}, "failures": [f"missing {candidate_path}"]})
+            continue
+        metrics = compare_files(golden_dir / sample["file"], candidate_path)
+        rows.append({"word_count": sample["word_count"], "metrics": metrics, "failures": tolerance_failures(metrics, tolerances)})
+
+    failed = [row for row in rows if row["failures"]]
+    print(f"# Golden audio check: {'FAIL' if failed else 'PASS'} ({len(rows) - len(failed)}/{len(rows)} samples within tolerance)")
+    print("")
+    print("| words | duration err | spectral conv. | log-mag dist. | MCD dB | env. corr. | env. MAE dB | status |")
+    print("|---:|---:|---:|---:|---:|---:|---:|---|")
+    for row in rows:
+        metrics = row["metrics"]
+        values = [
+            f"{metrics[name]:.3g}" if name in metrics else "n/a"
+            for name in (
+                "duration_ratio_error",
+                "spectral_convergence",
+                "log_magnitude_distance",
+                "mel_cepstral_distortion_db",
+                "envelope_correlation",
+                "envelope_mae_db",
+            )
+        ]
+        status = "; ".join(row["failures"]) or "ok"
+        print(f"| {row['word_count']} | {' | '.join(values)} | {status} |")
+    if synthesis is not None and args.early_exit_tolerance:
+        print("")
+        print(
+            f"Early exit at tolerance {args.early_exit_tolerance:g} skipped {synthesis['denoiser_steps_saved']} "
+            f"of {synthesis['denoiser_steps_run'] + synthesis['denoiser_steps_saved']} denoiser steps "
+            f"({synthesis['steps_saved_ratio'] * 100:.1f}%)."
+        )
+
+    if args.results:
+        write_json(
+            args.results,
+            {
+                "kind": "golden_check",
+                "golden_dir": str(golden_dir),
+                "candidate_dir": str(candidate_dir),
+                "settings": settings,
+                "synthesis": synthesis,
+                "tolerances": {name: list(value) for name, value in tolerances.items()},
+                "samples": rows,
+                "passed": not failed,
+            },
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
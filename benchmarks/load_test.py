@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import time
+from typing import Any
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from profile_utils import TEST_TEXTS, collect_environment, percentile, write_json
+
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+AUDIO_SECONDS_PATTERN = re.compile(r'audio;desc="([0-9.]+)s"')
+# 16-bit mono PCM at the API sample rate, used to size streamed wav/pcm bodies
+PCM_BYTES_PER_SECOND = 44100 * 2
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Open-loop HTTP load test for /v1/audio/speech.")
+    parser.add_argument("--label", required=True, help="Label for this run, such as baseline or optimized.")
+    parser.add_argument("--url", default="http://localhost:8880", help="Server base URL.")
+    parser.add_argument(
+        "--pattern",
+        choices=["poisson", "step"],
+        default="poisson",
+        help="poisson: independent Poisson phases per rate, drained in between (saturation sweep). "
+        "step: evenly spaced arrivals stepping through the rates back to back.",
+    )
+    parser.add_argument("--rates", default="0.25,0.5,1,2,4", help="Comma-separated offered loads in requests/s.")
+    parser.add_argument("--phase-duration", type=float, default=60.0, help="Seconds per rate.")
+    parser.add_argument("--formats", default="opus,mp3,wav", help="Comma-separated response formats to mix.")
+    parser.add_argument("--stream-ratio", type=float, default=0.5, help="Fraction of streaming requests.")
+    parser.add_argument("--voices", default="M1", help="Comma-separated voices to mix.")
+    parser.add_argument("--steps", type=int, default=None, help="total_steps sent with each request.")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Requests beyond this are dropped and counted.")
+    parser.add_argument("--warmup-requests", type=int, default=2)
+    parser.add_argument("--knee-factor", type=float, default=2.0, help="p99 growth over the lightest load that marks saturation.")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=20260502)
+    parser.add_argument("--results", required=True)
+    parser.add_argument("--package-manager", default="uv")
+    return parser.parse_args()
+
+
+def parse_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def poisson_arrivals(rng: random.Random, rate: float, duration: float, start: float = 0.0) -> list[float]:
+    offsets = []
+    elapsed = rng.expovariate(rate)
+    while elapsed < duration:
+        offsets.append(start + elapsed)
+        elapsed += rng.expovariate(rate)
+    return offsets
+
+
+def uniform_arrivals(rate: float, duration: float, start: float = 0.0) -> list[float]:
+    count = int(duration * rate)
+    return [start + index / rate for index in range(count)]
+
+
+def build_payload(rng: random.Random, args: argparse.Namespace) -> dict[str, Any]:
+    sample = rng.choice(TEST_TEXTS)
+    payload = {
+        "model": "supertonic",
+        "input": sample["text"],
+        "voice": rng.choice(parse_list(args.voices)),
+        "response_format": rng.choice(parse_list(args.formats)),
+        "stream": rng.random() < args.stream_ratio,
+    }
+    if args.steps is not None:
+        payload["total_steps"] = args.steps
+    return payload
+
+
+def audio_seconds_from_response(payload: dict[str, Any], server_timing: str | None, body_bytes: int) -> float | None:
+    """Audio duration of a response, or None when it cannot be known cheaply.
+
+    Non-streaming responses report the full duration in Server-Timing. For
+    streams the header only covers the first chunk, so only raw wav/pcm
+    streams can be sized (from the body length).
+    """
+    if not payload.get("stream"):
+        match = AUDIO_SECONDS_PATTERN.search(server_timing or "")
+        return float(match.group(1)) if match else None
+    if payload.get("response_format") in {"wav", "pcm"}:
+        return body_bytes / PCM_BYTES_PER_SECOND
+    return None
+
+
+async def send_request(
+    client: Any,
+    url: str,
+    payload: dict[str, Any],
+    scheduled: float,
+    phase: int,
+    origin: float | None = None,
+) -> dict[str, Any]:
+    """Send one request; latencies are measured from its scheduled start.
+
+    Measuring from the schedule rather than the actual send keeps queueing
+    inside the load generator visible (no coordinated omission).
+    """
+    sent = time.perf_counter()
+    origin = scheduled if origin is None else origin
+    record: dict[str, Any] = {
+        "phase": phase,
+        "scheduled_offset_seconds": scheduled - origin,
+        "input_chars": len(payload["input"]),
+        "response_format": payload["response_format"],
+        "stream": payload["stream"],
+        "voice": payload["voice"],
+        "send_lag_seconds": sent - scheduled,
+        "status": None,
+        "error": None,
+    }
+    first_byte = None
+    body_bytes = 0
+    try:
+        async with client.stream("POST", url, json=payload) as response:
+            async for chunk in response.aiter_raw():
+                if first_byte is None and chunk:
+                    first_byte = time.perf_counter()
+                body_bytes += len(chunk)
+            server_timing = response.headers.get("server-timing")
+            record["status"] = response.status_code
+    except Exception as exc:  # noqa: BLE001 - recorded in the results
+        record["error"] = f"{type(exc).__name__}: {exc}"
+        return record
+    finished = time.perf_counter()
+
+    latency = finished - scheduled
+    audio_seconds = None
+    if record["status"] == 200:
+        audio_seconds = audio_seconds_from_response(payload, server_timing, body_bytes)
+    record.update(
+        {
+            "bytes": body_bytes,
+            "ttfb_seconds": (first_byte or finished) - scheduled,
+            "latency_seconds": latency,
+            "service_latency_seconds": finished - sent,
+            "finished_offset_seconds": finished - origin,
+            "audio_seconds": audio_seconds,
+            "realtime_factor": audio_seconds / latency if audio_seconds and latency > 0 else None,
+            "server_timing": server_timing,
+        }
+    )
+    return record
+
+
+async def run_schedule(
+    client: Any,
+    url: str,
+    schedule: list[tuple[float, int, dict[str, Any]]],
+    max_in_flight: int,
+) -> list[dict[str, Any]]:
+    """Fire requests at their offsets regardless of how earlier ones are doing."""
+    origin = time.perf_counter() + 0.05
+    in_flight = 0
+    tasks = []
+    dropped = []
+
+    async def tracked(payload: dict[str, Any], scheduled: float, phase: int) -> dict[str, Any]:
+        nonlocal in_flight
+        in_flight += 1
+        try:
+            return await send_request(client, url, payload, scheduled, phase, origin)
+        finally:
+            in_flight -= 1
+
+    for offset, phase, payload in schedule:
+        scheduled = origin + offset
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if in_flight >= max_in_flight:
+            dropped.append({"phase": phase, "status": None, "error": "dropped: max in flight"})
+            continue
+        tasks.append(asyncio.create_task(tracked(payload, scheduled, phase)))
+    return list(await asyncio.gather(*tasks)) + dropped
+
+
+def summarize_phase(
+    records: list[dict[str, Any]], offered_rate: float, duration: float, start: float = 0.0
+) -> dict[str, Any]:
+    """Percentiles and throughput for the requests of one phase.
+
+    Achieved throughput divides completions by the time until the last one
+    finished (at least the phase duration), so a backlog that drains after
+    the phase shows up as lost throughput.
+    """
+    ok = [record for record in records if record.get("status") == 200]
+    finished = [record["finished_offset_seconds"] for record in ok if "finished_offset_seconds" in record]
+    span = max([duration] + [offset - start for offset in finished])
+    rejected = [record for record in records if record.get("status") == 429]
+    errors = [record for record in records if record.get("status") != 200]
+    summary: dict[str, Any] = {
+        "offered_rps": offered_rate,
+        "duration_seconds": duration,
+        "requests": len(records),
+        "completed": len(ok),
+        "rejected_429": len(rejected),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(records) if records else None,
+        "arrival_rps": len(records) / duration if duration else None,
+        "achieved_rps": len(ok) / span if span else None,
+    }
+    for metric in ("ttfb_seconds", "latency_seconds", "realtime_factor"):
+        values = [record[metric] for record in ok if record.get(metric) is not None]
+        name = metric.replace("_seconds", "")
+        for q in PERCENTILES:
+            summary[f"{name}_p{q:g}"] = percentile(values, q)
+        summary[f"{name}_mean"] = sum(values) / len(values) if values else None
+    return summary
+
+
+def find_knee(phases: list[dict[str, Any]], knee_factor: float, max_error_rate: float) -> dict[str, Any]:
+    """Highest offered load served without saturating.
+
+    A phase is saturated when its error rate exceeds ``max_error_rate``, it
+    completes less than 90% of the offered load, or its p99 latency grows
+    beyond ``knee_factor`` times the p99 at the lightest load. Throughput
+    is compared with the realized arrival rate, not the nominal one.
+    """
+    ordered = sorted(phases, key=lambda phase: phase["offered_rps"])
+    reference = next((phase["latency_p99"] for phase in ordered if phase.get("latency_p99")), None)
+    knee = None
+    for phase in ordered:
+        reasons = []
+        if (phase.get("error_rate") or 0.0) > max_error_rate:
+            reasons.append("error_rate")
+        arrivals = phase.get("arrival_rps") or phase["offered_rps"]
+        if phase.get("achieved_rps") is not None and phase["achieved_rps"] < 0.9 * arrivals:
+            reasons.append("throughput")
+        if reference and phase.get("latency_p99") and phase["latency_p99"] > knee_factor * reference:
+            reasons.append("p99_latency")
+        if reasons:
+            return {"knee_rps": knee, "saturated_at_rps": phase["offered_rps"], "reasons": reasons}
+        knee = phase["offered_rps"]
+    return {"knee_rps": knee, "saturated_at_rps": None, "reasons": []}
+
+
+async def run_load_test(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    rates = [float(rate) for rate in parse_list(args.rates)]
+    url = f"{args.url.rstrip('/')}/v1/audio/speech"
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        for _ in range(args.warmup_requests):
+            await send_request(client, url, build_payload(rng, args), time.perf_counter(), -1)
+
+        records: list[dict[str, Any]] = []
+        if args.pattern == "step":
+            schedule = []
+            for phase, rate in enumerate(rates):
+                start = phase * args.phase_duration
+                for offset in uniform_arrivals(rate, args.phase_duration, start):
+                    schedule.append((offset, phase, build_payload(rng, args)))
+            records = await run_schedule(client, url, schedule, args.max_in_flight)
+        else:
+            for phase, rate in enumerate(rates):
+                schedule = [
+                    (offset, phase, build_payload(rng, args))
+                    for offset in poisson_arrivals(rng, rate, args.phase_duration)
+                ]
+                print(f"Phase {phase}: {rate:g} req/s, {len(schedule)} requests")
+                records.extend(await run_schedule(client, url, schedule, args.max_in_flight))
+
+    phases = [
+        summarize_phase(
+            [record for record in records if record["phase"] == phase],
+            rate,
+            args.phase_duration,
+            phase * args.phase_duration if args.pattern == "step" else 0.0,
+        )
+        for phase, rate in enumerate(rates)
+    ]
+    return {
+        "kind": "load_test",
+        "label": args.label,
+        "created_at_unix": time.time(),
+        "config": {
+            "url": args.url,
+            "pattern": args.pattern,
+            "rates": rates,
+            "phase_duration_seconds": args.phase_duration,
+            "formats": parse_list(args.formats),
+            "stream_ratio": args.stream_ratio,
+            "voices": parse_list(args.voices),
+            "steps": args.steps,
+            "seed": args.seed,
+        },
+        "phases": phases,
+        "saturation": find_knee(phases, args.knee_factor, args.max_error_rate),
+        "records": records,
+    }
+
+
+def print_phases(result: dict[str, Any]) -> None:
+    for phase in result["phases"]:
+        print(
+            f"{phase['offered_rps']:>6g} req/s offered, {phase['achieved_rps'] or 0:.2f} achieved: "
+            f"latency p50 {phase['latency_p50'] or 0:.3f}s p99 {phase['latency_p99'] or 0:.3f}s, "
+            f"TTFB p99 {phase['ttfb_p99'] or 0:.3f}s, errors {phase['errors']}"
+        )
+    saturation = result["saturation"]
+    print(f"Saturation knee: {saturation['knee_rps']} req/s (saturated at {saturation['saturated_at_rps']})")
+
+
+def main() -> int:
+    args = parse_args()
+    if httpx is None:
+        print("load_test.py requires httpx: pip install httpx")
+        return 1
+
+    result = asyncio.run(run_load_test(args))
+    result["environment"] = collect_environment(
+        command=" ".join(sys.argv),
+        package_manager=args.package_manager,
+    )
+    write_json(args.results, result)
+    print_phases(result)
+    print(f"Wrote results to {args.results}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
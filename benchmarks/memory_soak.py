@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from profile_utils import TEST_TEXTS, collect_environment, current_rss_mb, peak_rss_mb, percentile, write_json
+
+
+SCRIPT_REPO_ROOT = Path(__file__).resolve().parents[1]
+TARGET_REPO_ROOT = Path(os.getenv("SUPERTONIC_REPO_ROOT", str(SCRIPT_REPO_ROOT))).resolve()
+PY_ROOT = TARGET_REPO_ROOT / "py"
+
+# Arena settings each policy controls; inherited values would override it
+ARENA_ENV = (
+    "ORT_ENABLE_CPU_MEM_ARENA",
+    "ORT_ENABLE_MEM_PATTERN",
+    "ORT_ARENA_EXTEND_STRATEGY",
+    "ORT_ARENA_MAX_BYTES",
+    "ORT_ARENA_SHRINK_INTERVAL",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run thousands of mixed-length requests per ONNX Runtime arena policy and track RSS, to pick a steady-state memory bound."
+    )
+    parser.add_argument("--onnx-dir", default=str(TARGET_REPO_ROOT / "assets"))
+    parser.add_argument(
+        "--policies",
+        default="default,same_as_requested,shrink,no_mem_pattern,no_arena",
+        help="Comma-separated policies (see policy_env()).",
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="generate() calls per policy.")
+    parser.add_argument("--sample-every", type=int, default=20, help="Requests between RSS samples.")
+    parser.add_argument("--shrink-interval", type=int, default=50, help="Generations between arena shrinks for the shrink policy.")
+    parser.add_argument("--max-bytes", type=int, default=0, help="Arena cap applied to every arena policy (0: uncapped).")
+    parser.add_argument("--max-words", type=int, default=200, help="Longest generated input; lengths are drawn uniformly up to it.")
+    parser.add_argument("--steps", type=int, default=5, help="Denoising steps; memory does not depend on it, so keep it low.")
+    parser.add_argument("--voice", default="M1")
+    parser.add_argument("--seed", type=int, default=20260502)
+    parser.add_argument("--headroom", type=float, default=1.2, help="Multiplier on the best steady-state RSS for the recommended bound.")
+    parser.add_argument("--timeout", type=float, default=7200.0, help="Seconds before a policy is abandoned.")
+    parser.add_argument("--results", default=None, help="Optional JSON with every RSS sample per policy.")
+    parser.add_argument("--package-manager", default="uv")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def policy_env(name: str, args: argparse.Namespace) -> dict[str, str]:
+    """Arena environment for one policy, as SupertonicTTS reads it."""
+    cap = {"ORT_ARENA_MAX_BYTES": str(args.max_bytes)} if args.max_bytes else {}
+    policies = {
+        "default": {**cap},
+        "same_as_requested": {"ORT_ARENA_EXTEND_STRATEGY": "same_as_requested", **cap},
+        "shrink": {
+            "ORT_ARENA_EXTEND_STRATEGY": "same_as_requested",
+            "ORT_ARENA_SHRINK_INTERVAL": str(args.shrink_interval),
+            **cap,
+        },
+        "no_mem_pattern": {"ORT_ENABLE_MEM_PATTERN": "0", **cap},
+        "no_arena": {"ORT_ENABLE_CPU_MEM_ARENA": "0"},
+    }
+    if name not in policies:
+        raise ValueError(f"Unknown policy '{name}'. Choose from {tuple(policies)}.")
+    return policies[name]
+
+
+def build_texts(args: argparse.Namespace) -> list[str]:
+    """Seeded inputs of 1..max_words words cut from the concatenated TEST_TEXTS."""
+    rng = random.Random(args.seed)
+    words = " ".join(sample["text"] for sample in TEST_TEXTS).split()
+    texts = []
+    for _ in range(args.requests):
+        length = rng.randint(1, min(args.max_words, len(words)))
+        start = rng.randrange(len(words) - length + 1)
+        texts.append(" ".join(words[start : start + length]))
+    return texts
+
+
+def run_worker(config: dict[str, Any]) -> dict[str, Any]:
+    """Soak one policy; runs in a fresh process set up by measure()."""
+    sys.path.insert(0, str(PY_ROOT))
+    from helper import load_text_to_speech
+
+    baseline = current_rss_mb()
+    tts = load_text_to_speech(config["onnx_dir"], use_gpu=False, backend="cpu")
+    loaded = current_rss_mb()
+    samples: list[dict[str, Any]] = []
+    latencies: list[float] = []
+    for index, text in enumerate(config["texts"], start=1):
+        start = time.perf_counter()
+        tts.generate(text, voice=config["voice"], steps=config["steps"])
+        latencies.append(time.perf_counter() - start)
+        if index % config["sample_every"] == 0 or index == len(config["texts"]):
+            samples.append({"request": index, "words": len(text.split()), "rss_mb": current_rss_mb()})
+    return {
+        "baseline_rss_mb": baseline,
+        "loaded_rss_mb": loaded,
+        "peak_rss_mb": peak_rss_mb(),
+        "samples": samples,
+        "latency_mean_seconds": sum(latencies) / len(latencies),
+        "latency_p95_seconds": percentile(latencies, 95),
+    }
+
+
+def summarize(result: dict[str, Any]) -> dict[str, Any]:
+    """Steady state is the median of the last fifth of samples; growth is the slope over the second half."""
+    samples = [sample for sample in result["samples"] if sample["rss_mb"] is not None]
+    if not samples:
+        return {}
+    rss = [sample["rss_mb"] for sample in samples]
+    tail = rss[-max(1, len(rss) // 5) :]
+    half = samples[len(samples) // 2 :]
+    growth = None
+    if len(half) > 1:
+        requests = [sample["request"] for sample in half]
+        values = [sample["rss_mb"] for sample in half]
+        mean_x = sum(requests) / len(requests)
+        mean_y = sum(values) / len(values)
+        variance = sum((x - mean_x) ** 2 for x in requests)
+        if variance:
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(requests, values)) / variance
+            growth = slope * 1000
+    return {
+        "final_rss_mb": rss[-1],
+        "steady_rss_mb": percentile(tail, 50),
+        "growth_mb_per_1000": growth,
+    }
+
+
+def measure(args: argparse.Namespace, policy: str, texts: list[str]) -> dict[str, Any]:
+    env = {key: value for key, value in os.environ.items() if key not in ARENA_ENV}
+    env.update(policy_env(policy, args))
+    config = {
+        "onnx_dir": args.onnx_dir,
+        "texts": texts,
+        "steps": args.steps,
+        "voice": args.voice,
+        "sample_every": max(1, args.sample_every),
+    }
+    result: dict[str, Any] = {"policy": policy, "env": policy_env(policy, args)}
+    try:
+        # The config goes over stdin; thousands of texts overflow argv
+        completed = subprocess.run(
+            [sys.executable, __file__, "--worker", "-"],
+            input=json.dumps(config),
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=args.timeout,
+        )
+    except subprocess.TimeoutExpired:
+        result["error"] = f"timed out after {args.timeout:g}s"
+        return result
+    if completed.returncode != 0:
+        result["error"] = completed.stderr.strip().splitlines()[-1:] or ["worker failed"]
+        return result
+    result.update(json.loads(completed.stdout.strip().splitlines()[-1]))
+    result.update(summarize(result))
+    return result
+
+
+def format_mb(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:.0f}"
+
+
+def main() -> int:
+    args = parse_args()
+    if args.worker is not None:
+        config = json.loads(sys.stdin.read() if args.worker == "-" else args.worker)
+        print(json.dumps(run_worker(config)))
+        return 0
+
+    policies = [name.strip() for name in args.policies.split(",") if name.strip()]
+    for name in policies:
+        policy_env(name, args)
+    texts = build_texts(args)
+    results = []
+    for name in policies:
+        print(f"Soaking {name} with {len(texts)} requests...", flush=True)
+        results.append(measure(args, name, texts))
+
+    print("")
+    print("| policy | loaded MB | steady MB | final MB | peak MB | growth MB/1000 req | mean latency s | p95 latency s |")
+    print("|---|---:|---:|---:|---:|---:|---:|---:|")
+    for row in results:
+        if "error" in row:
+            print(f"| {row['policy']} | error: {row['error']} | | | | | | |")
+            continue
+        growth = row.get("growth_mb_per_1000")
+        print(
+            f"| {row['policy']} | {format_mb(row['loaded_rss_mb'])} | {format_mb(row.get('steady_rss_mb'))} | "
+            f"{format_mb(row.get('final_rss_mb'))} | {format_mb(row['peak_rss_mb'])} | "
+            f"{'n/a' if growth is None else f'{growth:+.1f}'} | {row['latency_mean_seconds']:.3f} | "
+            f"{row['latency_p95_seconds']:.3f} |"
+        )
+
+    measured = [row for row in results if row.get("steady_rss_mb") is not None]
+    recommendation = None
+    if measured:
+        best = min(measured, key=lambda row: row["steady_rss_mb"])
+        recommendation = {
+            "policy": best["policy"],
+            "env": best["env"],
+            "memory_bound_mb": best["steady_rss_mb"] * args.headroom,
+        }
+        print("")
+        settings = " ".join(f"{key}={value}" for key, value in best["env"].items()) or "the defaults"
+        print(
+            f"Lowest steady state: {best['policy']} ({settings}); "
+            f"bound the process at about {recommendation['memory_bound_mb']:.0f} MB."
+        )
+        if best.get("growth_mb_per_1000") and best["growth_mb_per_1000"] > 1.0:
+            print("RSS was still growing at the end; rerun with more --requests before trusting the bound.")
+
+    if args.results:
+        write_json(
+            args.results,
+            {
+                "kind": "memory_soak",
+                "requests": args.requests,
+                "steps": args.steps,
+                "max_words": args.max_words,
+                "policies": results,
+                "recommendation": recommendation,
+                "environment": collect_environment(
+                    command=" ".join(sys.argv), package_manager=args.package_manager, repo_root=TARGET_REPO_ROOT
+                ),
+            },
+        )
+    return 0 if measured else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
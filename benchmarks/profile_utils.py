@@ -198,6 +198,159 @@ class ProfilingSession:
         return getattr(self._session, name)
 
 
+def percentile(values: list[float], q: float) -> float | None:
+    """Linearly interpolated percentile, ``q`` in [0, 100]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def current_rss_mb() -> float | None:
+    """Resident set size of this process right now (Linux only)."""
+    statm = Path("/proc/self/statm")
+    if not statm.exists():
+        return None
+    try:
+        resident_pages = int(statm.read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _shape_text(type_shapes: list[dict[str, list[int]]]) -> str:
+    shapes = []
+    for entry in type_shapes:
+        for dtype, dims in entry.items():
+            shapes.append(f"{dtype}[{','.join(str(dim) for dim in dims)}]")
+    return " ".join(shapes)
+
+
+def aggregate_ort_profiles(
+    traces: dict[str, list[str | Path]],
+    start_us: dict[str, float] | None = None,
+    top: int = 15,
+) -> dict[str, Any]:
+    """Aggregate ONNX Runtime profiling traces into hotspot and thread tables.
+
+    ``traces`` maps a session name to the JSON traces written by ORT for it.
+    Events before ``start_us[session]`` (microseconds since profiling start)
+    are skipped, so warmup runs can share a trace with the measured runs.
+    """
+    start_us = start_us or {}
+    op_types: dict[str, dict[str, Any]] = defaultdict(lambda: {"time_us": 0, "calls": 0})
+    nodes: dict[tuple[str, str, str], dict[str, Any]] = {}
+    threads: dict[str, dict[str, Any]] = {}
+    kernel_total_us = 0
+
+    for session, paths in traces.items():
+        stats = {
+            "model_runs": 0,
+            "model_run_ms": 0.0,
+            "kernel_ms": 0.0,
+            "pool_threads": 1,
+            "_parallel_us": 0,
+            "_thread_us": 0.0,
+        }
+        for path in paths:
+            for event in read_json(path):
+                if event.get("ts", 0) < start_us.get(session, 0):
+                    continue
+                duration = event.get("dur", 0)
+                name = event.get("name", "")
+                if event.get("cat") == "Session" and name == "model_run":
+                    stats["model_runs"] += 1
+                    stats["model_run_ms"] += duration / 1000
+                    continue
+                if event.get("cat") != "Node" or not name.endswith("_kernel_time"):
+                    continue
+
+                args = event.get("args", {})
+                op_type = args.get("op_name", "unknown")
+                node = name[: -len("_kernel_time")]
+                kernel_total_us += duration
+                stats["kernel_ms"] += duration / 1000
+                op_types[f"{session}/{op_type}"]["time_us"] += duration
+                op_types[f"{session}/{op_type}"]["calls"] += 1
+
+                key = (session, node, op_type)
+                entry = nodes.setdefault(key, {"time_us": 0, "calls": 0, "shapes": defaultdict(int)})
+                entry["time_us"] += duration
+                entry["calls"] += 1
+                entry["shapes"][_shape_text(args.get("input_type_shape", []))] += 1
+
+                scheduling = args.get("thread_scheduling_stats") or {}
+                if isinstance(scheduling, str):
+                    # Some ORT builds emit the stats JSON-encoded, or "" for inline kernels
+                    try:
+                        scheduling = json.loads(scheduling)
+                    except ValueError:
+                        scheduling = {}
+                sub_threads = scheduling.get("sub_threads", {})
+                busy = 1 + sum(1 for thread in sub_threads.values() if thread.get("num_run", 0) > 0)
+                stats["pool_threads"] = max(stats["pool_threads"], len(sub_threads) + 1)
+                stats["_thread_us"] += busy * duration
+                if busy > 1:
+                    stats["_parallel_us"] += duration
+        threads[session] = stats
+
+    for stats in threads.values():
+        kernel_us = stats["kernel_ms"] * 1000
+        parallel_us = stats.pop("_parallel_us")
+        thread_us = stats.pop("_thread_us")
+        average_threads = thread_us / kernel_us if kernel_us else None
+        stats["parallel_kernel_share"] = parallel_us / kernel_us if kernel_us else None
+        stats["average_active_threads"] = average_threads
+        stats["thread_utilization"] = (
+            average_threads / stats["pool_threads"] if average_threads is not None else None
+        )
+        stats["kernel_share_of_run"] = (
+            stats["kernel_ms"] / stats["model_run_ms"] if stats["model_run_ms"] else None
+        )
+
+    total = kernel_total_us or 1
+    op_rows = [
+        {
+            "session": key.split("/", 1)[0],
+            "op_type": key.split("/", 1)[1],
+            "time_ms": entry["time_us"] / 1000,
+            "calls": entry["calls"],
+            "average_ms": entry["time_us"] / 1000 / entry["calls"],
+            "share": entry["time_us"] / total,
+        }
+        for key, entry in op_types.items()
+    ]
+    node_rows = [
+        {
+            "session": session,
+            "node": node,
+            "op_type": op_type,
+            "time_ms": entry["time_us"] / 1000,
+            "calls": entry["calls"],
+            "share": entry["time_us"] / total,
+            "common_input_shape": max(entry["shapes"].items(), key=lambda item: item[1])[0],
+            "distinct_shapes": len(entry["shapes"]),
+        }
+        for (session, node, op_type), entry in nodes.items()
+    ]
+    op_rows.sort(key=lambda row: row["time_ms"], reverse=True)
+    node_rows.sort(key=lambda row: row["time_ms"], reverse=True)
+    return {
+        "op_type_hotspots": op_rows[:top],
+        "node_hotspots": node_rows[:top],
+        "threads": threads,
+        "kernel_time_ms": kernel_total_us / 1000,
+    }
+
+
 class ResourceSampler:
     def __init__(self, interval_seconds: float = 0.2, sample_gpu: bool = True):
         self.interval_seconds = interval_seconds
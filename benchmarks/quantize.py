@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    CalibrationMethod,
+    QuantFormat,
+    QuantType,
+    quantize_dynamic,
+    quantize_static,
+)
+from onnxruntime.quantization.shape_inference import quant_pre_process
+
+from audio_quality import compare_audio, tolerance_failures
+from profile_utils import (
+    ProfilingSession,
+    StageProfiler,
+    TEST_TEXTS,
+    collect_environment,
+    write_json,
+)
+
+
+SCRIPT_REPO_ROOT = Path(__file__).resolve().parents[1]
+TARGET_REPO_ROOT = Path(os.getenv("SUPERTONIC_REPO_ROOT", str(SCRIPT_REPO_ROOT))).resolve()
+PY_ROOT = TARGET_REPO_ROOT / "py"
+if str(PY_ROOT) not in sys.path:
+    sys.path.insert(0, str(PY_ROOT))
+
+from helper import SupertonicTTS  # noqa: E402
+
+
+# Calibration inputs in the style of TEST_TEXTS but disjoint from them, so
+# the evaluation below runs on held-out text.
+CALIBRATION_TEXTS = [
+    "Please confirm your appointment for Tuesday at half past three.",
+    "The quarterly report shows revenue up twelve percent, while costs stayed flat across every region.",
+    "Wait, did you really mean that? I thought we agreed to leave at noon!",
+    "Turn left at the second light, then continue for about four hundred meters until you see the station.",
+    "Our support team is available around the clock. If the problem persists after restarting the device, "
+    "reply to this message with the serial number printed on the back, and a technician will call you.",
+    "Hello.",
+]
+CALIBRATION_METHODS = {
+    "minmax": CalibrationMethod.MinMax,
+    "entropy": CalibrationMethod.Entropy,
+    "percentile": CalibrationMethod.Percentile,
+}
+QUANT_TYPES = {"int8": QuantType.QInt8, "uint8": QuantType.QUInt8}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Write INT8 variants of the denoiser and decoder and measure their speed and audio quality."
+    )
+    parser.add_argument("--onnx-dir", default=str(TARGET_REPO_ROOT / "assets"), help="Variants are written to <onnx-dir>/onnx.")
+    parser.add_argument(
+        "--sessions",
+        nargs="+",
+        default=list(SupertonicTTS.QUANTIZABLE_SESSIONS),
+        choices=list(SupertonicTTS.QUANTIZABLE_SESSIONS),
+    )
+    parser.add_argument("--modes", nargs="+", default=["dynamic", "static"], choices=["dynamic", "static"])
+    parser.add_argument("--per-channel", action="store_true", help="Per-channel weight scales.")
+    parser.add_argument("--reduce-range", action="store_true", help="7-bit weights, avoids VPMADDUBSW saturation on pre-VNNI x86.")
+    parser.add_argument("--op-types", nargs="*", default=None, help="Only quantize these operator types (default: all supported).")
+    parser.add_argument("--activation-type", choices=sorted(QUANT_TYPES), default="uint8", help="Static activations (U8S8 suits x86).")
+    parser.add_argument("--calibrate-method", choices=sorted(CALIBRATION_METHODS), default="minmax")
+    parser.add_argument("--calibration-samples", type=int, default=64, help="Recorded session inputs kept per session.")
+    parser.add_argument("--calibration-voices", nargs="+", default=["M1", "F1"])
+    parser.add_argument("--skip-evaluation", action="store_true")
+    parser.add_argument("--voice", default="M1")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--steps", type=int, default=15)
+    parser.add_argument("--speed", type=float, default=1.05)
+    parser.add_argument("--seed", type=int, default=20260502)
+    parser.add_argument("--warmup-runs", type=int, default=1)
+    parser.add_argument("--output-dir", default=None, help="Where evaluation WAVs are written (default: temporary).")
+    parser.add_argument("--results", default=None, help="Optional JSON with every measurement.")
+    parser.add_argument("--package-manager", default="uv")
+    return parser.parse_args()
+
+
+class RecordingSession:
+    """Session wrapper keeping a uniform sample of the feeds it was run with."""
+
+    def __init__(self, session: Any, capacity: int, rng: random.Random):
+        self._session = session
+        self._capacity = capacity
+        self._rng = rng
+        self.seen = 0
+        self.feeds: list[dict[str, np.ndarray]] = []
+
+    def run(self, output_names: Any, feeds: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        # Reservoir sampling over every call
+        self.seen += 1
+        if len(self.feeds) < self._capacity:
+            self.feeds.append({name: np.array(value) for name, value in feeds.items()})
+        else:
+            slot = self._rng.randrange(self.seen)
+            if slot < self._capacity:
+                self.feeds[slot] = {name: np.array(value) for name, value in feeds.items()}
+        return self._session.run(output_names, feeds, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+class RecordedDataReader(CalibrationDataReader):
+    def __init__(self, feeds: list[dict[str, np.ndarray]]):
+        self._feeds = iter(feeds)
+
+    def get_next(self) -> dict[str, np.ndarray] | None:
+        return next(self._feeds, None)
+
+
+def record_calibration_feeds(args: argparse.Namespace) -> dict[str, list[dict[str, np.ndarray]]]:
+    """Run the fp32 model on CALIBRATION_TEXTS and keep a sample of each session's inputs."""
+    tts = SupertonicTTS(args.onnx_dir, backend="cpu", precision="fp32")
+    # A fused model would run the steps without calling latent_denoiser
+    tts.latent_denoiser_loop = None
+    rng = random.Random(args.seed)
+    recorders = {}
+    for name in args.sessions:
+        recorders[name] = RecordingSession(getattr(tts, name), args.calibration_samples, rng)
+        setattr(tts, name, recorders[name])
+    for voice_index, voice in enumerate(args.calibration_voices):
+        for index, text in enumerate(CALIBRATION_TEXTS):
+            np.random.seed(args.seed + 1000 * (voice_index + 1) + index)
+            tts(text, args.language, voice, args.steps, args.speed)
+    for name, recorder in recorders.items():
+        print(f"Calibration: kept {len(recorder.feeds)} of {recorder.seen} {name} runs")
+    return {name: recorder.feeds for name, recorder in recorders.items()}
+
+
+def variant_path(onnx_dir: str, name: str, precision: str) -> Path:
+    return Path(onnx_dir) / "onnx" / f"{name}_{precision}.onnx"
+
+
+def quantize_session(
+    args: argparse.Namespace, name: str, mode: str, feeds: list[dict[str, np.ndarray]] | None
+) -> dict[str, Any]:
+    source = Path(args.onnx_dir) / "onnx" / f"{name}.onnx"
+    target = variant_path(args.onnx_dir, name, f"int8_{mode}")
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="supertonic-quant-") as workdir:
+        # Shape inference and graph optimization first, as ORT recommends.
+        # Symbolic shape inference needs sympy and can fail on dynamic
+        # graphs, so retry without it, then fall back to the original graph.
+        prepared = Path(workdir) / f"{name}.onnx"
+        for skip_symbolic_shape in (False, True):
+            try:
+                quant_pre_process(str(source), str(prepared), skip_symbolic_shape=skip_symbolic_shape)
+                break
+            except Exception as exc:
+                error = exc
+        else:
+            print(f"{name}: pre-processing failed ({error}); quantizing the original graph")
+            prepared = source
+        if mode == "dynamic":
+            quantize_dynamic(
+                str(prepared),
+                str(target),
+                op_types_to_quantize=args.op_types,
+                per_channel=args.per_channel,
+                reduce_range=args.reduce_range,
+                weight_type=QuantType.QInt8,
+            )
+        else:
+            quantize_static(
+                str(prepared),
+                str(target),
+                RecordedDataReader(feeds or []),
+                quant_format=QuantFormat.QDQ,
+                op_types_to_quantize=args.op_types,
+                per_channel=args.per_channel,
+                reduce_range=args.reduce_range,
+                activation_type=QUANT_TYPES[args.activation_type],
+                weight_type=QuantType.QInt8,
+                calibrate_method=CALIBRATION_METHODS[args.calibrate_method],
+            )
+    row = {
+        "session": name,
+        "precision": f"int8_{mode}",
+        "path": str(target),
+        "fp32_mb": source.stat().st_size / 1e6,
+        "int8_mb": target.stat().st_size / 1e6,
+        "quantize_seconds": time.perf_counter() - start,
+    }
+    print(f"Wrote {target} ({row['fp32_mb']:.1f} MB -> {row['int8_mb']:.1f} MB)")
+    return row
+
+
+def evaluate(args: argparse.Namespace, precision: str, output_dir: Path) -> dict[str, Any]:
+    """Seeded synthesis of TEST_TEXTS with timing per sample and per session."""
+    tts = SupertonicTTS(args.onnx_dir, backend="cpu", precision=precision)
+    # Time every step under latent_denoiser rather than in an untimed loop session
+    tts.latent_denoiser_loop = None
+    profiler = StageProfiler()
+    for name in SupertonicTTS.SESSION_NAMES:
+        setattr(tts, name, ProfilingSession(name, getattr(tts, name), profiler))
+    for warmup_index in range(args.warmup_runs):
+        np.random.seed(args.seed + warmup_index)
+        tts(TEST_TEXTS[0]["text"], args.language, args.voice, args.steps, args.speed)
+    profiler.reset()
+
+    samples = []
+    target_dir = output_dir / precision
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for index, sample in enumerate(TEST_TEXTS):
+        np.random.seed(args.seed + 100 + index)
+        start = time.perf_counter()
+        wav, duration = tts(sample["text"], args.language, args.voice, args.steps, args.speed)
+        wall_time = time.perf_counter() - start
+        audio = wav[0, : int(tts.sample_rate * float(duration[0]))]
+        path = target_dir / f"{sample['word_count']:03d}_words.wav"
+        sf.write(path, audio, tts.sample_rate)
+        samples.append(
+            {
+                "word_count": sample["word_count"],
+                "path": str(path),
+                "audio_seconds": len(audio) / tts.sample_rate,
+                "wall_time_seconds": wall_time,
+            }
+        )
+    return {
+        "precision": precision,
+        "session_precisions": dict(tts.session_precisions),
+        "samples": samples,
+        "wall_time_seconds": sum(sample["wall_time_seconds"] for sample in samples),
+        "stage_seconds": {row["component"]: row["time_seconds"] for row in profiler.summary()},
+    }
+
+
+def add_quality(candidate: dict[str, Any], reference: dict[str, Any]) -> None:
+    """Compare each sample with the fp32 output of the same seed."""
+    worst: dict[str, float] = {}
+    failures = []
+    for sample, fp32 in zip(candidate["samples"], reference["samples"]):
+        audio, sample_rate = sf.read(sample["path"], dtype="float32")
+        fp32_audio, _ = sf.read(fp32["path"], dtype="float32")
+        metrics = compare_audio(fp32_audio, audio, sample_rate)
+        sample["quality"] = metrics
+        sample["failures"] = tolerance_failures(metrics)
+        failures.extend(f"{sample['word_count']} words: {failure}" for failure in sample["failures"])
+        for name, value in metrics.items():
+            if name.endswith("_seconds"):
+                continue
+            better_low = name != "envelope_correlation"
+            if name not in worst or (value > worst[name] if better_low else value < worst[name]):
+                worst[name] = value
+    candidate["worst_quality"] = worst
+    candidate["quality_failures"] = failures
+    candidate["speedup"] = reference["wall_time_seconds"] / candidate["wall_time_seconds"]
+    candidate["stage_speedup"] = {
+        name: reference["stage_seconds"][name] / seconds
+        for name, seconds in candidate["stage_seconds"].items()
+        if seconds and reference["stage_seconds"].get(name)
+    }
+
+
+def render(evaluations: list[dict[str, Any]], quantized: list[dict[str, Any]]) -> list[str]:
+    lines = [
+        "| precision | wall time s | speedup | denoiser speedup | decoder speedup | worst MCD dB | worst spectral conv. | quality |",
+        "|---|---:|---:|---:|---:|---:|---:|---|",
+    ]
+    for row in evaluations:
+        stage = row.get("stage_speedup", {})
+        worst = row.get("worst_quality", {})
+        quality = "reference" if row["precision"] == "fp32" else ("FAIL" if row["quality_failures"] else "ok")
+        lines.append(
+            f"| {row['precision']} | {row['wall_time_seconds']:.2f} | {row.get('speedup', 1.0):.2f}x | "
+            f"{stage.get('latent_denoiser', 1.0):.2f}x | {stage.get('voice_decoder', 1.0):.2f}x | "
+            f"{worst.get('mel_cepstral_distortion_db', 0.0):.2f} | {worst.get('spectral_convergence', 0.0):.3f} | {quality} |"
+        )
+    lines.extend(["", "| session | precision | fp32 MB | int8 MB |", "|---|---|---:|---:|"])
+    for row in quantized:
+        lines.append(f"| {row['session']} | {row['precision']} | {row['fp32_mb']:.1f} | {row['int8_mb']:.1f} |")
+    return lines
+
+
+def main() -> int:
+    args = parse_args()
+    feeds = record_calibration_feeds(args) if "static" in args.modes else {}
+    quantized = [
+        quantize_session(args, name, mode, feeds.get(name)) for mode in args.modes for name in args.sessions
+    ]
+    output: dict[str, Any] = {
+        "kind": "quantization",
+        "environment": collect_environment(
+            command=" ".join(sys.argv), package_manager=args.package_manager, repo_root=TARGET_REPO_ROOT
+        ),
+        "settings": {
+            key: getattr(args, key)
+            for key in ("sessions", "modes", "per_channel", "reduce_range", "op_types", "activation_type", "calibrate_method", "steps", "voice", "seed")
+        },
+        "quantized": quantized,
+        "evaluations": [],
+    }
+
+    if not args.skip_evaluation:
+        output_dir = Path(args.output_dir or tempfile.mkdtemp(prefix="supertonic-quant-eval-"))
+        reference = evaluate(args, "fp32", output_dir)
+        evaluations = [reference]
+        for mode in args.modes:
+            candidate = evaluate(args, f"int8_{mode}", output_dir)
+            add_quality(candidate, reference)
+            evaluations.append(candidate)
+        output["evaluations"] = evaluations
+        passing = [row for row in evaluations[1:] if not row["quality_failures"] and row["speedup"] > 1.0]
+        output["recommended_precision"] = max(passing, key=lambda row: row["speedup"])["precision"] if passing else "fp32"
+        print("\n".join(render(evaluations, quantized)))
+        for row in evaluations[1:]:
+            for failure in row["quality_failures"]:
+                print(f"{row['precision']}: {failure}")
+        print(f"Recommended precision on this host: {output['recommended_precision']}")
+
+    if args.results:
+        write_json(args.results, output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import statistics
+from itertools import combinations
+from typing import Any, Callable
+
+from profile_utils import read_json, write_json
+
+
+# direction: which way is better. A metric regresses when the candidate is
+# worse than the baseline by more than max_relative_change AND by more than
+# min_absolute_change (in the metric's unit), and, with repeated runs on
+# both sides, the difference is significant at --alpha.
+DEFAULT_THRESHOLDS: dict[str, dict[str, Any]] = {
+    "realtime_factor": {"direction": "higher", "max_relative_change": 0.10},
+    "generation_wall_time_seconds": {"direction": "lower", "max_relative_change": 0.10, "min_absolute_change": 0.01},
+    "first_audio_latency_seconds": {"direction": "lower", "max_relative_change": 0.15, "min_absolute_change": 0.01},
+    "process_maxrss_mb": {"direction": "lower", "max_relative_change": 0.10, "min_absolute_change": 25.0},
+    # Applies to every component in component_profile (text_encoder, latent_denoiser, voice_decoder)
+    "stage_seconds": {"direction": "lower", "max_relative_change": 0.15, "min_absolute_change": 0.005},
+}
+CONFIG_KEYS = ("device", "mode")
+RECORD_CONFIG_KEYS = ("steps", "voice", "language", "speed")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fail when benchmark results regress against a stored baseline.")
+    parser.add_argument("--baseline", nargs="+", required=True, help="Baseline tts_benchmark.py results (one file per run).")
+    parser.add_argument("--candidate", nargs="+", required=True, help="Candidate tts_benchmark.py results (one file per run).")
+    parser.add_argument(
+        "--thresholds",
+        default=None,
+        help="JSON file overriding DEFAULT_THRESHOLDS per metric; use stage:<component> for one stage, "
+        'or {"enabled": false} to skip a metric.',
+    )
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level with two or more runs per side.")
+    parser.add_argument("--permutations", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=20260502)
+    parser.add_argument("--allow-config-mismatch", action="store_true", help="Compare runs with different steps/voice/device.")
+    parser.add_argument("--output", default=None, help="Optional markdown summary.")
+    parser.add_argument("--results", default=None, help="Optional JSON with every comparison.")
+    return parser.parse_args()
+
+
+def load_thresholds(path: str | None) -> dict[str, dict[str, Any]]:
+    thresholds = {name: dict(values) for name, values in DEFAULT_THRESHOLDS.items()}
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            for name, values in json.load(handle).items():
+                thresholds.setdefault(name, {}).update(values)
+    return thresholds
+
+
+def config_mismatches(baseline: list[dict[str, Any]], candidate: list[dict[str, Any]]) -> list[str]:
+    def signature(result: dict[str, Any]) -> dict[str, Any]:
+        values = {key: result.get(key) for key in CONFIG_KEYS}
+        for key in RECORD_CONFIG_KEYS:
+            values[key] = sorted({str(record.get(key)) for record in result.get("records", [])})
+        return values
+
+    reference = signature(baseline[0])
+    problems = []
+    for result in baseline[1:] + candidate:
+        for key, value in signature(result).items():
+            if value != reference[key]:
+                problems.append(f"{result.get('label')}: {key}={value} (baseline {reference[key]})")
+    return problems
+
+
+def stage_names(results: list[dict[str, Any]]) -> list[str]:
+    names = {
+        row["component"]
+        for result in results
+        for record in result.get("records", [])
+        for row in record.get("component_profile", [])
+    }
+    return sorted(names)
+
+
+def metric_getters(thresholds: dict[str, dict[str, Any]], results: list[dict[str, Any]]) -> dict[str, tuple[Callable, dict[str, Any]]]:
+    """Metric name -> (record -> value or None, threshold)."""
+    getters: dict[str, tuple[Callable, dict[str, Any]]] = {}
+    for name, threshold in thresholds.items():
+        if name == "stage_seconds" or name.startswith("stage:"):
+            continue
+        getters[name] = (lambda record, key=name: record.get(key), threshold)
+    for stage in stage_names(results):
+        threshold = {**thresholds.get("stage_seconds", {}), **thresholds.get(f"stage:{stage}", {})}
+
+        def stage_time(record: dict[str, Any], stage: str = stage) -> float | None:
+            rows = [row for row in record.get("component_profile", []) if row["component"] == stage]
+            return rows[0]["time_seconds"] if rows else None
+
+        getters[f"stage:{stage}"] = (stage_time, threshold)
+    return {name: value for name, value in getters.items() if value[1].get("enabled", True)}
+
+
+def per_sample(results: list[dict[str, Any]], getter: Callable) -> dict[int, list[float]]:
+    """word_count -> the metric from every run."""
+    values: dict[int, list[float]] = {}
+    for result in results:
+        for record in result.get("records", []):
+            value = getter(record)
+            if isinstance(value, (int, float)) and value > 0:
+                values.setdefault(int(record["word_count"]), []).append(float(value))
+    return values
+
+
+def permutation_p_value(baseline: list[float], candidate: list[float], worse_sign: float, permutations: int, rng: random.Random) -> float:
+    """One-sided p-value that candidate is worse, on the difference of means.
+
+    Exact over all splits when there are few of them, sampled otherwise.
+    """
+    observed = worse_sign * (statistics.fmean(candidate) - statistics.fmean(baseline))
+    pooled = baseline + candidate
+    n = len(candidate)
+    total = math.comb(len(pooled), n)
+    if total <= permutations:
+        hits = 0
+        for chosen in combinations(range(len(pooled)), n):
+            picked = set(chosen)
+            cand = [pooled[i] for i in picked]
+            base = [pooled[i] for i in range(len(pooled)) if i not in picked]
+            if worse_sign * (statistics.fmean(cand) - statistics.fmean(base)) >= observed - 1e-12:
+                hits += 1
+        return hits / total
+    hits = 0
+    for _ in range(permutations):
+        shuffled = pooled[:]
+        rng.shuffle(shuffled)
+        if worse_sign * (statistics.fmean(shuffled[:n]) - statistics.fmean(shuffled[n:])) >= observed - 1e-12:
+            hits += 1
+    return (hits + 1) / (permutations + 1)
+
+
+def compare_metric(
+    name: str,
+    baseline: dict[int, list[float]],
+    candidate: dict[int, list[float]],
+    threshold: dict[str, Any],
+    runs: tuple[int, int],
+    args: argparse.Namespace,
+    rng: random.Random,
+) -> dict[str, Any] | None:
+    """Compare one metric over the samples both sides measured.
+
+    Each value is normalized by the baseline median of its sample, so the
+    relative change is the geometric mean of the per-sample ratios and the
+    permutation test pools samples of different lengths.
+    """
+    words = sorted(set(baseline) & set(candidate))
+    if not words:
+        return None
+    higher_is_better = threshold.get("direction", "lower") == "higher"
+    worse_sign = -1.0 if higher_is_better else 1.0
+
+    base_log: list[float] = []
+    cand_log: list[float] = []
+    for word in words:
+        reference = statistics.median(baseline[word])
+        base_log.extend(math.log(value / reference) for value in baseline[word])
+        cand_log.extend(math.log(value / reference) for value in candidate[word])
+    relative_change = math.exp(statistics.fmean(cand_log) - statistics.fmean(base_log)) - 1.0
+    baseline_mean = statistics.fmean(value for word in words for value in baseline[word])
+    candidate_mean = statistics.fmean(value for word in words for value in candidate[word])
+    absolute_change = candidate_mean - baseline_mean
+
+    p_value = None
+    if min(runs) >= 2:
+        p_value = permutation_p_value(base_log, cand_log, worse_sign, args.permutations, rng)
+
+    worse_relative = worse_sign * relative_change
+    worse_absolute = worse_sign * absolute_change
+    exceeds = worse_relative > threshold.get("max_relative_change", 0.0) and worse_absolute > threshold.get(
+        "min_absolute_change", 0.0
+    )
+    significant = p_value is None or p_value < args.alpha
+    if exceeds and significant:
+        status = "REGRESSION"
+    elif exceeds:
+        status = "noise"
+    elif worse_relative < -threshold.get("max_relative_change", 0.0) and (p_value is None or p_value > 1 - args.alpha):
+        status = "improved"
+    else:
+        status = "ok"
+    return {
+        "metric": name,
+        "direction": "higher" if higher_is_better else "lower",
+        "samples": len(words),
+        "baseline_mean": baseline_mean,
+        "candidate_mean": candidate_mean,
+        "relative_change": relative_change,
+        "absolute_change": absolute_change,
+        "max_relative_change": threshold.get("max_relative_change", 0.0),
+        "min_absolute_change": threshold.get("min_absolute_change", 0.0),
+        "p_value": p_value,
+        "status": status,
+    }
+
+
+def check(args: argparse.Namespace, baseline: list[dict[str, Any]], candidate: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    rng = random.Random(args.seed)
+    thresholds = load_thresholds(args.thresholds)
+    comparisons = []
+    for name, (getter, threshold) in metric_getters(thresholds, baseline + candidate).items():
+        comparison = compare_metric(
+            name,
+            per_sample(baseline, getter),
+            per_sample(candidate, getter),
+            threshold,
+            (len(baseline), len(candidate)),
+            args,
+            rng,
+        )
+        if comparison is not None:
+            comparisons.append(comparison)
+    return comparisons
+
+
+def fmt(value: Any, digits: int = 4) -> str:
+    if value is None:
+        return "n/a"
+    if isinstance(value, float):
+        return f"{value:.{digits}g}"
+    return str(value)
+
+
+def render(comparisons: list[dict[str, Any]], runs: tuple[int, int], mismatches: list[str]) -> list[str]:
+    regressions = [row for row in comparisons if row["status"] == "REGRESSION"]
+    lines = [
+        f"# Benchmark regression check: {'FAIL' if regressions else 'PASS'}",
+        "",
+        f"Runs: {runs[0]} baseline, {runs[1]} candidate. "
+        + ("Significance from a permutation test over runs." if min(runs) >= 2 else "Single run on a side: thresholds only, no significance test."),
+        "",
+        "| metric | better | baseline | candidate | change | limit | p-value | status |",
+        "|---|---|---:|---:|---:|---:|---:|---|",
+    ]
+    for row in comparisons:
+        lines.append(
+            f"| {row['metric']} | {row['direction']} | {fmt(row['baseline_mean'])} | {fmt(row['candidate_mean'])} | "
+            f"{row['relative_change'] * 100:+.1f}% | {row['max_relative_change'] * 100:.0f}% | "
+            f"{fmt(row['p_value'])} | {row['status']} |"
+        )
+    if mismatches:
+        lines.extend(["", "Configuration differences:", ""])
+        lines.extend(f"- {problem}" for problem in mismatches)
+    lines.append("")
+    return lines
+
+
+def main() -> int:
+    args = parse_args()
+    baseline = [read_json(path) for path in args.baseline]
+    candidate = [read_json(path) for path in args.candidate]
+    runs = (len(baseline), len(candidate))
+
+    mismatches = config_mismatches(baseline, candidate)
+    if mismatches and not args.allow_config_mismatch:
+        print("Results were produced with different settings; pass --allow-config-mismatch to compare anyway:")
+        for problem in mismatches:
+            print(f"- {problem}")
+        return 2
+
+    comparisons = check(args, baseline, candidate)
+    lines = render(comparisons, runs, mismatches)
+    print("\n".join(lines))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write("\n".join(lines))
+    if args.results:
+        write_json(args.results, {"kind": "regression_check", "runs": list(runs), "comparisons": comparisons})
+
+    regressions = [row["metric"] for row in comparisons if row["status"] == "REGRESSION"]
+    if regressions:
+        print(f"Regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
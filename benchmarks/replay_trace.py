@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any
+
+from load_test import find_knee, httpx, parse_list, print_phases, run_schedule, send_request, summarize_phase
+from profile_utils import TEST_TEXTS, collect_environment, write_json
+
+
+# Request fields copied from a trace record into the replayed payload
+PAYLOAD_FIELDS = ("voice", "response_format", "speed", "stream", "lang_code", "total_steps", "priority")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay a server request trace (REQUEST_TRACE_PATH) against /v1/audio/speech.")
+    parser.add_argument("--label", required=True, help="Label for this run, such as baseline or optimized.")
+    parser.add_argument("--trace", required=True, help="JSON-lines trace written by the server.")
+    parser.add_argument("--url", default="http://localhost:8880", help="Server base URL.")
+    parser.add_argument(
+        "--speedups",
+        default="1",
+        help="Comma-separated rate multipliers; each replays the whole trace as one phase (2 = twice the original rate).",
+    )
+    parser.add_argument("--max-gap", type=float, default=None, help="Cap idle gaps between requests at this many seconds (before speedup).")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N requests.")
+    parser.add_argument(
+        "--include-client-errors",
+        action="store_true",
+        help="Also replay requests that originally failed with 4xx other than 429.",
+    )
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Requests beyond this are dropped and counted.")
+    parser.add_argument("--knee-factor", type=float, default=2.0, help="p99 growth over the slowest replay that marks saturation.")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--results", required=True)
+    parser.add_argument("--package-manager", default="uv")
+    return parser.parse_args()
+
+
+def read_trace(path: str, include_client_errors: bool = False, limit: int | None = None) -> list[dict[str, Any]]:
+    records = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            status = record.get("status")
+            if not include_client_errors and status is not None and 400 <= status < 500 and status != 429:
+                continue
+            records.append(record)
+    records.sort(key=lambda record: record["timestamp"])
+    return records[:limit] if limit is not None else records
+
+
+def arrival_offsets(records: list[dict[str, Any]], max_gap: float | None = None) -> list[float]:
+    """Seconds since the first request, with idle gaps optionally capped."""
+    offsets = []
+    elapsed = 0.0
+    for index, record in enumerate(records):
+        if index:
+            gap = max(0.0, record["timestamp"] - records[index - 1]["timestamp"])
+            elapsed += min(gap, max_gap) if max_gap is not None else gap
+        offsets.append(elapsed)
+    return offsets
+
+
+def filler_text(chars: int) -> str:
+    """Benchmark sentences repeated to roughly ``chars`` characters.
+
+    Whole sentences keep the server's sentence chunking close to the
+    original request; the last one is cut at a word boundary.
+    """
+    sentences = [sample["text"] for sample in TEST_TEXTS]
+    parts: list[str] = []
+    length = 0
+    index = 0
+    while length < chars:
+        sentence = sentences[index % len(sentences)]
+        parts.append(sentence)
+        length += len(sentence) + 1
+        index += 1
+    text = " ".join(parts)
+    if len(text) > chars:
+        cut = text.rfind(" ", 0, chars)
+        text = text[: cut if cut > 0 else chars].rstrip(",;:") + "."
+    return text
+
+
+def build_payload(record: dict[str, Any]) -> dict[str, Any]:
+    payload = {"model": "supertonic", "input": filler_text(max(1, record.get("input_chars", 1)))}
+    for field in PAYLOAD_FIELDS:
+        if record.get(field) is not None:
+            payload[field] = record[field]
+    payload.setdefault("voice", "M1")
+    payload.setdefault("response_format", "mp3")
+    payload.setdefault("stream", True)
+    return payload
+
+
+async def replay(args: argparse.Namespace, trace: list[dict[str, Any]]) -> dict[str, Any]:
+    speedups = [float(value) for value in parse_list(args.speedups)]
+    offsets = arrival_offsets(trace, args.max_gap)
+    duration = (offsets[-1] if offsets else 0.0) or 1.0
+    payloads = [build_payload(record) for record in trace]
+    url = f"{args.url.rstrip('/')}/v1/audio/speech"
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+
+    records: list[dict[str, Any]] = []
+    phases = []
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        if payloads:
+            await send_request(client, url, payloads[0], time.perf_counter(), -1)
+        for phase, speedup in enumerate(speedups):
+            schedule = [(offset / speedup, phase, payload) for offset, payload in zip(offsets, payloads)]
+            print(f"Phase {phase}: {speedup:g}x, {len(schedule)} requests over {duration / speedup:.1f}s")
+            phase_records = await run_schedule(client, url, schedule, args.max_in_flight)
+            records.extend(phase_records)
+            summary = summarize_phase(phase_records, len(trace) * speedup / duration, duration / speedup)
+            summary["speedup"] = speedup
+            phases.append(summary)
+
+    return {
+        "kind": "trace_replay",
+        "label": args.label,
+        "created_at_unix": time.time(),
+        "config": {
+            "url": args.url,
+            "pattern": "trace",
+            "trace": args.trace,
+            "trace_requests": len(trace),
+            "trace_duration_seconds": duration,
+            "speedups": speedups,
+            "max_gap_seconds": args.max_gap,
+        },
+        "phases": phases,
+        "saturation": find_knee(phases, args.knee_factor, args.max_error_rate),
+        "records": records,
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    if httpx is None:
+        print("replay_trace.py requires httpx: pip install httpx")
+        return 1
+
+    trace = read_trace(args.trace, args.include_client_errors, args.limit)
+    if not trace:
+        print(f"No replayable requests in {args.trace}")
+        return 1
+
+    result = asyncio.run(replay(args, trace))
+    result["environment"] = collect_environment(
+        command=" ".join(sys.argv),
+        package_manager=args.package_manager,
+    )
+    write_json(args.results, result)
+    print_phases(result)
+    print(f"Wrote results to {args.results}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,6 +15,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--output", required=True)
     parser.add_argument("--verdict", default="PARTIAL PASS")
     parser.add_argument("--notes", default="")
+    parser.add_argument(
+        "--load-results",
+        nargs="*",
+        default=[],
+        help="load_test.py or replay_trace.py result files to include.",
+    )
     return parser.parse_args()
 
 
@@ -195,6 +201,14 @@ def main() -> int:
     lines.append("- benchmarks/profile_baseline.txt")
     lines.append("- benchmarks/profile_optimized.txt")
     lines.append("")
+    # Optional sections, present only when the benchmark ran in that mode
+    optional_letters = iter("IJKLMNOP")
+    if baseline.get("op_profile") or optimized.get("op_profile"):
+        lines.extend(_op_profile_section(baseline, optimized, next(optional_letters)))
+    if _has_streaming(baseline_records) or _has_streaming(optimized_records):
+        lines.extend(_streaming_section(base_by_word, opt_by_word, next(optional_letters)))
+    if args.load_results:
+        lines.extend(_load_section([read_json(path) for path in args.load_results], next(optional_letters)))
     lines.append(f"## Verdict: {args.verdict}")
     Path(args.output).write_text("\n".join(lines) + "\n", encoding="utf-8")
     print(f"Wrote report to {args.output}")
@@ -218,6 +232,118 @@ def _accuracy_preserved(asr: dict[str, Any]) -> str:
     return "yes"
 
 
+def _has_streaming(records: list[dict[str, Any]]) -> bool:
+    return any(record.get("streaming") for record in records)
+
+
+def _streaming_section(
+    base_by_word: dict[int, dict[str, Any]],
+    opt_by_word: dict[int, dict[str, Any]],
+    letter: str,
+) -> list[str]:
+    lines = [f"## {letter}. Streaming latency", ""]
+    lines.append("Collected with `tts_benchmark.py --stream`. Playback is modelled as starting when the first chunk is ready; negative slack means the listener would hear a gap.")
+    lines.append("")
+    for label, records in (("baseline", base_by_word), ("optimized", opt_by_word)):
+        streamed = [record["streaming"] for record in records.values() if record.get("streaming")]
+        ttfa = [row["first_audio_latency_seconds"] for row in streamed]
+        lines.append(f"- {label} average time-to-first-audio: {fmt(sum(ttfa) / len(ttfa) if ttfa else None)}s")
+    lines.append("")
+    lines.append("| word count | baseline TTFA | optimized TTFA | TTFA change | chunks | baseline max gap | optimized max gap | baseline min slack | optimized min slack | underruns (base/opt) | peak RSS (base/opt) |")
+    lines.append("|---:|---:|---:|---:|---:|---:|---:|---:|---:|---|---|")
+    for word_count in sorted(set(base_by_word) | set(opt_by_word)):
+        base = base_by_word.get(word_count, {}).get("streaming") or {}
+        opt = opt_by_word.get(word_count, {}).get("streaming") or {}
+        change = None
+        if base.get("first_audio_latency_seconds") and opt.get("first_audio_latency_seconds"):
+            change = (opt["first_audio_latency_seconds"] / base["first_audio_latency_seconds"] - 1.0) * 100.0
+        lines.append(
+            f"| {word_count} | {fmt(base.get('first_audio_latency_seconds'))}s | {fmt(opt.get('first_audio_latency_seconds'))}s | {fmt(change, 1)}% | "
+            f"{fmt(opt.get('chunk_count') or base.get('chunk_count'))} | "
+            f"{fmt(base.get('max_inter_chunk_gap_seconds'))}s | {fmt(opt.get('max_inter_chunk_gap_seconds'))}s | "
+            f"{fmt(base.get('min_playback_slack_seconds'))}s | {fmt(opt.get('min_playback_slack_seconds'))}s | "
+            f"{fmt(base.get('underrun_count'))}/{fmt(opt.get('underrun_count'))} | "
+            f"{fmt(base.get('peak_rss_mb'), 1)}/{fmt(opt.get('peak_rss_mb'), 1)} MB |"
+        )
+    lines.append("")
+    return lines
+
+
+def _load_section(results: list[dict[str, Any]], letter: str) -> list[str]:
+    lines = [f"## {letter}. Load test", ""]
+    lines.append("Open-loop arrivals; latencies are measured from each request's scheduled start, so queueing in the client is not hidden.")
+    lines.append("")
+    lines.append("| label | kind | pattern | knee | saturated at | reasons |")
+    lines.append("|---|---|---|---:|---:|---|")
+    for result in results:
+        saturation = result.get("saturation", {})
+        lines.append(
+            f"| {result.get('label')} | {result.get('kind')} | {result.get('config', {}).get('pattern')} | "
+            f"{fmt(saturation.get('knee_rps'))} req/s | {fmt(saturation.get('saturated_at_rps'))} req/s | "
+            f"{', '.join(saturation.get('reasons', [])) or 'none'} |"
+        )
+    lines.append("")
+    lines.append("| label | offered | achieved | requests | errors (429) | TTFB p50 | TTFB p99 | latency p50 | latency p90 | latency p99 | latency p99.9 | RTF p50 |")
+    lines.append("|---|---:|---:|---:|---|---:|---:|---:|---:|---:|---:|---:|")
+    for result in results:
+        for phase in result.get("phases", []):
+            lines.append(
+                f"| {result.get('label')} | {fmt(phase.get('offered_rps'), 2)} req/s | {fmt(phase.get('achieved_rps'), 2)} req/s | "
+                f"{phase.get('requests')} | {phase.get('errors')} ({phase.get('rejected_429')}) | "
+                f"{fmt(phase.get('ttfb_p50'))}s | {fmt(phase.get('ttfb_p99'))}s | "
+                f"{fmt(phase.get('latency_p50'))}s | {fmt(phase.get('latency_p90'))}s | "
+                f"{fmt(phase.get('latency_p99'))}s | {fmt(phase.get('latency_p99.9'))}s | "
+                f"{fmt(phase.get('realtime_factor_p50'), 2)}x |"
+            )
+    lines.append("")
+    return lines
+
+
+def _op_profile_section(baseline: dict[str, Any], optimized: dict[str, Any], letter: str) -> list[str]:
+    lines = [f"## {letter}. Operator hotspots", ""]
+    lines.append("Collected with `tts_benchmark.py --op-profile`; wall times of profiled runs include ORT profiling overhead.")
+    lines.append("")
+    for label, result in (("baseline", baseline), ("optimized", optimized)):
+        op_profile = result.get("op_profile")
+        if not op_profile:
+            continue
+        lines.append(f"### {label}: operator types")
+        lines.append("")
+        lines.append("| session | op type | time | calls | avg | share |")
+        lines.append("|---|---|---:|---:|---:|---:|")
+        for row in op_profile.get("op_type_hotspots", []):
+            lines.append(
+                f"| {row['session']} | {row['op_type']} | {fmt(row['time_ms'])}ms | {row['calls']} | "
+                f"{fmt(row['average_ms'])}ms | {fmt(row['share'] * 100, 1)}% |"
+            )
+        lines.append("")
+        lines.append(f"### {label}: nodes")
+        lines.append("")
+        lines.append("| session | node | op type | time | calls | share | common input shape |")
+        lines.append("|---|---|---|---:|---:|---:|---|")
+        for row in op_profile.get("node_hotspots", []):
+            lines.append(
+                f"| {row['session']} | {_cell(row['node'])} | {row['op_type']} | {fmt(row['time_ms'])}ms | "
+                f"{row['calls']} | {fmt(row['share'] * 100, 1)}% | {_cell(row['common_input_shape'])} |"
+            )
+        lines.append("")
+        lines.append(f"### {label}: thread utilization")
+        lines.append("")
+        lines.append("| session | runs | run time | kernel time | pool threads | avg active threads | utilization | parallel kernel share |")
+        lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
+        for session, stats in op_profile.get("threads", {}).items():
+            utilization = stats.get("thread_utilization")
+            parallel = stats.get("parallel_kernel_share")
+            lines.append(
+                f"| {session} | {stats['model_runs']} | {fmt(stats['model_run_ms'])}ms | {fmt(stats['kernel_ms'])}ms | "
+                f"{stats['pool_threads']} | {fmt(stats.get('average_active_threads'), 2)} | "
+                f"{fmt(utilization * 100 if utilization is not None else None, 1)}% | "
+                f"{fmt(parallel * 100 if parallel is not None else None, 1)}% |"
+            )
+        lines.append("")
+    return lines
+
+
 def _cell(value: Any) -> str:
     text = str(value or "")
     return text.replace("|", "\\|").replace("\n", " ")[:240]
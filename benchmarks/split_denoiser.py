@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+import onnx
+import onnxruntime as ort
+from onnx import external_data_helper, shape_inference
+
+from profile_utils import TEST_TEXTS, collect_environment, write_json
+
+
+SCRIPT_REPO_ROOT = Path(__file__).resolve().parents[1]
+TARGET_REPO_ROOT = Path(os.getenv("SUPERTONIC_REPO_ROOT", str(SCRIPT_REPO_ROOT))).resolve()
+PY_ROOT = TARGET_REPO_ROOT / "py"
+if str(PY_ROOT) not in sys.path:
+    sys.path.insert(0, str(PY_ROOT))
+
+from helper import SupertonicTTS  # noqa: E402
+
+
+# Denoiser inputs that change on every step; the rest are fixed per request
+STEP_INPUTS = ("noisy_latents", "timestep")
+# Never hoisted out of the step: each run must draw fresh values
+NONDETERMINISTIC_OPS = {"RandomNormal", "RandomNormalLike", "RandomUniform", "RandomUniformLike", "Multinomial", "Bernoulli", "Dropout"}
+# Operators counted when reporting how much compute moved
+HEAVY_OPS = {"MatMul", "Gemm", "Conv", "ConvTranspose", "Attention", "MultiHeadAttention", "Einsum"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Split latent_denoiser.onnx into a conditioning model run once per chunk and a per-step model."
+    )
+    parser.add_argument("--onnx-dir", default=str(TARGET_REPO_ROOT / "assets"), help="Split models are written to <onnx-dir>/onnx.")
+    parser.add_argument(
+        "--precision",
+        choices=list(SupertonicTTS.PRECISIONS),
+        default="fp32",
+        help="Which denoiser file to split (INT8 variants come from quantize.py).",
+    )
+    parser.add_argument("--step-inputs", nargs="+", default=list(STEP_INPUTS), help="Inputs that change between steps.")
+    parser.add_argument("--skip-verification", action="store_true")
+    parser.add_argument("--voice", default="M1")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--steps", type=int, default=15)
+    parser.add_argument("--speed", type=float, default=1.05)
+    parser.add_argument("--seed", type=int, default=20260502)
+    parser.add_argument("--repeats", type=int, default=3, help="Timed passes over the recorded steps.")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="Largest allowed absolute difference from the original model.")
+    parser.add_argument("--results", default=None, help="Optional JSON with the split and verification details.")
+    parser.add_argument("--package-manager", default="uv")
+    return parser.parse_args()
+
+
+def subgraph_references(graph: onnx.GraphProto) -> set[str]:
+    """Names a control-flow body reads from the enclosing graph."""
+    defined = {value.name for value in graph.input} | {tensor.name for tensor in graph.initializer}
+    used: set[str] = set()
+    for node in graph.node:
+        used |= node_inputs(node) - defined
+        defined.update(node.output)
+    return used
+
+
+def node_inputs(node: onnx.NodeProto) -> set[str]:
+    """Explicit inputs plus outer-scope names used by If/Loop/Scan bodies."""
+    names = {name for name in node.input if name}
+    for attribute in node.attribute:
+        if attribute.type == onnx.AttributeProto.GRAPH:
+            names |= subgraph_references(attribute.g)
+        elif attribute.type == onnx.AttributeProto.GRAPHS:
+            for graph in attribute.graphs:
+                names |= subgraph_references(graph)
+    return names
+
+
+def prune(nodes: list[onnx.NodeProto], outputs: Iterable[str]) -> list[onnx.NodeProto]:
+    """The nodes ``outputs`` depend on, keeping the order of ``nodes``.
+
+    ``nodes`` must list every producer before its consumers.
+    """
+    needed = set(outputs)
+    kept = []
+    for node in reversed(nodes):
+        if needed.intersection(node.output):
+            kept.append(node)
+            needed |= node_inputs(node)
+    return kept[::-1]
+
+
+def make_model(
+    source: onnx.ModelProto,
+    name: str,
+    nodes: list[onnx.NodeProto],
+    inputs: list[onnx.ValueInfoProto],
+    outputs: list[onnx.ValueInfoProto],
+) -> onnx.ModelProto:
+    used = set()
+    for node in nodes:
+        used |= node_inputs(node)
+    graph = onnx.helper.make_graph(
+        nodes,
+        name,
+        inputs,
+        outputs,
+        [tensor for tensor in source.graph.initializer if tensor.name in used],
+    )
+    model = onnx.helper.make_model(graph, opset_imports=source.opset_import, producer_name="split_denoiser")
+    model.ir_version = source.ir_version
+    model.functions.extend(source.functions)
+    return model
+
+
+def split_denoiser(
+    model: onnx.ModelProto, step_inputs: Iterable[str] = STEP_INPUTS
+) -> tuple[onnx.ModelProto, onnx.ModelProto, dict[str, Any]]:
+    """Split ``model`` into (conditioning, step) models and describe the split.
+
+    A node joins the conditioning model when every input is a per-request
+    input, a constant, or another conditioning output, and at least one is
+    not a constant. Tensors crossing to the step model become outputs of
+    the conditioning model and inputs of the step model, under the same
+    names. Constant-only nodes are copied into whichever half needs them.
+    """
+    graph = model.graph
+    step_inputs = set(step_inputs)
+    graph_inputs = {value.name: value for value in graph.input}
+    missing = step_inputs - set(graph_inputs)
+    if missing:
+        raise ValueError(f"Denoiser has no input(s) {sorted(missing)}")
+
+    constants = {tensor.name for tensor in graph.initializer}
+    per_request = {name for name in graph_inputs if name not in step_inputs}
+    condition_nodes, step_nodes, constant_nodes = [], [], []
+    for node in graph.node:
+        inputs = node_inputs(node)
+        if node.op_type in NONDETERMINISTIC_OPS:
+            step_nodes.append(node)
+        elif inputs <= constants:
+            constant_nodes.append(node)
+            constants.update(node.output)
+        elif inputs <= constants | per_request:
+            condition_nodes.append(node)
+            per_request.update(node.output)
+        else:
+            step_nodes.append(node)
+
+    produced = {name for node in condition_nodes for name in node.output}
+    if produced.intersection(value.name for value in graph.output):
+        raise ValueError("A denoiser output depends only on per-request inputs; nothing is left to split")
+    step_reads = set()
+    for node in step_nodes:
+        step_reads |= node_inputs(node)
+    boundary = sorted(produced & step_reads)
+    if not boundary:
+        raise ValueError("No part of the denoiser depends only on per-request inputs")
+
+    inferred = shape_inference.infer_shapes(model)
+    value_infos = {value.name: value for value in inferred.graph.value_info}
+    untyped = [name for name in boundary if name not in value_infos]
+    if untyped:
+        raise ValueError(f"Shape inference gave no type for {untyped}")
+
+    condition_body = prune(constant_nodes + condition_nodes, boundary)
+    condition_reads = set()
+    for node in condition_body:
+        condition_reads |= node_inputs(node)
+    condition = make_model(
+        model,
+        f"{graph.name}_condition",
+        condition_body,
+        [value for name, value in graph_inputs.items() if name in condition_reads],
+        [value_infos[name] for name in boundary],
+    )
+
+    step_body = prune(constant_nodes + step_nodes, [value.name for value in graph.output])
+    step = make_model(
+        model,
+        f"{graph.name}_step",
+        step_body,
+        [value for name, value in graph_inputs.items() if name in step_reads]
+        + [value_infos[name] for name in boundary],
+        list(graph.output),
+    )
+    for part in (condition, step):
+        onnx.checker.check_model(part)
+
+    def heavy(nodes: list[onnx.NodeProto]) -> int:
+        return sum(node.op_type in HEAVY_OPS for node in nodes)
+
+    report = {
+        "nodes": len(graph.node),
+        "condition_nodes": len(condition_nodes),
+        "step_nodes": len(step_body),
+        "heavy_ops": heavy(list(graph.node)),
+        "condition_heavy_ops": heavy(condition_nodes),
+        "boundary_tensors": boundary,
+        "condition_inputs": [value.name for value in condition.graph.input],
+        "step_inputs": [value.name for value in step.graph.input],
+    }
+    return condition, step, report
+
+
+def save(model: onnx.ModelProto, path: Path, external: bool) -> None:
+    if external:
+        onnx.save_model(model, path, save_as_external_data=True, location=f"{path.name}.data")
+    else:
+        onnx.save_model(model, path)
+
+
+class RecordingDenoiser:
+    """Keeps the feeds of every denoiser run of one synthesis.
+
+    An input passed again as the same array is recorded as the same copy,
+    so replays reuse conditioning exactly as the generate loop does.
+    """
+
+    def __init__(self, session: Any):
+        self._session = session
+        self._last: dict[str, tuple[Any, np.ndarray]] = {}
+        self.feeds: list[dict[str, np.ndarray]] = []
+
+    def run(self, output_names: Any, feeds: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        recorded = {}
+        for name, value in feeds.items():
+            last = self._last.get(name)
+            recorded[name] = last[1] if last is not None and last[0] is value else np.array(value)
+            self._last[name] = (value, recorded[name])
+        self.feeds.append(recorded)
+        return self._session.run(output_names, feeds, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+def verify(args: argparse.Namespace) -> dict[str, Any]:
+    """Replay recorded denoiser feeds through both forms; compare outputs and time them."""
+    tts = SupertonicTTS(args.onnx_dir, backend="cpu", precision=args.precision)
+    # A fused model would run the steps without calling latent_denoiser
+    tts.latent_denoiser_loop = None
+    # Record through the original model even though the split now exists
+    recorder = RecordingDenoiser(tts._create_session("latent_denoiser"))
+    tts.latent_denoiser = recorder
+    sample = max(TEST_TEXTS, key=lambda item: item["word_count"])
+    np.random.seed(args.seed)
+    tts(sample["text"], args.language, args.voice, args.steps, args.speed)
+
+    original = recorder._session
+    split = tts._load_split_denoiser()
+    max_error = 0.0
+    for feeds in recorder.feeds:
+        expected = original.run(None, feeds)[0]
+        actual = split.run(None, feeds)[0]
+        max_error = max(max_error, float(np.max(np.abs(expected - actual))))
+
+    def timed(session: Any) -> float:
+        best = float("inf")
+        for _ in range(args.repeats):
+            # Fresh arrays per pass, shared between steps like the recording,
+            # so the split model reruns its conditioning once per chunk
+            copies: dict[int, np.ndarray] = {}
+            passes = [
+                {name: copies.setdefault(id(value), value.copy()) for name, value in feeds.items()}
+                for feeds in recorder.feeds
+            ]
+            start = time.perf_counter()
+            for feeds in passes:
+                session.run(None, feeds)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    original_seconds = timed(original)
+    split_seconds = timed(split)
+    return {
+        "denoiser_runs": len(recorder.feeds),
+        "word_count": sample["word_count"],
+        "max_abs_error": max_error,
+        "original_seconds": original_seconds,
+        "split_seconds": split_seconds,
+        "speedup": original_seconds / split_seconds if split_seconds else 0.0,
+        "providers": ort.get_available_providers(),
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    onnx_dir = Path(args.onnx_dir) / "onnx"
+    stem = "latent_denoiser" if args.precision == "fp32" else f"latent_denoiser_{args.precision}"
+    source_path = onnx_dir / f"{stem}.onnx"
+    if not source_path.exists():
+        print(f"No {source_path}")
+        return 2
+
+    model = onnx.load(source_path)
+    external = any(external_data_helper.uses_external_data(tensor) for tensor in model.graph.initializer)
+    try:
+        condition, step, report = split_denoiser(model, args.step_inputs)
+    except ValueError as exc:
+        print(f"Cannot split {source_path.name}: {exc}")
+        return 1
+    condition_suffix, step_suffix = SupertonicTTS.SPLIT_DENOISER_SUFFIXES
+    paths = {
+        "condition": onnx_dir / f"{stem}_{condition_suffix}.onnx",
+        "step": onnx_dir / f"{stem}_{step_suffix}.onnx",
+    }
+    save(condition, paths["condition"], external)
+    save(step, paths["step"], external)
+
+    print(f"# Split {source_path.name}")
+    print("")
+    print(f"- Conditioning: {report['condition_nodes']} of {report['nodes']} nodes, {report['condition_heavy_ops']} of {report['heavy_ops']} MatMul/Gemm/Conv-type ops, run once per chunk")
+    print(f"- Precomputed tensors passed to every step: {len(report['boundary_tensors'])}")
+    print(f"- Wrote {paths['condition'].name} and {paths['step'].name}; SupertonicTTS loads them on CPU in place of {source_path.name}")
+
+    verification = None
+    if not args.skip_verification:
+        verification = verify(args)
+        print(
+            f"- Verification over {verification['denoiser_runs']} recorded steps: max abs error "
+            f"{verification['max_abs_error']:.3g}, denoiser time {verification['original_seconds']:.3f}s -> "
+            f"{verification['split_seconds']:.3f}s ({verification['speedup']:.2f}x)"
+        )
+
+    if args.results:
+        write_json(
+            args.results,
+            {
+                "kind": "split_denoiser",
+                "source": str(source_path),
+                "outputs": {name: str(path) for name, path in paths.items()},
+                "split": report,
+                "verification": verification,
+                "environment": collect_environment(
+                    command=" ".join(sys.argv), package_manager=args.package_manager, repo_root=TARGET_REPO_ROOT
+                ),
+            },
+        )
+
+    failure = None
+    if verification is not None and not verification["denoiser_runs"]:
+        failure = "No denoiser steps were recorded to check the split model"
+    elif verification is not None and verification["max_abs_error"] > args.tolerance:
+        failure = f"Split model differs from the original by more than {args.tolerance:g}"
+    if failure:
+        print(f"{failure}; removing it.")
+        for path in paths.values():
+            path.unlink()
+            path.with_name(f"{path.name}.data").unlink(missing_ok=True)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
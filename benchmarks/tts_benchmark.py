@@ -15,7 +15,10 @@ from profile_utils import (
     ResourceSampler,
     StageProfiler,
     TEST_TEXTS,
+    aggregate_ort_profiles,
     collect_environment,
+    current_rss_mb,
+    peak_rss_mb,
     write_json,
 )
 
@@ -26,7 +29,7 @@ PY_ROOT = TARGET_REPO_ROOT / "py"
 if str(PY_ROOT) not in sys.path:
     sys.path.insert(0, str(PY_ROOT))
 
-from helper import load_text_to_speech  # noqa: E402
+from helper import chunk_text, load_text_to_speech  # noqa: E402
 
 
 def parse_args() -> argparse.Namespace:
@@ -45,6 +48,23 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--warmup-runs", type=int, default=1)
     parser.add_argument("--require-cuda-provider", action="store_true")
     parser.add_argument("--package-manager", default="uv")
+    parser.add_argument(
+        "--op-profile",
+        action="store_true",
+        help="Enable ONNX Runtime profiling and aggregate operator hotspots (adds profiling overhead to timings).",
+    )
+    parser.add_argument("--op-profile-top", type=int, default=15, help="Rows in the hotspot tables.")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Synthesize sentence chunk by chunk like the streaming API and record time-to-first-audio and chunk timing.",
+    )
+    parser.add_argument(
+        "--stream-chunk-chars",
+        type=int,
+        default=300,
+        help="Maximum characters per streamed chunk (the API uses 300).",
+    )
     return parser.parse_args()
 
 
@@ -67,7 +87,77 @@ def verify_cuda(tts: Any) -> None:
         raise RuntimeError(f"CUDAExecutionProvider was required but not active: {missing}")
 
 
-def save_profile(path: str | Path, aggregate: list[dict[str, Any]], records: list[dict[str, Any]]) -> None:
+def synthesize_streaming(tts: Any, text: str, args: argparse.Namespace) -> tuple[np.ndarray, dict[str, Any]]:
+    """Synthesize ``text`` chunk by chunk the way TTSService.generate_audio_stream does.
+
+    Playback is modelled as starting when the first chunk is ready; chunk i
+    must be ready before the audio of chunks 0..i-1 has finished playing,
+    otherwise the client hears an underrun.
+    """
+    max_len = min(args.stream_chunk_chars, 120) if args.language == "ko" else args.stream_chunk_chars
+    text_chunks = chunk_text(text, max_len=max_len)
+    wav_list = []
+    chunks: list[dict[str, Any]] = []
+    start = time.perf_counter()
+    previous_ready = 0.0
+    audio_before = 0.0
+
+    for index, chunk in enumerate(text_chunks):
+        chunk_start = time.perf_counter() - start
+        wav = tts.generate(
+            [chunk],
+            voice=args.voice,
+            speed=args.speed,
+            steps=args.steps,
+            language=args.language,
+        )[0]
+        ready = time.perf_counter() - start
+        audio_seconds = len(wav) / tts.sample_rate
+        wav_list.append(wav)
+        chunks.append(
+            {
+                "index": index,
+                "characters": len(chunk),
+                "synthesis_seconds": ready - chunk_start,
+                "ready_seconds": ready,
+                "gap_seconds": ready - previous_ready,
+                "audio_seconds": audio_seconds,
+                "audio_before_seconds": audio_before,
+                "rss_mb": current_rss_mb(),
+                "peak_rss_mb": peak_rss_mb(),
+            }
+        )
+        previous_ready = ready
+        audio_before += audio_seconds
+
+    first_audio = chunks[0]["ready_seconds"]
+    for chunk in chunks:
+        # Time between the chunk being ready and the moment playback reaches it
+        chunk["playback_slack_seconds"] = first_audio + chunk["audio_before_seconds"] - chunk["ready_seconds"]
+    slacks = [chunk["playback_slack_seconds"] for chunk in chunks[1:]]
+    gaps = [chunk["gap_seconds"] for chunk in chunks[1:]]
+
+    streaming = {
+        "chunk_count": len(chunks),
+        "first_audio_latency_seconds": first_audio,
+        "first_chunk_audio_seconds": chunks[0]["audio_seconds"],
+        "max_inter_chunk_gap_seconds": max(gaps) if gaps else None,
+        "mean_inter_chunk_gap_seconds": sum(gaps) / len(gaps) if gaps else None,
+        "min_playback_slack_seconds": min(slacks) if slacks else None,
+        "underrun_count": sum(1 for slack in slacks if slack < 0),
+        "underrun_seconds": sum((-slack for slack in slacks if slack < 0), 0.0),
+        "peak_rss_mb": max(chunk["peak_rss_mb"] for chunk in chunks),
+        "chunks": chunks,
+    }
+    return np.concatenate(wav_list), streaming
+
+
+def save_profile(
+    path: str | Path,
+    aggregate: list[dict[str, Any]],
+    records: list[dict[str, Any]],
+    op_profile: dict[str, Any] | None = None,
+) -> None:
     lines = ["Supertonic TTS benchmark profile", "", "Aggregate component timings:"]
     for row in aggregate:
         lines.append(
@@ -83,6 +173,29 @@ def save_profile(path: str | Path, aggregate: list[dict[str, Any]], records: lis
                 f"  - {row['component']}: {row['time_seconds']:.6f}s "
                 f"({row['count']} calls)"
             )
+    if op_profile:
+        lines.append("")
+        lines.append("Operator type hotspots:")
+        for row in op_profile["op_type_hotspots"]:
+            lines.append(
+                f"- {row['session']}/{row['op_type']}: {row['time_ms']:.3f}ms "
+                f"({row['calls']} calls, {row['share'] * 100:.1f}%)"
+            )
+        lines.append("")
+        lines.append("Node hotspots:")
+        for row in op_profile["node_hotspots"]:
+            lines.append(
+                f"- {row['session']}/{row['node']} ({row['op_type']}): {row['time_ms']:.3f}ms "
+                f"({row['calls']} calls, {row['share'] * 100:.1f}%, input {row['common_input_shape']})"
+            )
+        lines.append("")
+        lines.append("Thread utilization:")
+        for session, stats in op_profile["threads"].items():
+            lines.append(
+                f"- {session}: pool {stats['pool_threads']} threads, "
+                f"avg active {stats['average_active_threads'] or 0:.2f}, "
+                f"parallel kernel share {(stats['parallel_kernel_share'] or 0) * 100:.1f}%"
+            )
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
     target.write_text("\n".join(lines) + "\n", encoding="utf-8")
@@ -110,8 +223,18 @@ def main() -> int:
         verify_cuda(tts)
 
     providers = provider_names(tts)
+    session_names = ("text_encoder", "latent_denoiser", "voice_decoder")
+    op_profile_origins: dict[str, float] = {}
+    if args.op_profile:
+        op_profile_dir = output_dir / "ort_profiles"
+        op_profile_dir.mkdir(parents=True, exist_ok=True)
+        for name in session_names:
+            op_profile_origins[name] = tts.start_profiling(name, str(op_profile_dir / name))
     tts.text_encoder = ProfilingSession("text_encoder", tts.text_encoder, profiler)
     tts.latent_denoiser = ProfilingSession("latent_denoiser", tts.latent_denoiser, profiler)
+    if getattr(tts, "latent_denoiser_loop", None) is not None:
+        # Fused blocks of steps count as denoiser time
+        tts.latent_denoiser_loop = ProfilingSession("latent_denoiser", tts.latent_denoiser_loop, profiler)
     tts.voice_decoder = ProfilingSession("voice_decoder", tts.voice_decoder, profiler)
 
     warmup_records = []
@@ -123,6 +246,11 @@ def main() -> int:
             {"warmup_index": warmup_index, "wall_time_seconds": time.perf_counter() - start}
         )
 
+    # Operator events before this point belong to warmup runs
+    op_profile_start_us = {
+        name: (time.perf_counter() - origin) * 1e6 for name, origin in op_profile_origins.items()
+    }
+
     profiler.reset()
     records: list[dict[str, Any]] = []
     aggregate_profiler = StageProfiler()
@@ -132,13 +260,17 @@ def main() -> int:
         profiler.reset()
         with ResourceSampler(sample_gpu=args.device == "gpu") as sampler:
             gen_start = time.perf_counter()
-            wav, duration = tts(sample["text"], args.language, args.voice, args.steps, args.speed)
+            streaming = None
+            if args.stream:
+                audio, streaming = synthesize_streaming(tts, sample["text"], args)
+            else:
+                wav, duration = tts(sample["text"], args.language, args.voice, args.steps, args.speed)
+                audio = wav[0, : int(tts.sample_rate * float(duration[0]))]
             generation_wall_time = time.perf_counter() - gen_start
 
             output_path = output_dir / f"{sample['word_count']:03d}_words.wav"
             write_start = time.perf_counter()
-            sample_count = int(tts.sample_rate * float(duration[0]))
-            sf.write(output_path, wav[0, :sample_count], tts.sample_rate)
+            sf.write(output_path, audio, tts.sample_rate)
             audio_write_time = time.perf_counter() - write_start
         resource_metrics = sampler.metrics()
 
@@ -171,16 +303,26 @@ def main() -> int:
                 "realtime_factor": realtime_factor,
                 "inverse_realtime_factor": inverse_realtime_factor,
                 "model_load_time_seconds": model_load_time,
-                "first_audio_latency_seconds": None,
+                # Blocking synthesis delivers all audio at once
+                "first_audio_latency_seconds": (
+                    streaming["first_audio_latency_seconds"] if streaming else generation_wall_time
+                ),
+                "streaming": streaming,
                 "component_profile": component_profile,
                 **resource_metrics,
             }
         )
 
     aggregate_profile = aggregate_profiler.summary()
+    op_profile = None
+    if args.op_profile:
+        traces = {name: [tts.stop_profiling(name)] for name in session_names}
+        op_profile = aggregate_ort_profiles(traces, op_profile_start_us, top=args.op_profile_top)
+        op_profile["traces"] = {name: [str(path) for path in paths] for name, paths in traces.items()}
     result = {
         "label": args.label,
         "device": args.device,
+        "mode": "stream" if args.stream else "batch",
         "created_at_unix": time.time(),
         "environment": environment,
         "script_repo_root": str(SCRIPT_REPO_ROOT),
@@ -191,9 +333,10 @@ def main() -> int:
         "warmup_records": warmup_records,
         "records": records,
         "aggregate_component_profile": aggregate_profile,
+        "op_profile": op_profile,
     }
     write_json(args.results, result)
-    save_profile(args.profile_out, aggregate_profile, records)
+    save_profile(args.profile_out, aggregate_profile, records, op_profile)
     print(f"Wrote results to {args.results}")
     print(f"Wrote profile to {args.profile_out}")
     return 0
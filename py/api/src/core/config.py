@@ -1,9 +1,23 @@
 """Configuration settings for Supertonic FastAPI server"""
 
+import json
 import os
 from pydantic_settings import BaseSettings
 
 
+def _tuned(key: str, default):
+    """Default from the SUPERTONIC_ORT_PROFILE tuning profile, if one is set"""
+    path = os.getenv("SUPERTONIC_ORT_PROFILE")
+    if not path:
+        return default
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get(key, default)
+    except (OSError, ValueError):
+        # helper.SupertonicTTS reports the broken profile when the model loads
+        return default
+
+
 class Settings(BaseSettings):
     """Application settings"""
     
@@ -20,12 +34,78 @@ class Settings(BaseSettings):
     use_gpu: bool = os.getenv("USE_GPU", "false").lower() == "true"
     ort_backend: str = os.getenv("SUPERTONIC_ORT_BACKEND", "cuda" if use_gpu else "cpu")
     openvino_device: str = os.getenv("OPENVINO_DEVICE", "GPU")
+    # fp32, int8_dynamic or int8_static (INT8 variants from benchmarks/quantize.py, CPU only)
+    model_precision: str = os.getenv("SUPERTONIC_PRECISION", "fp32")
+    # Stop denoising an item once a step changes its latents by less than this
+    # fraction (0 runs every step; validate with benchmarks/golden_check.py)
+    early_exit_tolerance: float = float(os.getenv("SUPERTONIC_EARLY_EXIT_TOLERANCE") or 0.0)
+    # CPU memory arena policy, applied by SupertonicTTS._create_session_options
+    # (see benchmarks/memory_soak.py for choosing a steady-state bound)
+    ort_enable_cpu_mem_arena: bool = True
+    ort_enable_mem_pattern: bool = True
+    # next_power_of_two or same_as_requested (empty keeps ORT's per-session arenas)
+    ort_arena_extend_strategy: str = ""
+    # Cap on the shared CPU arena in bytes (0 is unlimited)
+    ort_arena_max_bytes: int = 0
+    # Shrink the CPU arena after every N generations (0 never shrinks)
+    ort_arena_shrink_interval: int = 0
+    # Run every shape bucket once at startup (buckets are on by default with
+    # OpenVINO; see SUPERTONIC_TOKEN_BUCKETS / SUPERTONIC_LATENT_BUCKETS)
+    shape_bucket_warmup: bool = True
     
     # TTS Settings
     default_speed: float = 1.05
     default_total_steps: int = 15
     sample_rate: int = 44100
-    
+    # Chunks synthesized ahead of the network send in streaming responses (0 disables)
+    stream_lookahead_chunks: int = 2
+    # Steps for the first chunk of a stream without a step_schedule, so audio
+    # starts sooner while later chunks keep total_steps (0 disables)
+    stream_first_chunk_steps: int = 0
+    # Seconds between client disconnect checks while a request is synthesizing
+    disconnect_poll_interval: float = 0.25
+
+    # Inference Executor Settings
+    # Concurrent inference calls (each ONNX session already uses all intra-op threads)
+    inference_concurrency: int = _tuned("inference_concurrency", 1)
+    # Requests allowed to wait for an inference slot before new ones get 429
+    inference_max_queue: int = 32
+    # Seconds a request may wait for a slot before it is rejected with 429
+    inference_queue_timeout: float = 10.0
+    # Priority class for requests without a priority field or X-Priority header
+    scheduler_default_priority: str = "default"
+    # Fair-share weights per client, e.g. "agent-frontend=4,audiobooks=0.5"
+    scheduler_client_weights: str = ""
+
+    # Adaptive Step Settings
+    # Lower total_steps per chunk under load to hold the latency SLO below
+    adaptive_steps_enabled: bool = False
+    # Target seconds from a chunk's submission to its audio, queue wait included
+    adaptive_steps_slo_seconds: float = 2.0
+    # Fewest steps the controller may use (requests asking for fewer keep theirs)
+    adaptive_steps_floor: int = 6
+
+    # Audio Encoding Settings
+    # Comma-separated encoder backends, tried in order (lameenc, soundfile, ffmpeg)
+    audio_encoder_backends: str = os.getenv(
+        "AUDIO_ENCODER_BACKENDS", "lameenc,soundfile,ffmpeg"
+    )
+
+    # Admin Settings
+    # Bearer token for /admin endpoints (admin endpoints are disabled when empty)
+    admin_token: str = ""
+    # Directory for ORT profiling traces captured via /admin/profiling
+    profiling_dir: str = "profiles"
+    # Upper bound on requests captured by a single profiling run
+    profiling_max_requests: int = 100
+
+    # Request Trace Settings
+    # JSON-lines file recording every speech request for replay (disabled when empty)
+    request_trace_path: str = ""
+    # Add a salted SHA-256 of the input text to each trace record
+    request_trace_hash_text: bool = False
+    request_trace_salt: str = ""
+
     # CORS Settings
     cors_enabled: bool = True
     cors_origins: list = ["*"]
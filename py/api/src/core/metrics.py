@@ -0,0 +1,315 @@
+"""Lightweight Prometheus metrics for the TTS server
+
+Only the small subset of the Prometheus data model the server needs is
+implemented here (counters, gauges, histograms and callback gauges), so
+instrumentation costs a dict lookup, a bisect and a lock per observation and
+adds no dependency. ``render()`` produces the text exposition format served
+at ``/metrics``.
+"""
+
+import bisect
+import math
+import threading
+from typing import Callable, Iterable, Optional
+
+
+# Latency buckets in seconds, from sub-millisecond tokenization to long chunks
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+REALTIME_FACTOR_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class _Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed bucket bounds"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+
+        lines = []
+        for key, counts, total in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                bucket_labels = dict(labels, le=_format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Metric whose value is read from a callback at scrape time"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Optional[float]],
+        metric_type: str = "gauge",
+    ):
+        super().__init__(name, documentation)
+        self.metric_type = metric_type
+        self.callback = callback
+
+    def samples(self) -> list[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            return []
+        if value is None:
+            return []
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add (or replace) a metric by name and return it"""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            samples = metric.samples()
+            if samples:
+                lines.extend(metric.header())
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+QUEUE_WAIT_SECONDS = REGISTRY.register(
+    Histogram(
+        "supertonic_queue_wait_seconds",
+        "Time a chunk waited for an inference slot",
+        ["priority"],
+    )
+)
+STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "supertonic_stage_seconds",
+        "Per-chunk time spent in each synthesis stage",
+        ["stage"],
+    )
+)
+DENOISE_STEP_SECONDS = REGISTRY.register(
+    Histogram(
+        "supertonic_denoise_step_seconds",
+        "Time of a single latent_denoiser step",
+        ["step"],
+    )
+)
+AUDIO_CONVERSION_SECONDS = REGISTRY.register(
+    Histogram(
+        "supertonic_audio_conversion_seconds",
+        "Time to convert a WAV chunk to the response format",
+        ["format", "backend"],
+    )
+)
+REALTIME_FACTOR = REGISTRY.register(
+    Histogram(
+        "supertonic_realtime_factor",
+        "Seconds of audio produced per second of synthesis, per chunk",
+        buckets=REALTIME_FACTOR_BUCKETS,
+    )
+)
+BATCH_SIZE = REGISTRY.register(
+    Histogram(
+        "supertonic_batch_size",
+        "Items per model batch",
+        buckets=BATCH_SIZE_BUCKETS,
+    )
+)
+PADDING_RATIO = REGISTRY.register(
+    Histogram(
+        "supertonic_padding_ratio",
+        "Fraction of padded positions per batch",
+        ["tensor"],
+        buckets=RATIO_BUCKETS,
+    )
+)
+AUDIO_SECONDS = REGISTRY.register(
+    Counter("supertonic_audio_seconds_total", "Seconds of audio synthesized")
+)
+ACTIVE_STREAMS = REGISTRY.register(
+    Gauge("supertonic_active_streams", "Streaming responses currently open")
+)
+EARLY_EXIT_STEPS_SAVED = REGISTRY.register(
+    Counter(
+        "supertonic_early_exit_steps_saved_total",
+        "Denoiser steps skipped because an item's latents had converged",
+    )
+)
+REQUESTS_REJECTED = REGISTRY.register(
+    Counter(
+        "supertonic_requests_rejected_total",
+        "Requests rejected by inference admission control",
+    )
+)
+
+
+def observe_generation(profile: dict, audio_seconds: float) -> None:
+    """Record a SupertonicTTS.generate profile dict in the stage metrics"""
+    for stage in ("tokenize", "text_encoder", "voice_decoder"):
+        seconds = profile.get(f"{stage}_seconds")
+        if seconds is not None:
+            STAGE_SECONDS.observe(seconds, stage=stage)
+
+    for step, seconds in enumerate(profile.get("denoise_step_seconds", ())):
+        DENOISE_STEP_SECONDS.observe(seconds, step=step)
+
+    if "batch_size" in profile:
+        BATCH_SIZE.observe(profile["batch_size"])
+    for tensor in ("token", "latent"):
+        ratio = profile.get(f"{tensor}_padding_ratio")
+        if ratio is not None:
+            PADDING_RATIO.observe(ratio, tensor=tensor)
+
+    steps_saved = profile.get("early_exit_steps_saved")
+    if steps_saved:
+        EARLY_EXIT_STEPS_SAVED.inc(steps_saved)
+
+    generate_seconds = profile.get("generate_seconds")
+    if generate_seconds:
+        REALTIME_FACTOR.observe(audio_seconds / generate_seconds)
+    AUDIO_SECONDS.inc(audio_seconds)
+
+
+def render() -> str:
+    """Render all registered metrics in the Prometheus text format"""
+    return REGISTRY.render()
@@ -0,0 +1,115 @@
+"""Opt-in, anonymized trace of speech requests for offline replay
+
+Each finished request is appended to a JSON-lines file with its arrival
+time, text length and parameters, outcome and latency. The text itself is
+never written; with hashing enabled a salted SHA-256 digest lets repeated
+inputs be recognized without recovering them. ``benchmarks/replay_trace.py``
+re-sends a trace against a server at its original or a scaled rate.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from .config import settings
+from .server_timing import RequestTimings
+
+
+class RequestTrace:
+    """Append one JSON line per request to ``path``"""
+
+    def __init__(self, path: str, hash_text: bool = False, salt: str = ""):
+        self.path = path
+        self.hash_text = hash_text
+        self.salt = salt
+        self._lock = threading.Lock()
+        self._file = None
+
+    def entry(
+        self,
+        request,
+        priority: str,
+        status: int,
+        timings: Optional[RequestTimings] = None,
+        arrived: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """Build the trace record for one request (without the text)"""
+        text = request.input
+        record: dict[str, Any] = {
+            "timestamp": round(arrived if arrived is not None else time.time(), 3),
+            "input_chars": len(text),
+            "input_words": len(text.split()),
+            "voice": request.voice,
+            "response_format": request.response_format,
+            "speed": request.speed,
+            "stream": request.stream,
+            "lang_code": request.lang_code,
+            "total_steps": request.total_steps,
+            "step_schedule": request.step_schedule,
+            "priority": priority,
+            "status": status,
+        }
+        if timings is not None:
+            record.update(
+                {
+                    "latency_seconds": round(time.perf_counter() - timings.start, 4),
+                    "ttfc_seconds": (
+                        round(timings.first_chunk_seconds, 4)
+                        if timings.first_chunk_seconds is not None
+                        else None
+                    ),
+                    "audio_seconds": round(timings.audio_seconds, 3),
+                    "chunks": timings.chunks,
+                    "steps_used": timings.steps_used,
+                    "steps_min": timings.steps_min,
+                }
+            )
+        if self.hash_text:
+            digest = hashlib.sha256((self.salt + text).encode("utf-8")).hexdigest()
+            record["text_sha256"] = digest
+        return record
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Append ``record`` as one line; safe to call from any thread"""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def log(self, request, priority: str, status: int, **kwargs) -> None:
+        """Record one finished request"""
+        self.write(self.entry(request, priority, status, **kwargs))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_request_trace: Optional[RequestTrace] = None
+
+
+def get_request_trace() -> Optional[RequestTrace]:
+    """Trace writer configured by settings, or None when tracing is disabled"""
+    global _request_trace
+
+    if not settings.request_trace_path:
+        return None
+    if _request_trace is None or _request_trace.path != settings.request_trace_path:
+        if _request_trace is not None:
+            _request_trace.close()
+        _request_trace = RequestTrace(
+            settings.request_trace_path,
+            hash_text=settings.request_trace_hash_text,
+            salt=settings.request_trace_salt,
+        )
+    return _request_trace
@@ -0,0 +1,134 @@
+"""Per-request stage timings exposed as ``Server-Timing`` headers
+
+The durations come from the same timing points that feed the Prometheus
+histograms in ``core.metrics`` (the ``SupertonicTTS.generate`` profile dict,
+the executor queue wait and the audio converter), summed over every chunk
+of a request.
+"""
+
+import time
+from typing import Optional
+
+from starlette.responses import StreamingResponse
+from starlette.types import Send
+
+
+# Server-Timing metric name -> profile key, in header order
+STAGES = (
+    ("queue", "queue_seconds"),
+    ("encode", "text_encoder_seconds"),
+    ("denoise", "denoise_seconds"),
+    ("decode", "voice_decoder_seconds"),
+    ("convert", "convert_seconds"),
+)
+
+
+class RequestTimings:
+    """Accumulate stage durations over all chunks of one request"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.seconds: dict[str, float] = {key: 0.0 for _, key in STAGES}
+        self.first_chunk_seconds: Optional[float] = None
+        self.audio_seconds = 0.0
+        self.steps_used = 0
+        # Fewest steps any chunk ran with (lower than steps_used when
+        # adaptive steps degraded part of the request)
+        self.steps_min: Optional[int] = None
+        self.chunks = 0
+        # (stage, start, end) perf_counter spans, collected only when tracing
+        self.spans: Optional[list[tuple[str, float, float]]] = None
+
+    def new_profile(self) -> dict:
+        """Empty profile dict for one chunk; collects spans when tracing"""
+        if self.spans is None:
+            return {}
+        return {"spans": self.spans}
+
+    def add_profile(self, profile: dict, audio_seconds: Optional[float] = None) -> None:
+        """Add a profile dict from the executor, model or converter
+
+        ``audio_seconds`` is given for synthesized chunks and counts them.
+        """
+        for _, key in STAGES:
+            if key == "denoise_seconds":
+                value = sum(profile.get("denoise_step_seconds", ()))
+            else:
+                value = profile.get(key, 0.0)
+            self.seconds[key] += value
+        steps = len(profile.get("denoise_step_seconds", ()))
+        if steps:
+            self.steps_used = max(self.steps_used, steps)
+            self.steps_min = steps if self.steps_min is None else min(self.steps_min, steps)
+        if audio_seconds is not None:
+            self.audio_seconds += audio_seconds
+            self.chunks += 1
+
+    def mark_first_chunk(self) -> None:
+        """Record time-to-first-chunk (no-op after the first call)"""
+        if self.first_chunk_seconds is None:
+            self.first_chunk_seconds = time.perf_counter() - self.start
+
+    def header(self) -> str:
+        """Render the ``Server-Timing`` header value (durations in ms)"""
+        parts = [
+            f"{name};dur={self.seconds[key] * 1000:.1f}" for name, key in STAGES
+        ]
+        if self.first_chunk_seconds is not None:
+            parts.append(f"ttfc;dur={self.first_chunk_seconds * 1000:.1f}")
+        parts.append(f'audio;desc="{self.audio_seconds:.3f}s"')
+        parts.append(f'steps;desc="{self.steps_used}"')
+        if self.steps_min is not None and self.steps_min < self.steps_used:
+            parts.append(f'steps_min;desc="{self.steps_min}"')
+        parts.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+class TimedStreamingResponse(StreamingResponse):
+    """StreamingResponse that reports ``RequestTimings`` for a stream
+
+    The response start is held back until the first chunk is ready, so the
+    ``Server-Timing`` header describes the first chunk (queue wait, stage
+    durations and time-to-first-chunk). When the server supports the ASGI
+    ``http.response.trailers`` extension, the totals for the whole stream
+    are sent again as a trailer once the last chunk has been written.
+    """
+
+    def __init__(self, content, timings: RequestTimings, **kwargs):
+        super().__init__(content, **kwargs)
+        self.timings = timings
+        self.send_trailers = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        self.send_trailers = "http.response.trailers" in scope.get("extensions", {})
+        if self.send_trailers:
+            self.headers["Trailer"] = "Server-Timing"
+        await super().__call__(scope, receive, send)
+
+    async def stream_response(self, send: Send) -> None:
+        iterator = self.body_iterator.__aiter__()
+        try:
+            first = await iterator.__anext__()
+        except StopAsyncIteration:
+            first = None
+
+        self.headers["Server-Timing"] = self.timings.header()
+        start = {"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers}
+        if self.send_trailers:
+            start["trailers"] = True
+        await send(start)
+
+        if first is not None:
+            await send({"type": "http.response.body", "body": first, "more_body": True})
+            async for chunk in iterator:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        if self.send_trailers:
+            await send(
+                {
+                    "type": "http.response.trailers",
+                    "headers": [(b"server-timing", self.timings.header().encode("latin-1"))],
+                    "more_trailers": False,
+                }
+            )
@@ -9,9 +9,12 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from loguru import logger
 
+from .core import metrics
 from .core.config import settings
+from .routers.admin import router as admin_router
 from .routers.openai_compatible import router as openai_router
 from .structures.schemas import HealthResponse
 
@@ -41,6 +44,7 @@ async def lifespan(app: FastAPI):
     logger.info(f"Voice styles directory: {settings.voice_styles_dir}")
     logger.info(f"Using GPU: {settings.use_gpu}")
     logger.info(f"ONNX Runtime backend: {settings.ort_backend}")
+    logger.info(f"Model precision: {settings.model_precision}")
     logger.info(f"OpenVINO device: {settings.openvino_device}")
     
     # Initialize TTS service
@@ -63,6 +67,7 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("Shutting down Supertonic TTS API server...")
+    tts_service.executor.shutdown()
 
 
 # Initialize FastAPI app
@@ -88,6 +93,7 @@ if settings.cors_enabled:
 
 # Include routers
 app.include_router(openai_router, prefix="/v1")
+app.include_router(admin_router, prefix="/admin")
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -95,16 +101,31 @@ async def health_check():
     """Health check endpoint"""
     from .services.tts_service import get_tts_service
     
+    queue = None
     try:
         tts_service = await get_tts_service()
         model_loaded = tts_service._initialized
+        queue = tts_service.executor.stats()
     except Exception:
         model_loaded = False
-    
+
+    status = "healthy" if model_loaded else "initializing"
+    if queue is not None and queue["queue_depth"] >= queue["max_queue"]:
+        status = "overloaded"
+
     return HealthResponse(
-        status="healthy" if model_loaded else "initializing",
+        status=status,
         model_loaded=model_loaded,
         version=settings.api_version,
+        queue=queue,
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus metrics in the text exposition format"""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
     )
 
 
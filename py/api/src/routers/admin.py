@@ -0,0 +1,77 @@
+"""Authenticated admin endpoints"""
+
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from ..core.config import settings
+from ..services.tts_service import get_tts_service
+from ..structures.schemas import ProfilingRequest
+
+
+def require_admin(client_request: Request):
+    """Reject requests without the configured admin token"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    token = client_request.headers.get("x-admin-token", "")
+    authorization = client_request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+
+    if not hmac.compare_digest(token.encode(), settings.admin_token.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail={"error": "unauthorized", "message": "Invalid admin token"},
+        )
+
+
+router = APIRouter(tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.post("/profiling")
+async def start_profiling(request: ProfilingRequest):
+    """
+    Enable ONNX Runtime profiling of one session for the next N speech requests.
+
+    The capture finishes on its own after the last request; poll
+    ``GET /admin/profiling`` for the trace path and top-operator summary.
+    """
+    if request.requests > settings.profiling_max_requests:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "invalid_request",
+                "message": f"At most {settings.profiling_max_requests} requests can be profiled",
+            },
+        )
+
+    tts_service = await get_tts_service()
+    try:
+        return await tts_service.profiler.start(
+            tts_service.tts_model, request.session, request.requests
+        )
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=409, detail={"error": "profiling_active", "message": str(e)}
+        )
+
+
+@router.get("/profiling")
+async def profiling_status():
+    """Current profiling state and the result of the last capture"""
+    tts_service = await get_tts_service()
+    return tts_service.profiler.status()
+
+
+@router.delete("/profiling")
+async def stop_profiling():
+    """Finish the current capture early and return its summary"""
+    tts_service = await get_tts_service()
+    result = await tts_service.profiler.stop()
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "not_found", "message": "No profiling capture available"},
+        )
+    return result
@@ -1,15 +1,118 @@
 """OpenAI-compatible API endpoints"""
 
+import asyncio
+import contextlib
+import hashlib
+import time
+from contextlib import aclosing
+
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse, Response
+from fastapi.responses import Response
 from loguru import logger
 
 from ..structures.schemas import OpenAISpeechRequest, VoicesResponse, VoiceInfo
-from ..services.tts_service import get_tts_service
+from ..core.config import settings
+from ..core.metrics import ACTIVE_STREAMS
+from ..core.request_trace import get_request_trace
+from ..core.server_timing import RequestTimings, TimedStreamingResponse
+from ..services.tts_service import (
+    CancellationToken,
+    GenerationCancelled,
+    get_tts_service,
+)
 from ..services.audio_converter import convert_audio
+from ..services.inference_executor import OverloadedError
 
 router = APIRouter(tags=["OpenAI Compatible"])
 
+# Non-standard status (nginx convention) for requests abandoned by the client
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _cancel_on_disconnect(client_request: Request, token: CancellationToken):
+    """Cancel ``token`` as soon as the client disconnects"""
+    while not token.cancelled:
+        if await client_request.is_disconnected():
+            logger.info("Client disconnected, cancelling synthesis")
+            token.cancel()
+            return
+        await asyncio.sleep(settings.disconnect_poll_interval)
+
+
+@contextlib.asynccontextmanager
+async def _disconnect_watcher(client_request: Request):
+    """Yield a CancellationToken that is cancelled when the client goes away
+
+    The token is also cancelled on exit, so synthesis still running for an
+    abandoned response stops at its next checkpoint.
+    """
+    token = CancellationToken()
+    watcher = asyncio.create_task(_cancel_on_disconnect(client_request, token))
+    try:
+        yield token
+    finally:
+        token.cancel()
+        watcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watcher
+
+
+@contextlib.asynccontextmanager
+async def _profiled(tts_service, timings: RequestTimings):
+    """Include the request in an armed ORT profiling capture, if any"""
+    attached = tts_service.profiler.attach(timings)
+    try:
+        yield
+    finally:
+        if attached:
+            await _release_profiled(tts_service, timings)
+
+
+async def _release_profiled(tts_service, timings: RequestTimings) -> None:
+    """Release a request from the ORT profiling capture
+
+    Shielded, so a disconnect that cancels the request cannot leave the
+    capture armed with the request still counted against it.
+    """
+    await asyncio.shield(tts_service.profiler.release(timings))
+
+
+def _trace_request(
+    request: OpenAISpeechRequest,
+    priority: str,
+    status: int,
+    timings: RequestTimings,
+    arrived: float,
+):
+    """Append the finished request to the request trace, if enabled"""
+    request_trace = get_request_trace()
+    if request_trace is not None:
+        request_trace.log(request, priority, status, timings=timings, arrived=arrived)
+
+
+def _request_priority(request: OpenAISpeechRequest, client_request: Request) -> str:
+    """Scheduling class from the request body, the X-Priority header or settings"""
+    return (
+        request.priority
+        or client_request.headers.get("x-priority", "").strip().lower()
+        or settings.scheduler_default_priority
+    )
+
+
+def _client_id(client_request: Request) -> str:
+    """Identify the caller for fair sharing: X-Client-Id, API key, then address"""
+    client_id = client_request.headers.get("x-client-id", "").strip()
+    if client_id:
+        return client_id
+    authorization = client_request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer ") and authorization[7:].strip():
+        # Never keep raw API keys around; a short digest is enough to group calls
+        digest = hashlib.sha256(authorization[7:].strip().encode()).hexdigest()
+        return f"key-{digest[:16]}"
+    if client_request.client is not None:
+        return client_request.client.host
+    return "anonymous"
+
 
 @router.post("/audio/speech")
 async def create_speech(request: OpenAISpeechRequest, client_request: Request):
@@ -18,7 +121,14 @@ async def create_speech(request: OpenAISpeechRequest, client_request: Request):
 
     Generates audio from text input using Supertonic TTS models.
     Compatible with OpenAI's TTS API format.
+
+    Responses carry a ``Server-Timing`` header with queue, encode, denoise,
+    decode and convert durations; streams report the first chunk up front
+    and the totals as a trailer where the server supports trailers.
     """
+    timings = RequestTimings()
+    arrived = time.time()
+    priority = _request_priority(request, client_request)
     try:
         # Get TTS service
         tts_service = await get_tts_service()
@@ -44,66 +154,105 @@ async def create_speech(request: OpenAISpeechRequest, client_request: Request):
             "pcm": "audio/pcm",
         }
         content_type = content_types.get(request.response_format, "audio/mpeg")
+        client_id = _client_id(client_request)
 
         if request.stream:
+            # Admit the whole stream up front; later chunks never get a 429
+            tts_service.executor.check_admission()
+
             # Streaming response
             async def audio_stream():
+                ACTIVE_STREAMS.inc()
+                profiled = tts_service.profiler.attach(timings)
+                status = 200
                 try:
                     # Stream chunk by chunk (sentence by sentence)
-                    # This prevents OOM on long texts and provides lower latency
+                    # This prevents OOM on long texts and provides lower latency.
+                    # Synthesis of the next chunks runs in the background while
+                    # this one is encoded and sent; aclosing() stops it as soon
+                    # as the loop exits, and the watcher token aborts the chunk
+                    # in flight when the client disconnects.
                     chunk_index = 0
-                    async for wav_chunk in tts_service.generate_audio_stream(
-                        text=request.input,
-                        voice=request.voice,
-                        speed=request.speed,
-                        lang_code=request.lang_code,
-                        total_steps=request.total_steps,
-                    ):
-                        # Check if client disconnected
-                        if await client_request.is_disconnected():
-                            logger.info("Client disconnected, stopping stream")
-                            break
-
-                        # Handle format conversion per chunk
-                        if request.response_format == "wav":
-                            # WAV streaming: First chunk includes header, subsequent chunks are raw PCM
-                            # Note: This produces a playable but technically invalid WAV file
-                            # (header size won't match actual data). Use opus/aac for proper streaming.
-                            if chunk_index == 0:
-                                yield wav_chunk
-                            else:
+                    async with _disconnect_watcher(client_request) as cancel_token, aclosing(
+                        tts_service.generate_audio_stream(
+                            text=request.input,
+                            voice=request.voice,
+                            speed=request.speed,
+                            lang_code=request.lang_code,
+                            total_steps=request.total_steps,
+                            step_schedule=request.step_schedule,
+                            cancel_token=cancel_token,
+                            priority=priority,
+                            client_id=client_id,
+                            timings=timings,
+                        )
+                    ) as wav_chunks:
+                        async for wav_chunk in wav_chunks:
+                            # Check if client disconnected
+                            if cancel_token.cancelled:
+                                logger.info("Client disconnected, stopping stream")
+                                status = CLIENT_CLOSED_REQUEST
+                                break
+
+                            # Handle format conversion per chunk
+                            if request.response_format == "wav":
+                                # WAV streaming: First chunk includes header, subsequent chunks are raw PCM
+                                # Note: This produces a playable but technically invalid WAV file
+                                # (header size won't match actual data). Use opus/aac for proper streaming.
+                                timings.mark_first_chunk()
+                                if chunk_index == 0:
+                                    yield wav_chunk
+                                else:
+                                    pcm_data = convert_audio(
+                                        wav_chunk, "pcm", tts_service.sample_rate
+                                    )
+                                    yield pcm_data
+
+                            elif request.response_format == "pcm":
+                                # Raw PCM - just strip WAV header
                                 pcm_data = convert_audio(
                                     wav_chunk, "pcm", tts_service.sample_rate
                                 )
+                                timings.mark_first_chunk()
                                 yield pcm_data
 
-                        elif request.response_format == "pcm":
-                            # Raw PCM - just strip WAV header
-                            pcm_data = convert_audio(
-                                wav_chunk, "pcm", tts_service.sample_rate
-                            )
-                            yield pcm_data
-
-                        else:
-                            # Opus, AAC, MP3, FLAC: These formats support proper stream concatenation
-                            # Each encoded chunk can be concatenated to form a valid file
-                            converted_chunk = convert_audio(
-                                wav_chunk,
-                                request.response_format,
-                                tts_service.sample_rate,
-                            )
-                            yield converted_chunk
-
-                        chunk_index += 1
+                            else:
+                                # Opus, AAC, MP3, FLAC: These formats support proper stream concatenation
+                                # Each encoded chunk can be concatenated to form a valid file.
+                                # Encode off the event loop so synthesis of the next chunk
+                                # keeps running meanwhile.
+                                convert_profile = timings.new_profile()
+                                converted_chunk = await asyncio.to_thread(
+                                    convert_audio,
+                                    wav_chunk,
+                                    request.response_format,
+                                    tts_service.sample_rate,
+                                    convert_profile,
+                                )
+                                timings.add_profile(convert_profile)
+                                timings.mark_first_chunk()
+                                yield converted_chunk
+
+                            chunk_index += 1
 
                     logger.info(f"Streamed {chunk_index} audio chunks")
 
+                except GenerationCancelled:
+                    logger.info("Stream cancelled after client disconnect")
+                    status = CLIENT_CLOSED_REQUEST
                 except Exception as e:
                     logger.error(f"Streaming error: {e}")
                     # Can't raise HTTP exception here as response has started
+                    status = 500
+                finally:
+                    ACTIVE_STREAMS.dec()
+                    _trace_request(request, priority, status, timings, arrived)
+                    if profiled:
+                        await _release_profiled(tts_service, timings)
 
-            return StreamingResponse(
+            return TimedStreamingResponse(
                 audio_stream(),
+                timings,
                 media_type=content_type,
                 headers={
                     "Content-Disposition": f'attachment; filename="speech.{request.response_format}"',
@@ -113,34 +262,64 @@ async def create_speech(request: OpenAISpeechRequest, client_request: Request):
             )
         else:
             # Non-streaming response
-            audio_data = await tts_service.generate_audio(
-                text=request.input,
-                voice=request.voice,
-                speed=request.speed,
-                lang_code=request.lang_code,
-                total_steps=request.total_steps,
-            )
+            async with _profiled(tts_service, timings):
+                try:
+                    async with _disconnect_watcher(client_request) as cancel_token:
+                        audio_data = await tts_service.generate_audio(
+                            text=request.input,
+                            voice=request.voice,
+                            speed=request.speed,
+                            lang_code=request.lang_code,
+                            total_steps=request.total_steps,
+                            cancel_token=cancel_token,
+                            priority=priority,
+                            client_id=client_id,
+                            timings=timings,
+                        )
+                except GenerationCancelled:
+                    logger.info("Client disconnected, synthesis cancelled")
+                    _trace_request(request, priority, CLIENT_CLOSED_REQUEST, timings, arrived)
+                    return Response(status_code=CLIENT_CLOSED_REQUEST)
 
-            # Convert to requested format
-            if request.response_format != "wav":
-                audio_data = convert_audio(
-                    audio_data,
-                    request.response_format,
-                    tts_service.sample_rate,
-                )
+                # Convert to requested format
+                if request.response_format != "wav":
+                    convert_profile = timings.new_profile()
+                    audio_data = convert_audio(
+                        audio_data,
+                        request.response_format,
+                        tts_service.sample_rate,
+                        convert_profile,
+                    )
+                    timings.add_profile(convert_profile)
+                timings.mark_first_chunk()
+                _trace_request(request, priority, 200, timings, arrived)
 
-            return Response(
-                content=audio_data,
-                media_type=content_type,
-                headers={
-                    "Content-Disposition": f'attachment; filename="speech.{request.response_format}"',
-                },
-            )
+                return Response(
+                    content=audio_data,
+                    media_type=content_type,
+                    headers={
+                        "Content-Disposition": f'attachment; filename="speech.{request.response_format}"',
+                        "Server-Timing": timings.header(),
+                    },
+                )
 
-    except HTTPException:
+    except HTTPException as e:
+        _trace_request(request, priority, e.status_code, timings, arrived)
         raise
+    except OverloadedError as e:
+        logger.warning(f"Rejecting speech request: {e}")
+        _trace_request(request, priority, 429, timings, arrived)
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "error": "server_overloaded",
+                "message": str(e),
+            },
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         logger.error(f"Error generating speech: {e}", exc_info=True)
+        _trace_request(request, priority, 500, timings, arrived)
         raise HTTPException(
             status_code=500,
             detail={
@@ -2,12 +2,261 @@
 
 import io
 import subprocess
-from typing import Literal
+import time
+from typing import Literal, Optional
 
 import numpy as np
 import soundfile as sf
 from loguru import logger
 
+from ..core.config import settings
+from ..core.metrics import AUDIO_CONVERSION_SECONDS
+
+try:
+    import lameenc
+except ImportError:  # pragma: no cover - optional dependency
+    lameenc = None
+
+try:
+    import soxr
+except ImportError:  # pragma: no cover - optional dependency
+    soxr = None
+
+
+def _read_wav(audio_data: bytes) -> tuple[np.ndarray, int]:
+    """Decode WAV bytes into float32 samples and their sample rate"""
+    with io.BytesIO(audio_data) as wav_io:
+        data, sample_rate = sf.read(wav_io, dtype="float32")
+    return data, sample_rate
+
+
+def _resample(data: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Resample audio, preferring soxr and falling back to linear interpolation"""
+    if source_rate == target_rate:
+        return data
+    if soxr is not None:
+        return soxr.resample(data, source_rate, target_rate).astype(np.float32)
+
+    target_length = int(round(len(data) * target_rate / source_rate))
+    source_positions = np.arange(len(data), dtype=np.float64)
+    target_positions = np.linspace(0, len(data) - 1, target_length)
+    return np.interp(target_positions, source_positions, data).astype(np.float32)
+
+
+class EncoderBackend:
+    """Base class for audio encoder backends
+
+    Backends receive complete WAV bytes and return the encoded payload for a
+    single output format. ``AudioConverter`` tries the configured backends in
+    order and falls back to the next one when a backend is unavailable or
+    fails.
+    """
+
+    name: str = "base"
+    formats: frozenset[str] = frozenset()
+
+    def is_available(self) -> bool:
+        """Whether the backend can run in this environment"""
+        return True
+
+    def supports(self, output_format: str) -> bool:
+        """Whether the backend can produce ``output_format``"""
+        return output_format in self.formats and self.is_available()
+
+    def encode(self, audio_data: bytes, output_format: str, sample_rate: int) -> bytes:
+        """Encode WAV bytes to ``output_format``"""
+        raise NotImplementedError
+
+
+class SoundfileEncoder(EncoderBackend):
+    """In-process encoding through libsndfile (FLAC, Ogg/Opus, MP3)"""
+
+    name = "soundfile"
+    formats = frozenset({"flac", "opus", "mp3"})
+
+    # Opus only accepts these rates; speech is resampled to the nearest one above.
+    OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+    # Same bitrate as the ffmpeg backend. libsndfile maps compression level
+    # 0..1 linearly onto 256..6 kbps per channel.
+    OPUS_BITRATE = 64000
+    OPUS_COMPRESSION_LEVEL = (256000 - OPUS_BITRATE) / (256000 - 6000)
+    # Constant 128 kbps MP3 like the lameenc and ffmpeg backends. libsndfile
+    # maps compression level 0..1 linearly onto the bitrate range of the
+    # MPEG version for the sample rate (in kbps) and LAME picks the nearest
+    # legal bitrate; below 16 kHz the format tops out at 64 kbps.
+    MP3_BITRATE_KBPS = 128
+    MP3_BITRATE_RANGES_KBPS = ((32000, 320, 32), (16000, 160, 8), (0, 64, 8))
+
+    @classmethod
+    def _mp3_compression_level(cls, sample_rate: int) -> float:
+        _, highest, lowest = next(
+            entry for entry in cls.MP3_BITRATE_RANGES_KBPS if sample_rate >= entry[0]
+        )
+        return max(0.0, (highest - cls.MP3_BITRATE_KBPS) / (highest - lowest))
+
+    def supports(self, output_format: str) -> bool:
+        if output_format == "mp3":
+            # MP3 writing requires libsndfile >= 1.1.0
+            return "MP3" in sf.available_formats()
+        if output_format == "opus":
+            return "OPUS" in sf.available_subtypes("OGG")
+        return super().supports(output_format)
+
+    def encode(self, audio_data: bytes, output_format: str, sample_rate: int) -> bytes:
+        data, source_rate = _read_wav(audio_data)
+        buffer = io.BytesIO()
+
+        if output_format == "flac":
+            sf.write(buffer, data, source_rate, format="FLAC", subtype="PCM_16")
+        elif output_format == "opus":
+            target_rate = next(
+                (rate for rate in self.OPUS_SAMPLE_RATES if rate >= source_rate),
+                self.OPUS_SAMPLE_RATES[-1],
+            )
+            data = _resample(data, source_rate, target_rate)
+            sf.write(
+                buffer,
+                data,
+                target_rate,
+                format="OGG",
+                subtype="OPUS",
+                compression_level=self.OPUS_COMPRESSION_LEVEL,
+            )
+        elif output_format == "mp3":
+            sf.write(
+                buffer,
+                data,
+                source_rate,
+                format="MP3",
+                subtype="MPEG_LAYER_III",
+                compression_level=self._mp3_compression_level(source_rate),
+                bitrate_mode="CONSTANT",
+            )
+        else:
+            raise ValueError(f"soundfile backend cannot encode '{output_format}'")
+
+        return buffer.getvalue()
+
+
+class LameEncoder(EncoderBackend):
+    """In-process MP3 encoding through the lameenc bindings"""
+
+    name = "lameenc"
+    formats = frozenset({"mp3"})
+
+    def is_available(self) -> bool:
+        return lameenc is not None
+
+    def encode(self, audio_data: bytes, output_format: str, sample_rate: int) -> bytes:
+        with io.BytesIO(audio_data) as wav_io:
+            data, source_rate = sf.read(wav_io, dtype="int16")
+
+        channels = 1 if data.ndim == 1 else data.shape[1]
+        encoder = lameenc.Encoder()
+        encoder.set_bit_rate(128)
+        encoder.set_in_sample_rate(source_rate)
+        encoder.set_channels(channels)
+        encoder.set_quality(2)
+        output = encoder.encode(data.tobytes())
+        output += encoder.flush()
+        return bytes(output)
+
+
+class FFmpegEncoder(EncoderBackend):
+    """Encoding through an external ffmpeg process"""
+
+    name = "ffmpeg"
+    formats = frozenset({"mp3", "opus", "aac", "flac"})
+
+    # Format-specific settings optimized for streaming and compatibility
+    FORMAT_ARGS = {
+        "mp3": ["-f", "mp3", "-codec:a", "libmp3lame", "-b:a", "128k", "-q:a", "2"],
+        # Opus in OGG container - best for streaming, WhatsApp compatible
+        "opus": [
+            "-f",
+            "ogg",
+            "-codec:a",
+            "libopus",
+            "-b:a",
+            "64k",  # Opus is efficient, 64k is good quality
+            "-vbr",
+            "on",
+            "-compression_level",
+            "10",
+        ],
+        # AAC in ADTS container for streaming compatibility (no seek needed)
+        "aac": ["-f", "adts", "-codec:a", "aac", "-b:a", "128k", "-vbr", "5"],
+        "flac": ["-f", "flac", "-codec:a", "flac"],
+    }
+
+    def encode(self, audio_data: bytes, output_format: str, sample_rate: int) -> bytes:
+        cmd = [
+            "ffmpeg",
+            "-f",
+            "wav",
+            "-i",
+            "pipe:0",  # Input from stdin
+            "-y",  # Overwrite output
+        ]
+        cmd.extend(self.FORMAT_ARGS[output_format])
+        cmd.extend(["-hide_banner", "-loglevel", "error", "pipe:1"])
+
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            logger.error("ffmpeg not found - please install ffmpeg")
+            raise RuntimeError(
+                "ffmpeg not found. Please install ffmpeg for audio format conversion."
+            )
+
+        output, error = process.communicate(input=audio_data)
+
+        if process.returncode != 0:
+            logger.error(f"FFmpeg error: {error.decode()}")
+            raise RuntimeError(f"Audio conversion failed: {error.decode()}")
+
+        return output
+
+
+# Registered encoder backends, keyed by the names used in settings
+ENCODER_BACKENDS: dict[str, EncoderBackend] = {
+    backend.name: backend
+    for backend in (LameEncoder(), SoundfileEncoder(), FFmpegEncoder())
+}
+
+
+def register_encoder_backend(backend: EncoderBackend) -> None:
+    """Register (or replace) an encoder backend under ``backend.name``"""
+    ENCODER_BACKENDS[backend.name] = backend
+
+
+def get_encoder_backends(names: Optional[list[str]] = None) -> list[EncoderBackend]:
+    """Return encoder backends in priority order
+
+    Args:
+        names: Backend names to use. Defaults to ``settings.audio_encoder_backends``.
+    """
+    if names is None:
+        names = [
+            name.strip()
+            for name in settings.audio_encoder_backends.split(",")
+            if name.strip()
+        ]
+
+    backends = []
+    for name in names:
+        backend = ENCODER_BACKENDS.get(name)
+        if backend is None:
+            logger.warning(f"Unknown audio encoder backend '{name}' ignored")
+            continue
+        backends.append(backend)
+    return backends
+
 
 class AudioConverter:
     """Convert audio between different formats"""
@@ -17,13 +266,20 @@ class AudioConverter:
         audio_data: bytes,
         output_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"],
         sample_rate: int = 44100,
+        backends: Optional[list[EncoderBackend]] = None,
+        profile: Optional[dict] = None,
     ) -> bytes:
-        """Convert WAV audio to specified format using ffmpeg
+        """Convert WAV audio to specified format
+
+        In-process encoders are tried first (see ``settings.audio_encoder_backends``);
+        ffmpeg remains the fallback for formats they cannot produce.
 
         Args:
             audio_data: Raw WAV bytes
             output_format: Target format (mp3, opus, aac, flac, wav, pcm)
             sample_rate: Sample rate for the audio
+            backends: Encoder backends to try, in order. Defaults to the configured list.
+            profile: Optional dict; the encoding time is added to ``convert_seconds``
 
         Returns:
             Converted audio bytes
@@ -43,104 +299,45 @@ class AudioConverter:
                 data, _ = sf.read(wav_io, dtype="int16")
                 return data.tobytes()
 
-        # Use ffmpeg for other formats
-        try:
-            # Prepare ffmpeg command
-            cmd = [
-                "ffmpeg",
-                "-f",
-                "wav",
-                "-i",
-                "pipe:0",  # Input from stdin
-                "-y",  # Overwrite output
-            ]
-
-            # Format-specific settings optimized for streaming and compatibility
-            if output_format == "mp3":
-                cmd.extend(
-                    [
-                        "-f",
-                        "mp3",
-                        "-codec:a",
-                        "libmp3lame",
-                        "-b:a",
-                        "128k",
-                        "-q:a",
-                        "2",
-                    ]
-                )
-            elif output_format == "opus":
-                # Opus in OGG container - best for streaming, WhatsApp compatible
-                cmd.extend(
-                    [
-                        "-f",
-                        "ogg",
-                        "-codec:a",
-                        "libopus",
-                        "-b:a",
-                        "64k",  # Opus is efficient, 64k is good quality
-                        "-vbr",
-                        "on",
-                        "-compression_level",
-                        "10",
-                    ]
-                )
-            elif output_format == "aac":
-                # AAC in ADTS container for streaming compatibility
-                cmd.extend(
-                    [
-                        "-f",
-                        "adts",  # ADTS format for streaming (no seek needed)
-                        "-codec:a",
-                        "aac",
-                        "-b:a",
-                        "128k",
-                        "-vbr",
-                        "5",
-                    ]
-                )
-            elif output_format == "flac":
-                cmd.extend(
-                    [
-                        "-f",
-                        "flac",
-                        "-codec:a",
-                        "flac",
-                    ]
-                )
+        if backends is None:
+            backends = get_encoder_backends()
 
-            cmd.extend(["-hide_banner", "-loglevel", "error", "pipe:1"])
-
-            # Run ffmpeg
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+        last_error: Optional[Exception] = None
+        for backend in backends:
+            if not backend.supports(output_format):
+                continue
+            start = time.perf_counter()
+            try:
+                output = backend.encode(audio_data, output_format, sample_rate)
+            except Exception as e:
+                logger.warning(
+                    f"Audio encoder '{backend.name}' failed for {output_format}: {e}"
+                )
+                last_error = e
+                continue
+            end = time.perf_counter()
+            AUDIO_CONVERSION_SECONDS.observe(
+                end - start, format=output_format, backend=backend.name
             )
-
-            output, error = process.communicate(input=audio_data)
-
-            if process.returncode != 0:
-                logger.error(f"FFmpeg error: {error.decode()}")
-                raise RuntimeError(f"Audio conversion failed: {error.decode()}")
-
+            if profile is not None:
+                profile["convert_seconds"] = profile.get("convert_seconds", 0.0) + end - start
+                if "spans" in profile:
+                    profile["spans"].append(("convert", start, end))
             return output
 
-        except FileNotFoundError:
-            logger.error("ffmpeg not found - please install ffmpeg")
-            raise RuntimeError(
-                "ffmpeg not found. Please install ffmpeg for audio format conversion."
-            )
-        except Exception as e:
-            logger.error(f"Audio conversion error: {e}")
-            raise
+        if last_error is not None:
+            logger.error(f"Audio conversion error: {last_error}")
+            raise last_error
+        raise RuntimeError(f"No audio encoder backend available for '{output_format}'")
 
 
 def convert_audio(
     audio_data: bytes,
     output_format: str,
     sample_rate: int = 44100,
+    profile: Optional[dict] = None,
 ) -> bytes:
     """Convert audio to specified format"""
-    return AudioConverter.wav_to_format(audio_data, output_format, sample_rate)
+    return AudioConverter.wav_to_format(
+        audio_data, output_format, sample_rate, profile=profile
+    )
@@ -0,0 +1,221 @@
+"""Bounded inference executor with admission control"""
+
+import asyncio
+import contextlib
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from ..core.metrics import QUEUE_WAIT_SECONDS, REQUESTS_REJECTED
+from .scheduler import FairScheduler
+
+
+class OverloadedError(Exception):
+    """Raised when a request cannot start inference within the queue budget"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """Run blocking inference calls on a dedicated, bounded thread pool
+
+    At most ``max_workers`` calls run concurrently. Further calls wait in a
+    queue of at most ``max_queue`` entries, ordered by a FairScheduler
+    (priority classes, then weighted fair sharing across clients); a call
+    that cannot start within ``queue_timeout`` seconds is rejected with
+    OverloadedError so the API can answer with a fast 429 instead of letting
+    latency grow unbounded.
+
+    Slot bookkeeping happens on the event loop thread only, so no locking is
+    needed.
+    """
+
+    # Smoothing factor for the moving averages reported by stats()
+    EWMA_ALPHA = 0.2
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_queue: int = 32,
+        queue_timeout: float = 10.0,
+        scheduler: Optional[FairScheduler] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="tts-inference"
+        )
+        self._scheduler = scheduler if scheduler is not None else FairScheduler()
+        self._active = 0
+
+        self.rejected_total = 0
+        self.completed_total = 0
+        self.last_wait_seconds = 0.0
+        self.avg_wait_seconds = 0.0
+        self.avg_service_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a worker"""
+        return len(self._scheduler)
+
+    @property
+    def active(self) -> int:
+        """Number of calls currently running"""
+        return self._active
+
+    def retry_after(self) -> int:
+        """Estimate in whole seconds until a newly queued call could start"""
+        backlog = self.queue_depth + 1
+        estimate = backlog * self.avg_service_seconds / self.max_workers
+        return max(1, math.ceil(estimate))
+
+    def check_admission(self) -> None:
+        """Raise OverloadedError if a new call would exceed the queue limits"""
+        if self._active < self.max_workers and not self._scheduler:
+            return
+        if self.queue_depth >= self.max_queue:
+            self._reject()
+            raise OverloadedError(
+                f"Inference queue is full ({self.queue_depth} waiting)",
+                self.retry_after(),
+            )
+        expected_wait = self.queue_depth * self.avg_service_seconds / self.max_workers
+        if self.queue_timeout is not None and expected_wait > self.queue_timeout:
+            self._reject()
+            raise OverloadedError(
+                f"Expected queue wait {expected_wait:.1f}s exceeds budget",
+                self.retry_after(),
+            )
+
+    async def run(
+        self,
+        func: Callable[[], Any],
+        admission: bool = True,
+        priority: str = "default",
+        client_id: str = "anonymous",
+        cost: float = 1.0,
+        profile: Optional[dict] = None,
+    ) -> Any:
+        """Run ``func`` on the inference pool
+
+        Args:
+            func: Blocking callable (use functools.partial to bind arguments)
+            admission: Apply queue limits and the queue-time budget. Callers
+                that were admitted earlier (e.g. later chunks of a stream) pass
+                False to wait for a slot without a deadline.
+            priority: Priority class used to order waiting calls
+            client_id: Client the call is charged to for fair sharing
+            cost: Relative cost of the call (e.g. characters in the chunk)
+            profile: Optional dict; ``queue_seconds`` is set to the time the
+                call waited for a slot
+        """
+        if admission:
+            self.check_admission()
+        waited = await self._acquire(
+            self.queue_timeout if admission else None, priority, client_id, cost
+        )
+        if profile is not None:
+            profile["queue_seconds"] = waited
+
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._pool.submit(func)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is freed when the call finishes, not when the awaiting
+        # request does: a cancelled request leaves its call running on the
+        # worker thread until the ONNX Runtime call returns.
+        future.add_done_callback(
+            lambda _: self._call_soon(loop, self._finish, start)
+        )
+        return await asyncio.wrap_future(future, loop=loop)
+
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable, *args: Any) -> None:
+        with contextlib.suppress(RuntimeError):
+            # The loop is already closed at shutdown
+            loop.call_soon_threadsafe(callback, *args)
+
+    def _finish(self, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        self.completed_total += 1
+        self.avg_service_seconds += self.EWMA_ALPHA * (elapsed - self.avg_service_seconds)
+        self._release()
+
+    async def _acquire(
+        self, timeout: Optional[float], priority: str, client_id: str, cost: float
+    ) -> float:
+        start = time.perf_counter()
+        if self._active < self.max_workers and not self._scheduler:
+            self._active += 1
+            self._record_wait(0.0, priority)
+            return 0.0
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._scheduler.push(waiter, priority, client_id, cost)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self._reject()
+            raise OverloadedError(
+                f"Request could not start within {timeout:.1f}s", self.retry_after()
+            )
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        waited = time.perf_counter() - start
+        self._record_wait(waited, priority)
+        return waited
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as we gave up; pass it on.
+            self._release()
+        else:
+            self._scheduler.remove(waiter)
+
+    def _release(self) -> None:
+        while self._scheduler:
+            waiter = self._scheduler.pop()
+            if not waiter.done():
+                # Hand the slot directly to the next waiter.
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def _reject(self) -> None:
+        self.rejected_total += 1
+        REQUESTS_REJECTED.inc()
+
+    def _record_wait(self, seconds: float, priority: str) -> None:
+        QUEUE_WAIT_SECONDS.observe(seconds, priority=priority)
+        self.last_wait_seconds = seconds
+        self.avg_wait_seconds += self.EWMA_ALPHA * (seconds - self.avg_wait_seconds)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue and latency figures for health checks and load balancers"""
+        return {
+            "max_workers": self.max_workers,
+            "active": self._active,
+            "queue_depth": self.queue_depth,
+            "queue_depth_by_priority": self._scheduler.depth_by_priority(),
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout,
+            "last_wait_seconds": self.last_wait_seconds,
+            "avg_wait_seconds": self.avg_wait_seconds,
+            "avg_service_seconds": self.avg_service_seconds,
+            "rejected_total": self.rejected_total,
+            "completed_total": self.completed_total,
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release the worker threads"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
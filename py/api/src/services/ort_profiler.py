@@ -0,0 +1,199 @@
+"""On-demand ONNX Runtime profiling of live traffic"""
+
+import asyncio
+import functools
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Any, Optional
+
+from loguru import logger
+
+from ..core.server_timing import RequestTimings
+
+
+def summarize_ort_trace(events: list[dict], top: int = 10) -> list[dict[str, Any]]:
+    """Aggregate ORT node events into the ``top`` operator types by total time"""
+    totals: dict[str, dict[str, Any]] = defaultdict(
+        lambda: {"total_us": 0, "calls": 0, "nodes": set()}
+    )
+    for event in events:
+        if event.get("cat") != "Node" or not event.get("name", "").endswith("_kernel_time"):
+            continue
+        args = event.get("args", {})
+        op_type = args.get("op_name", "unknown")
+        entry = totals[op_type]
+        entry["total_us"] += event.get("dur", 0)
+        entry["calls"] += 1
+        entry["nodes"].add(event["name"][: -len("_kernel_time")])
+
+    grand_total = sum(entry["total_us"] for entry in totals.values()) or 1
+    ranked = sorted(totals.items(), key=lambda item: item[1]["total_us"], reverse=True)
+    return [
+        {
+            "op_type": op_type,
+            "total_ms": entry["total_us"] / 1000,
+            "calls": entry["calls"],
+            "nodes": len(entry["nodes"]),
+            "share": entry["total_us"] / grand_total,
+        }
+        for op_type, entry in ranked[:top]
+    ]
+
+
+def python_span_events(
+    spans: list[tuple[str, float, float]], origin: float, pid: int, tid: str
+) -> list[dict[str, Any]]:
+    """Convert perf_counter spans to Chrome trace events relative to ``origin``"""
+    return [
+        {
+            "cat": "Python",
+            "name": stage,
+            "ph": "X",
+            "ts": int((start - origin) * 1e6),
+            "dur": int((end - start) * 1e6),
+            "pid": pid,
+            "tid": tid,
+        }
+        for stage, start, end in spans
+    ]
+
+
+class OrtProfiler:
+    """Profile one ONNX session for the next N requests
+
+    ``start()`` swaps a profiling copy of the session into the model. Each
+    request that calls ``attach()`` while a capture is armed gets its
+    RequestTimings set up to collect Python stage spans. Once the last
+    attached request has called ``release()``, the original session is
+    restored and the ORT trace is merged with the Python spans into one
+    Chrome trace (open it in chrome://tracing or Perfetto).
+
+    Session swaps run on the inference executor so they never race with a
+    chunk being synthesized on a single-worker pool.
+    """
+
+    def __init__(self, executor, output_dir: str):
+        self.executor = executor
+        self.output_dir = output_dir
+        self.session_name: Optional[str] = None
+        self.remaining = 0
+        self.last_result: Optional[dict[str, Any]] = None
+        self._model = None
+        self._origin = 0.0
+        self._prefix = ""
+        self._requests: list[RequestTimings] = []
+        self._in_flight = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Whether a capture is in progress"""
+        return self.session_name is not None
+
+    def status(self) -> dict[str, Any]:
+        """Current capture state and the summary of the last finished capture"""
+        return {
+            "active": self.active,
+            "session": self.session_name,
+            "remaining_requests": self.remaining,
+            "in_flight_requests": self._in_flight,
+            "captured_requests": len(self._requests),
+            "last_result": self.last_result,
+        }
+
+    async def start(self, model, session_name: str, requests: int) -> dict[str, Any]:
+        """Arm profiling of ``session_name`` for the next ``requests`` requests
+
+        Raises RuntimeError if a capture is already in progress and
+        ValueError for an unknown session name.
+        """
+        async with self._lock:
+            if self.active:
+                raise RuntimeError(
+                    f"Profiling of '{self.session_name}' is already in progress"
+                )
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._prefix = os.path.join(
+                self.output_dir, f"{session_name}_{time.strftime('%Y%m%d-%H%M%S')}"
+            )
+            self._origin = await self.executor.run(
+                functools.partial(model.start_profiling, session_name, self._prefix),
+                admission=False,
+            )
+            self._model = model
+            self.session_name = session_name
+            self.remaining = requests
+            self._requests = []
+            self._in_flight = 0
+            logger.info(f"ORT profiling armed for {requests} requests on {session_name}")
+        return self.status()
+
+    def attach(self, timings: RequestTimings) -> bool:
+        """Include a request in the capture if one is armed
+
+        Returns True if the request was attached; the caller must then call
+        ``release()`` once the request has finished.
+        """
+        if not self.active or self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        self._in_flight += 1
+        timings.spans = []
+        self._requests.append(timings)
+        return True
+
+    async def release(self, timings: RequestTimings) -> None:
+        """Mark an attached request as finished, completing the capture after the last one"""
+        self._in_flight -= 1
+        if self.remaining <= 0 and self._in_flight <= 0:
+            await self.stop()
+
+    async def stop(self) -> Optional[dict[str, Any]]:
+        """Finish the capture now and return its summary
+
+        Requests still in flight keep running on the restored session; the
+        spans they have recorded so far are included.
+        """
+        async with self._lock:
+            if not self.active:
+                return self.last_result
+            session_name = self.session_name
+            self.session_name = None
+            self.remaining = 0
+            ort_trace = await self.executor.run(
+                functools.partial(self._model.stop_profiling, session_name),
+                admission=False,
+            )
+            self._model = None
+            self.last_result = await asyncio.to_thread(
+                self._write_trace, session_name, ort_trace, list(self._requests)
+            )
+            logger.info(f"ORT profiling of {session_name} written to {self.last_result['trace']}")
+        return self.last_result
+
+    def _write_trace(
+        self, session_name: str, ort_trace: str, requests: list[RequestTimings]
+    ) -> dict[str, Any]:
+        with open(ort_trace, encoding="utf-8") as f:
+            events = json.load(f)
+
+        pid = os.getpid()
+        merged = list(events)
+        for index, timings in enumerate(requests):
+            merged.extend(
+                python_span_events(timings.spans or [], self._origin, pid, f"request-{index}")
+            )
+
+        trace_path = f"{self._prefix}_trace.json"
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": merged, "displayTimeUnit": "ms"}, f)
+
+        return {
+            "session": session_name,
+            "requests": len(requests),
+            "ort_trace": ort_trace,
+            "trace": trace_path,
+            "top_operators": summarize_ort_trace(events),
+        }
@@ -0,0 +1,127 @@
+"""Priority classes and weighted fair queuing for inference slots"""
+
+import heapq
+import itertools
+from typing import Any, Optional
+
+
+# Priority classes, highest first. A waiting job of a higher class always
+# starts before any job of a lower class.
+PRIORITY_CLASSES = ("interactive", "default", "bulk")
+
+
+def parse_client_weights(spec: str) -> dict[str, float]:
+    """Parse ``"client-a=4,client-b=0.5"`` into a weight mapping"""
+    weights: dict[str, float] = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        try:
+            weight = float(value)
+        except ValueError:
+            continue
+        if name.strip() and weight > 0:
+            weights[name.strip()] = weight
+    return weights
+
+
+class _ClassQueue:
+    """Weighted fair queue for one priority class, ordered by virtual finish tag
+
+    Each job gets a virtual finish tag ``start + cost / weight`` where
+    ``start`` is the later of the class's virtual time and the client's
+    previous finish tag. Jobs are served in finish-tag order, not by start
+    tag, and serving a job advances the virtual time to its start tag. A
+    client submitting many or large chunks is interleaved with lighter
+    clients in proportion to their weights rather than served first-come
+    first-served.
+    """
+
+    def __init__(self):
+        self.heap: list[tuple[float, int, Any]] = []
+        self.virtual_time = 0.0
+        self.last_finish: dict[str, float] = {}
+
+    def push(self, item: Any, client_id: str, cost: float, weight: float, seq: int) -> None:
+        start = max(self.virtual_time, self.last_finish.get(client_id, 0.0))
+        finish = start + cost / weight
+        self.last_finish[client_id] = finish
+        heapq.heappush(self.heap, (finish, seq, (start, item)))
+
+    def pop(self) -> Any:
+        _, _, (start, item) = heapq.heappop(self.heap)
+        self.virtual_time = max(self.virtual_time, start)
+        if not self.heap:
+            # Idle class: forget history so returning clients start fresh.
+            self.last_finish.clear()
+        return item
+
+    def remove(self, item: Any) -> bool:
+        for index, (_, _, (_, queued)) in enumerate(self.heap):
+            if queued is item:
+                self.heap.pop(index)
+                heapq.heapify(self.heap)
+                return True
+        return False
+
+
+class FairScheduler:
+    """Pick the next waiting inference job
+
+    Jobs are queued per sentence chunk, so a long request re-enters the queue
+    after every chunk and yields to interactive work at chunk boundaries.
+    """
+
+    def __init__(self, client_weights: Optional[dict[str, float]] = None):
+        self.client_weights = client_weights or {}
+        self._queues = {priority: _ClassQueue() for priority in PRIORITY_CLASSES}
+        self._seq = itertools.count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    @staticmethod
+    def normalize_priority(priority: Optional[str]) -> str:
+        """Map unknown or missing priorities to ``default``"""
+        if priority in PRIORITY_CLASSES:
+            return priority
+        return "default"
+
+    def push(
+        self,
+        item: Any,
+        priority: str = "default",
+        client_id: str = "anonymous",
+        cost: float = 1.0,
+    ) -> None:
+        """Queue ``item`` for a client in a priority class"""
+        weight = self.client_weights.get(client_id, 1.0)
+        self._queues[self.normalize_priority(priority)].push(
+            item, client_id, max(cost, 1e-6), weight, next(self._seq)
+        )
+        self._size += 1
+
+    def pop(self) -> Any:
+        """Remove and return the next item to run"""
+        for priority in PRIORITY_CLASSES:
+            queue = self._queues[priority]
+            if queue.heap:
+                self._size -= 1
+                return queue.pop()
+        raise IndexError("pop from empty scheduler")
+
+    def remove(self, item: Any) -> None:
+        """Drop a queued item (e.g. after its caller timed out)"""
+        for queue in self._queues.values():
+            if queue.remove(item):
+                self._size -= 1
+                return
+
+    def depth_by_priority(self) -> dict[str, int]:
+        """Number of waiting items per priority class"""
+        return {priority: len(queue.heap) for priority, queue in self._queues.items()}
@@ -0,0 +1,114 @@
+"""Adaptive denoising step count to hold a per-chunk latency SLO"""
+
+import math
+import threading
+from typing import Any, Optional
+
+
+class StepController:
+    """Lower ``total_steps`` under load, within a floor, and restore it after
+
+    Denoiser time grows linearly with the step count, so the controller
+    keeps moving averages of the time of one denoising step and of the rest
+    of a chunk (encoder, decoder), both per character of input. A chunk is
+    given the largest step count whose predicted latency, including the time
+    it already waited for a slot, fits ``slo_seconds``. When other chunks
+    are queued the budget shrinks further, so that the backlog behind this
+    chunk also drains within the SLO.
+
+    Reductions apply at once; the cap rises by at most ``max_increase``
+    steps per chunk, so quality returns gradually as the queue empties
+    instead of oscillating.
+
+    ``steps_for`` runs on the inference threads and ``observe`` on the event
+    loop, so the averages are guarded by a lock.
+    """
+
+    # Smoothing factor for the per-step and overhead moving averages
+    EWMA_ALPHA = 0.2
+
+    def __init__(
+        self,
+        executor,
+        slo_seconds: float = 2.0,
+        floor: int = 6,
+        enabled: bool = True,
+        max_increase: int = 2,
+    ):
+        self.executor = executor
+        self.slo_seconds = slo_seconds
+        self.floor = max(1, floor)
+        self.enabled = enabled
+        self.max_increase = max(1, max_increase)
+        self._lock = threading.Lock()
+        self._step_seconds_per_char: Optional[float] = None
+        self._overhead_seconds_per_char = 0.0
+        self._cap: Optional[int] = None
+
+        self.reduced_total = 0
+        self.last_steps: Optional[int] = None
+
+    @property
+    def cap(self) -> Optional[int]:
+        """Current upper bound on steps (None while running at full quality)"""
+        return self._cap
+
+    def steps_for(self, requested: int, cost: float, waited: float = 0.0) -> int:
+        """Step count for a chunk of ``cost`` characters that waited ``waited`` seconds
+
+        Never exceeds ``requested``, and never goes below ``floor`` unless
+        the request itself asked for fewer steps.
+        """
+        if not self.enabled or requested <= self.floor:
+            return requested
+        with self._lock:
+            if self._step_seconds_per_char is None:
+                return requested
+            budget = self.slo_seconds - waited
+            queued = self.executor.queue_depth
+            if queued:
+                workers = self.executor.max_workers
+                budget = min(budget, self.slo_seconds * workers / (queued + workers))
+            cost = max(cost, 1.0)
+            affordable = (budget / cost - self._overhead_seconds_per_char) / self._step_seconds_per_char
+            # The epsilon keeps an exact fit from rounding down a step
+            target = max(self.floor, min(requested, math.floor(affordable + 1e-9)))
+
+            if self._cap is not None and target > self._cap:
+                target = min(target, self._cap + self.max_increase)
+            self._cap = target if target < requested else None
+            if target < requested:
+                self.reduced_total += 1
+            self.last_steps = target
+            return target
+
+    def observe(self, profile: dict, cost: float) -> None:
+        """Update the moving averages from a finished chunk's generate profile"""
+        step_seconds = profile.get("denoise_step_seconds")
+        if not step_seconds:
+            return
+        cost = max(cost, 1.0)
+        per_step = sum(step_seconds) / len(step_seconds) / cost
+        overhead = max(0.0, profile.get("generate_seconds", 0.0) - sum(step_seconds)) / cost
+        with self._lock:
+            if self._step_seconds_per_char is None:
+                self._step_seconds_per_char = per_step
+                self._overhead_seconds_per_char = overhead
+            else:
+                self._step_seconds_per_char += self.EWMA_ALPHA * (per_step - self._step_seconds_per_char)
+                self._overhead_seconds_per_char += self.EWMA_ALPHA * (
+                    overhead - self._overhead_seconds_per_char
+                )
+
+    def stats(self) -> dict[str, Any]:
+        """Controller state for metrics and debugging"""
+        return {
+            "enabled": self.enabled,
+            "slo_seconds": self.slo_seconds,
+            "floor": self.floor,
+            "cap": self._cap,
+            "last_steps": self.last_steps,
+            "step_seconds_per_char": self._step_seconds_per_char,
+            "overhead_seconds_per_char": self._overhead_seconds_per_char,
+            "reduced_total": self.reduced_total,
+        }
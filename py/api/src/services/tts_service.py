@@ -1,11 +1,14 @@
 """TTS Service wrapper for Supertonic ONNX models"""
 
 import asyncio
+import contextlib
+import functools
 import io
 import json
 import os
 import re
-from typing import AsyncGenerator, Optional
+import time
+from typing import AsyncGenerator, Optional, Sequence
 
 import numpy as np
 import soundfile as sf
@@ -27,8 +30,19 @@ load_voice_style = helper.load_voice_style
 Style = helper.Style
 TextToSpeech = helper.TextToSpeech
 chunk_text = helper.chunk_text
+CancellationToken = helper.CancellationToken
+GenerationCancelled = helper.GenerationCancelled
 
+from ..core import metrics
 from ..core.config import settings
+from ..core.server_timing import RequestTimings
+from .inference_executor import InferenceExecutor
+from .ort_profiler import OrtProfiler
+from .scheduler import FairScheduler, parse_client_weights
+from .step_controller import StepController
+
+# Sentinel marking the end of a lookahead stream
+_STREAM_END = object()
 
 
 class TTSService:
@@ -38,6 +52,48 @@ class TTSService:
         self.tts_model: Optional[TextToSpeech] = None
         self._lock = asyncio.Lock()
         self._initialized = False
+        # Dedicated bounded pool so overload is shed instead of queued forever
+        self.executor = InferenceExecutor(
+            max_workers=settings.inference_concurrency,
+            max_queue=settings.inference_max_queue,
+            queue_timeout=settings.inference_queue_timeout,
+            scheduler=FairScheduler(
+                parse_client_weights(settings.scheduler_client_weights)
+            ),
+        )
+        # Trades denoising steps for latency when the queue backs up
+        self.step_controller = StepController(
+            self.executor,
+            slo_seconds=settings.adaptive_steps_slo_seconds,
+            floor=settings.adaptive_steps_floor,
+            enabled=settings.adaptive_steps_enabled,
+        )
+        self.profiler = OrtProfiler(self.executor, settings.profiling_dir)
+        self._register_metrics()
+
+    def _register_metrics(self):
+        """Expose executor and model state as scrape-time gauges"""
+        executor = self.executor
+        step_controller = self.step_controller
+        for name, doc, callback, metric_type in (
+            ("supertonic_queue_depth", "Chunks waiting for an inference slot",
+             lambda: executor.queue_depth, "gauge"),
+            ("supertonic_inference_active", "Chunks currently being synthesized",
+             lambda: executor.active, "gauge"),
+            ("supertonic_adaptive_step_cap", "Step limit applied under load (absent at full quality)",
+             lambda: step_controller.cap, "gauge"),
+            ("supertonic_adaptive_steps_reduced_total", "Chunks synthesized with fewer steps than requested",
+             lambda: step_controller.reduced_total, "counter"),
+            ("supertonic_style_cache_hits_total", "Voice style cache hits",
+             lambda: self.tts_model.style_cache_hits if self.tts_model else None,
+             "counter"),
+            ("supertonic_style_cache_misses_total", "Voice style cache misses",
+             lambda: self.tts_model.style_cache_misses if self.tts_model else None,
+             "counter"),
+        ):
+            metrics.REGISTRY.register(
+                metrics.CallbackMetric(name, doc, callback, metric_type)
+            )
 
     async def initialize(self):
         """Initialize the TTS model"""
@@ -56,11 +112,30 @@ class TTSService:
     def _load_model(self):
         """Load the ONNX model (sync)"""
         os.environ["OPENVINO_DEVICE"] = settings.openvino_device
+        # Arena policy is read from the environment when sessions are created
+        os.environ["ORT_ENABLE_CPU_MEM_ARENA"] = str(int(settings.ort_enable_cpu_mem_arena))
+        os.environ["ORT_ENABLE_MEM_PATTERN"] = str(int(settings.ort_enable_mem_pattern))
+        os.environ["ORT_ARENA_EXTEND_STRATEGY"] = settings.ort_arena_extend_strategy
+        os.environ["ORT_ARENA_MAX_BYTES"] = str(settings.ort_arena_max_bytes)
+        os.environ["ORT_ARENA_SHRINK_INTERVAL"] = str(settings.ort_arena_shrink_interval)
         self.tts_model = load_text_to_speech(
             settings.onnx_dir,
             settings.use_gpu,
             settings.ort_backend,
+            settings.model_precision,
+            settings.early_exit_tolerance,
         )
+        model = self.tts_model
+        if model.token_buckets and model.latent_buckets:
+            logger.info(
+                f"Shape buckets: tokens {list(model.token_buckets)}, latents {list(model.latent_buckets)}"
+            )
+            if settings.shape_bucket_warmup:
+                start = time.perf_counter()
+                runs = model.warmup_buckets()
+                logger.info(
+                    f"Warmed up {runs} bucketed session runs in {time.perf_counter() - start:.1f}s"
+                )
 
     async def get_available_voices(self) -> list[str]:
         """Get list of available voice styles"""
@@ -108,8 +183,28 @@ class TTSService:
         speed: float = 1.0,
         lang_code: Optional[str] = None,
         total_steps: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        admission: bool = True,
+        priority: Optional[str] = None,
+        client_id: str = "anonymous",
+        timings: Optional[RequestTimings] = None,
     ) -> bytes:
-        """Generate complete audio file"""
+        """Generate complete audio file
+
+        The text is synthesized one sentence chunk at a time, and every chunk
+        is scheduled separately on the inference executor, so a long request
+        yields to higher-priority work at chunk boundaries.
+
+        Raises GenerationCancelled if ``cancel_token`` is cancelled before
+        synthesis finishes, and OverloadedError if ``admission`` is enabled
+        and the request cannot start within the inference queue budget.
+
+        Stage durations of every chunk are added to ``timings`` when given.
+
+        With adaptive steps enabled, each chunk may run fewer than the
+        requested steps while the inference queue is backed up; ``timings``
+        records the step counts actually used.
+        """
         if not self._initialized:
             await self.initialize()
 
@@ -119,26 +214,64 @@ class TTSService:
         # Use configured default if not specified
         steps = total_steps or settings.default_total_steps
         actual_speed = speed * settings.default_speed
-
-        # Generate audio (voice is passed directly as string in new model)
-        wav, duration = await asyncio.to_thread(
-            self.tts_model,
-            text,
-            lang,
-            voice,
-            steps,
-            actual_speed,
-        )
-
-        # Trim to actual duration
-        sample_count = int(self.tts_model.sample_rate * duration[0].item())
-        wav_trimmed = wav[0, :sample_count]
+        priority = priority or settings.scheduler_default_priority
+
+        # Same chunking as SupertonicTTS.__call__
+        text_chunks = chunk_text(text, max_len=120 if lang == "ko" else 300)
+        silence = np.zeros(int(0.3 * self.tts_model.sample_rate), dtype=np.float32)
+
+        wav_list = []
+        for index, chunk in enumerate(text_chunks):
+            # Only the first chunk is subject to admission control; once a
+            # request has started it runs to completion.
+            profile = timings.new_profile() if timings is not None else {}
+            submitted = time.perf_counter()
+            results = await self.executor.run(
+                functools.partial(
+                    self._synthesize_chunk,
+                    chunk,
+                    voice=voice,
+                    speed=actual_speed,
+                    steps=steps,
+                    language=lang,
+                    cancel_token=cancel_token,
+                    profile=profile,
+                ),
+                admission=admission and index == 0,
+                priority=priority,
+                client_id=client_id,
+                cost=len(chunk),
+                profile=profile,
+            )
+            audio_seconds = len(results[0]) / self.tts_model.sample_rate
+            if "spans" in profile:
+                profile["spans"].append(
+                    ("queue", submitted, submitted + profile["queue_seconds"])
+                )
+            self.step_controller.observe(profile, len(chunk))
+            metrics.observe_generation(profile, audio_seconds)
+            if timings is not None:
+                timings.add_profile(profile, audio_seconds)
+            wav_list.append(results[0])
+            if len(text_chunks) > 1:
+                wav_list.append(silence)
 
         # Convert to bytes
         buffer = io.BytesIO()
-        sf.write(buffer, wav_trimmed, self.tts_model.sample_rate, format="WAV")
+        sf.write(buffer, np.concatenate(wav_list), self.tts_model.sample_rate, format="WAV")
         return buffer.getvalue()
 
+    def _synthesize_chunk(self, chunk: str, *, steps: int, profile: dict, **kwargs):
+        """Run the model on one chunk (on an inference thread)
+
+        The step count is settled here rather than at submission, so the
+        controller sees how long the chunk waited for its slot.
+        """
+        steps = self.step_controller.steps_for(
+            steps, len(chunk), profile.get("queue_seconds", 0.0)
+        )
+        return self.tts_model.generate([chunk], steps=steps, profile=profile, **kwargs)
+
     async def generate_audio_stream(
         self,
         text: str,
@@ -146,12 +279,35 @@ class TTSService:
         speed: float = 1.0,
         lang_code: Optional[str] = None,
         total_steps: Optional[int] = None,
+        step_schedule: Optional[Sequence[int]] = None,
+        lookahead: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        priority: Optional[str] = None,
+        client_id: str = "anonymous",
+        timings: Optional[RequestTimings] = None,
     ) -> AsyncGenerator[bytes, None]:
         """
         Generate audio in streaming chunks.
         Automatically splits long text into sentences to avoid OOM.
         Yields complete WAV audio for each text chunk.
 
+        Synthesis runs up to ``lookahead`` chunks ahead of the consumer
+        (default: ``settings.stream_lookahead_chunks``) so the model keeps
+        working while earlier chunks are encoded and sent. Closing the
+        generator stops the background synthesis; cancelling ``cancel_token``
+        also aborts the chunk currently being synthesized.
+
+        Chunks skip inference admission control: callers are expected to call
+        ``self.executor.check_admission()`` before starting the stream, so an
+        admitted stream is never cut off halfway. Stage durations are added
+        to ``timings`` as each chunk finishes.
+
+        ``step_schedule`` gives the denoising steps of each chunk in order,
+        its last entry repeating for the rest; without one, the first chunk
+        runs ``settings.stream_first_chunk_steps`` when that is set. A fast
+        first chunk starts playback sooner, and later chunks are synthesized
+        at full quality while it plays.
+
         Note: Each yielded chunk is a complete WAV file. The router handles
         combining them appropriately based on the output format.
         """
@@ -164,15 +320,75 @@ class TTSService:
 
         logger.info(f"Streaming {len(text_chunks)} text chunks for long-form audio")
 
-        for i, chunk in enumerate(text_chunks):
-            # Generate audio for this chunk (returns WAV bytes)
-            audio_data = await self.generate_audio(
-                chunk, voice, speed, lang_code, total_steps
-            )
-            logger.debug(
-                f"Generated chunk {i + 1}/{len(text_chunks)} ({len(chunk)} chars)"
-            )
-            yield audio_data
+        if lookahead is None:
+            lookahead = settings.stream_lookahead_chunks
+        schedule = self._stream_step_schedule(step_schedule, total_steps)
+
+        if lookahead <= 0 or len(text_chunks) == 1:
+            for i, chunk in enumerate(text_chunks):
+                # Generate audio for this chunk (returns WAV bytes)
+                audio_data = await self.generate_audio(
+                    chunk, voice, speed, lang_code,
+                    schedule[min(i, len(schedule) - 1)], cancel_token,
+                    admission=False, priority=priority, client_id=client_id,
+                    timings=timings,
+                )
+                logger.debug(
+                    f"Generated chunk {i + 1}/{len(text_chunks)} ({len(chunk)} chars)"
+                )
+                yield audio_data
+            return
+
+        # Bounded producer/consumer queue: the producer blocks once `lookahead`
+        # chunks are waiting, so memory stays bounded for slow clients.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=lookahead)
+
+        async def produce():
+            try:
+                for i, chunk in enumerate(text_chunks):
+                    audio_data = await self.generate_audio(
+                        chunk, voice, speed, lang_code,
+                        schedule[min(i, len(schedule) - 1)], cancel_token,
+                        admission=False, priority=priority, client_id=client_id,
+                        timings=timings,
+                    )
+                    logger.debug(
+                        f"Generated chunk {i + 1}/{len(text_chunks)} ({len(chunk)} chars)"
+                    )
+                    await queue.put(audio_data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(_STREAM_END)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+
+    @staticmethod
+    def _stream_step_schedule(
+        step_schedule: Optional[Sequence[int]], total_steps: Optional[int]
+    ) -> list[int]:
+        """Per-chunk step counts for a stream; the last entry repeats"""
+        if step_schedule:
+            return list(step_schedule)
+        steps = total_steps or settings.default_total_steps
+        first = settings.stream_first_chunk_steps
+        if 0 < first < steps:
+            return [first, steps]
+        return [steps]
 
     @property
     def sample_rate(self) -> int:
@@ -1,6 +1,6 @@
 """Pydantic schemas for API requests and responses"""
 
-from typing import Literal, Optional
+from typing import Annotated, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -41,6 +41,18 @@ class OpenAISpeechRequest(BaseModel):
         description="Number of denoising steps (higher = better quality, slower)",
     )
 
+    step_schedule: Optional[list[Annotated[int, Field(ge=1, le=20)]]] = Field(
+        default=None,
+        min_length=1,
+        max_length=20,
+        description="Denoising steps per streamed chunk, e.g. [6, 15]: the first chunk is fast and later ones use full quality. The last entry repeats; overrides total_steps when streaming and is ignored otherwise",
+    )
+
+    priority: Optional[Literal["interactive", "default", "bulk"]] = Field(
+        default=None,
+        description="Scheduling class. Overrides the X-Priority header; interactive work is scheduled ahead of bulk work at sentence-chunk boundaries",
+    )
+
 
 class VoiceInfo(BaseModel):
     """Voice information"""
@@ -56,9 +68,40 @@ class VoicesResponse(BaseModel):
     voices: list[VoiceInfo]
 
 
+class QueueStats(BaseModel):
+    """Inference queue figures for load balancers"""
+
+    max_workers: int
+    active: int
+    queue_depth: int
+    queue_depth_by_priority: dict[str, int] = {}
+    max_queue: int
+    queue_timeout_seconds: Optional[float] = None
+    last_wait_seconds: float
+    avg_wait_seconds: float
+    avg_service_seconds: float
+    rejected_total: int
+    completed_total: int
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
 
     status: str
     model_loaded: bool
     version: str
+    queue: Optional[QueueStats] = None
+
+
+class ProfilingRequest(BaseModel):
+    """Admin request to profile an ONNX session on live traffic"""
+
+    session: Literal["text_encoder", "latent_denoiser", "voice_decoder"] = Field(
+        default="latent_denoiser", description="ONNX session to profile"
+    )
+
+    requests: int = Field(
+        default=1,
+        ge=1,
+        description="Number of upcoming speech requests to capture",
+    )
@@ -0,0 +1,290 @@
+"""
+Tiny stand-in Supertonic models for hermetic tests and benchmarks.
+
+``build_fake_models(model_dir)`` writes a model directory with the same
+layout as the real download (``onnx/*.onnx``, ``voices/*.bin`` and a
+tokenizer) that ``SupertonicTTS`` loads unchanged. The three ONNX models
+have the real input/output names, dtypes and dynamic axes, so the
+scheduling, batching, streaming and encoding layers can be exercised
+without fetching the model:
+
+- ``text_encoder``: (input_ids, attention_mask, style) -> (last_hidden_state, durations)
+- ``latent_denoiser``: (noisy_latents, latent_mask, style, encoder_outputs,
+  attention_mask, timestep, num_inference_steps) -> denoised_latents
+- ``voice_decoder``: latents -> waveform
+
+Durations are ``seconds_per_char`` per non-padding token, so audio length
+scales with the input like the real model. Compute cost is set with
+``width`` and the ``*_layers`` arguments (each layer is a width x width
+MatMul + Tanh per frame). The tokenizer is character level, with the
+``<lang>`` tags as special tokens.
+
+Requires the ``onnx`` package. Usable as a script:
+
+    python fake_models.py /tmp/fake-supertonic --denoiser-layers 8 --width 256
+    python ../benchmarks/tts_benchmark.py --onnx-dir /tmp/fake-supertonic ...
+"""
+
+import argparse
+import json
+import os
+import string
+from typing import Sequence
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper as onnx_helper, numpy_helper
+from tokenizers import Tokenizer, Regex, models, pre_tokenizers
+
+from helper import SupertonicTTS
+
+
+OPSET = 18
+LATENT_CHANNELS = SupertonicTTS.LATENT_DIM * SupertonicTTS.CHUNK_COMPRESS_FACTOR
+SPECIAL_TOKENS = ["<pad>", "<unk>"] + [
+    tag for lang in SupertonicTTS.LANGUAGES for tag in (f"<{lang}>", f"</{lang}>")
+]
+VOCAB_CHARS = string.printable + "áéíóúñüÁÉÍÓÚÑÜ¿¡àâçèêëîïôûùœÀÂÇÈÊËÎÏÔÛÙŒãõÃÕ"
+
+
+class _GraphBuilder:
+    """Collect nodes and initializers with unique names"""
+
+    def __init__(self, seed: int):
+        self.nodes = []
+        self.initializers = []
+        self.rng = np.random.default_rng(seed)
+        self._count = 0
+
+    def _name(self, prefix: str) -> str:
+        self._count += 1
+        return f"{prefix}_{self._count}"
+
+    def const(self, value, prefix: str = "const") -> str:
+        name = self._name(prefix)
+        self.initializers.append(numpy_helper.from_array(np.asarray(value), name))
+        return name
+
+    def weight(self, rows: int, cols: int) -> str:
+        scale = 1.0 / np.sqrt(rows)
+        return self.const(
+            (self.rng.standard_normal((rows, cols)) * scale).astype(np.float32), "weight"
+        )
+
+    def op(self, op_type: str, inputs: Sequence[str], output: str = None, **attrs) -> str:
+        output = output or self._name(op_type.lower())
+        self.nodes.append(onnx_helper.make_node(op_type, list(inputs), [output], **attrs))
+        return output
+
+    def dense_stack(self, x: str, width: int, layers: int) -> str:
+        """``layers`` x (MatMul + Tanh) over the last axis of ``x`` (already ``width`` wide)"""
+        for _ in range(layers):
+            x = self.op("Tanh", [self.op("MatMul", [x, self.weight(width, width)])])
+        return x
+
+    def model(self, name: str, inputs, outputs) -> onnx.ModelProto:
+        graph = onnx_helper.make_graph(self.nodes, name, inputs, outputs, self.initializers)
+        model = onnx_helper.make_model(graph, opset_imports=[onnx_helper.make_opsetid("", OPSET)])
+        model.ir_version = 8
+        onnx.checker.check_model(model)
+        return model
+
+
+def _float(name: str, shape) -> onnx.ValueInfoProto:
+    return onnx_helper.make_tensor_value_info(name, TensorProto.FLOAT, shape)
+
+
+def _int64(name: str, shape) -> onnx.ValueInfoProto:
+    return onnx_helper.make_tensor_value_info(name, TensorProto.INT64, shape)
+
+
+def make_text_encoder(
+    vocab_size: int, width: int = 64, layers: int = 1, seconds_per_char: float = 0.06, seed: int = 0
+) -> onnx.ModelProto:
+    g = _GraphBuilder(seed)
+    embedding = g.const(
+        g.rng.standard_normal((vocab_size, width)).astype(np.float32) * 0.1, "embedding"
+    )
+    x = g.op("Gather", [embedding, "input_ids"], axis=0)
+    style = g.op("ReduceMean", ["style", g.const(np.array([1], dtype=np.int64))], keepdims=1)
+    x = g.op("Add", [x, g.op("MatMul", [style, g.weight(SupertonicTTS.STYLE_DIM, width)])])
+    x = g.dense_stack(x, width, layers)
+    mask = g.op("Cast", ["attention_mask"], to=TensorProto.FLOAT)
+    mask_3d = g.op("Unsqueeze", [mask, g.const(np.array([2], dtype=np.int64))])
+    g.op("Mul", [x, mask_3d], "last_hidden_state")
+    chars = g.op("ReduceSum", [mask, g.const(np.array([1], dtype=np.int64))], keepdims=0)
+    g.op("Mul", [chars, g.const(np.float32(seconds_per_char))], "durations")
+    return g.model(
+        "text_encoder",
+        [
+            _int64("input_ids", ["batch", "tokens"]),
+            _int64("attention_mask", ["batch", "tokens"]),
+            _float("style", ["batch", "style_tokens", SupertonicTTS.STYLE_DIM]),
+        ],
+        [
+            _float("last_hidden_state", ["batch", "tokens", width]),
+            _float("durations", ["batch"]),
+        ],
+    )
+
+
+def make_latent_denoiser(
+    encoder_width: int = 64, layers: int = 2, width: int = LATENT_CHANNELS, seed: int = 1
+) -> onnx.ModelProto:
+    """One flow step: latents move 1/num_inference_steps of the way towards
+    a conditioned MLP target, then padding frames are zeroed"""
+    g = _GraphBuilder(seed)
+    axis1 = g.const(np.array([1], dtype=np.int64))
+    axes12 = g.const(np.array([1, 2], dtype=np.int64))
+    frames = g.op("Transpose", ["noisy_latents"], perm=[0, 2, 1])
+
+    # Conditioning: encoder output averaged over real tokens, plus mean style
+    token_mask = g.op("Cast", ["attention_mask"], to=TensorProto.FLOAT)
+    token_mask = g.op("Unsqueeze", [token_mask, g.const(np.array([2], dtype=np.int64))])
+    encoded = g.op("ReduceSum", [g.op("Mul", ["encoder_outputs", token_mask]), axis1], keepdims=1)
+    tokens = g.op("ReduceSum", [token_mask, axis1], keepdims=1)
+    encoded = g.op("Div", [encoded, g.op("Max", [tokens, g.const(np.float32(1.0))])])
+    style = g.op("ReduceMean", ["style", axis1], keepdims=1)
+    condition = g.op(
+        "Add",
+        [
+            g.op("MatMul", [encoded, g.weight(encoder_width, width)]),
+            g.op("MatMul", [style, g.weight(SupertonicTTS.STYLE_DIM, width)]),
+        ],
+    )
+
+    hidden = g.op("Add", [g.op("MatMul", [frames, g.weight(LATENT_CHANNELS, width)]), condition])
+    hidden = g.dense_stack(hidden, width, layers)
+    target = g.op("MatMul", [hidden, g.weight(width, LATENT_CHANNELS)])
+    timestep = g.op("Unsqueeze", ["timestep", axes12])
+    target = g.op("Add", [target, g.op("Mul", [timestep, g.const(np.float32(1e-3))])])
+    rate = g.op("Reciprocal", [g.op("Unsqueeze", ["num_inference_steps", axes12])])
+    frames = g.op("Add", [frames, g.op("Mul", [g.op("Sub", [target, frames]), rate])])
+
+    latent_mask = g.op("Cast", ["latent_mask"], to=TensorProto.FLOAT)
+    latent_mask = g.op("Unsqueeze", [latent_mask, axis1])
+    g.op("Mul", [g.op("Transpose", [frames], perm=[0, 2, 1]), latent_mask], "denoised_latents")
+    return g.model(
+        "latent_denoiser",
+        [
+            _float("noisy_latents", ["batch", LATENT_CHANNELS, "frames"]),
+            _int64("latent_mask", ["batch", "frames"]),
+            _float("style", ["batch", "style_tokens", SupertonicTTS.STYLE_DIM]),
+            _float("encoder_outputs", ["batch", "tokens", encoder_width]),
+            _int64("attention_mask", ["batch", "tokens"]),
+            _float("timestep", ["batch"]),
+            _float("num_inference_steps", ["batch"]),
+        ],
+        [_float("denoised_latents", ["batch", LATENT_CHANNELS, "frames"])],
+    )
+
+
+def make_voice_decoder(layers: int = 1, width: int = LATENT_CHANNELS, seed: int = 2) -> onnx.ModelProto:
+    """Project each latent frame to LATENT_SIZE samples"""
+    g = _GraphBuilder(seed)
+    frames = g.op("Transpose", ["latents"], perm=[0, 2, 1])
+    hidden = g.dense_stack(g.op("MatMul", [frames, g.weight(LATENT_CHANNELS, width)]), width, layers)
+    samples = g.op("MatMul", [hidden, g.weight(width, SupertonicTTS.LATENT_SIZE)])
+    samples = g.op("Mul", [g.op("Tanh", [samples]), g.const(np.float32(0.5))])
+    g.op("Reshape", [samples, g.const(np.array([0, -1], dtype=np.int64))], "waveform")
+    return g.model(
+        "voice_decoder",
+        [_float("latents", ["batch", LATENT_CHANNELS, "frames"])],
+        [_float("waveform", ["batch", "samples"])],
+    )
+
+
+def build_stub_tokenizer(model_dir: str) -> int:
+    """Write a character-level tokenizer AutoTokenizer can load; returns the vocab size"""
+    vocab = {token: index for index, token in enumerate(SPECIAL_TOKENS)}
+    for char in VOCAB_CHARS:
+        vocab.setdefault(char, len(vocab))
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Split(Regex("."), behavior="isolated")
+    tokenizer.add_special_tokens(SPECIAL_TOKENS)
+    tokenizer.save(os.path.join(model_dir, "tokenizer.json"))
+    with open(os.path.join(model_dir, "tokenizer_config.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "tokenizer_class": "PreTrainedTokenizerFast",
+                "pad_token": "<pad>",
+                "unk_token": "<unk>",
+                "model_max_length": 1000,
+            },
+            f,
+        )
+    return len(vocab)
+
+
+def build_fake_models(
+    model_dir: str,
+    *,
+    width: int = 64,
+    encoder_layers: int = 1,
+    denoiser_layers: int = 2,
+    decoder_layers: int = 1,
+    seconds_per_char: float = 0.06,
+    voices: Sequence[str] = ("M1", "F1"),
+    style_tokens: int = 8,
+    seed: int = 0,
+) -> str:
+    """
+    Write a stand-in model directory loadable by ``SupertonicTTS``.
+
+    Args:
+        model_dir: Directory to create (onnx/, voices/ and tokenizer files)
+        width: Hidden width of the MatMul layers; with the layer counts this
+            sets the compute cost per token (encoder) or latent frame
+        encoder_layers, denoiser_layers, decoder_layers: Layers per model
+        seconds_per_char: Audio duration the text encoder predicts per token
+        voices: Voice names to write style vectors for
+        style_tokens: Rows of each (1, style_tokens, STYLE_DIM) style vector
+        seed: Seed for weights and style vectors
+
+    Returns:
+        ``model_dir``
+    """
+    os.makedirs(os.path.join(model_dir, "onnx"), exist_ok=True)
+    os.makedirs(os.path.join(model_dir, "voices"), exist_ok=True)
+
+    vocab_size = build_stub_tokenizer(model_dir)
+    models_by_name = {
+        "text_encoder": make_text_encoder(vocab_size, width, encoder_layers, seconds_per_char, seed),
+        "latent_denoiser": make_latent_denoiser(width, denoiser_layers, width, seed + 1),
+        "voice_decoder": make_voice_decoder(decoder_layers, width, seed + 2),
+    }
+    for name, model in models_by_name.items():
+        onnx.save(model, os.path.join(model_dir, "onnx", f"{name}.onnx"))
+
+    rng = np.random.default_rng(seed)
+    for voice in voices:
+        style = rng.standard_normal((1, style_tokens, SupertonicTTS.STYLE_DIM)).astype(np.float32)
+        style.tofile(os.path.join(model_dir, "voices", f"{voice}.bin"))
+    return model_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write tiny stand-in Supertonic ONNX models.")
+    parser.add_argument("model_dir")
+    parser.add_argument("--width", type=int, default=64)
+    parser.add_argument("--encoder-layers", type=int, default=1)
+    parser.add_argument("--denoiser-layers", type=int, default=2)
+    parser.add_argument("--decoder-layers", type=int, default=1)
+    parser.add_argument("--seconds-per-char", type=float, default=0.06)
+    parser.add_argument("--voices", default="M1,F1", help="Comma-separated voice names.")
+    args = parser.parse_args()
+
+    build_fake_models(
+        args.model_dir,
+        width=args.width,
+        encoder_layers=args.encoder_layers,
+        denoiser_layers=args.denoiser_layers,
+        decoder_layers=args.decoder_layers,
+        seconds_per_char=args.seconds_per_char,
+        voices=[voice.strip() for voice in args.voices.split(",") if voice.strip()],
+    )
+    print(f"Wrote stand-in models to {args.model_dir}")
+
+
+if __name__ == "__main__":
+    main()
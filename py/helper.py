@@ -3,10 +3,12 @@ SupertonicTTS ONNX Runtime implementation using onnx-community/Supertonic-TTS-2-
 Based on the official model card implementation.
 """
 
+import json
 import os
+import threading
 import time
 from contextlib import contextmanager
-from typing import Optional
+from typing import Optional, Sequence, Union
 import re
 
 import numpy as np
@@ -14,6 +16,80 @@ import onnxruntime as ort
 from transformers import AutoTokenizer
 
 
+class GenerationCancelled(Exception):
+    """Raised when every item of a generation request has been cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe flag used to abandon an in-flight generation.
+
+    The token is checked between denoiser steps and before the voice decoder,
+    so a cancelled request stops within one step instead of running to the end.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise GenerationCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise GenerationCancelled()
+
+
+CancelTokens = Union[CancellationToken, Sequence[Optional[CancellationToken]], None]
+
+
+class SplitDenoiserSession:
+    """The latent denoiser as a per-request and a per-step model.
+
+    ``benchmarks/split_denoiser.py`` moves everything the denoiser computes
+    from its per-request inputs alone (style, encoder outputs, masks) into a
+    conditioning model. ``run`` takes the feeds of the original session: the
+    conditioning model runs again only when those inputs change (a new
+    chunk, or a batch shrunk by cancellation or early exit), and every step
+    reuses its outputs.
+    """
+
+    def __init__(self, condition: ort.InferenceSession, step: ort.InferenceSession):
+        self.condition = condition
+        self.step = step
+        self._condition_inputs = [node.name for node in condition.get_inputs()]
+        self._condition_outputs = [node.name for node in condition.get_outputs()]
+        self._step_inputs = [node.name for node in step.get_inputs()]
+        # Inputs and outputs of the last conditioning run, per inference thread
+        self._local = threading.local()
+
+    def run(self, output_names, feeds: dict, run_options=None) -> list:
+        local = self._local
+        inputs = [feeds[name] for name in self._condition_inputs]
+        cached = getattr(local, "inputs", None)
+        # The generate loop passes the same arrays on every step; identity
+        # is enough and avoids comparing tensors
+        if cached is None or any(new is not old for new, old in zip(inputs, cached)):
+            outputs = self.condition.run(
+                None, dict(zip(self._condition_inputs, inputs)), run_options
+            )
+            local.inputs = inputs
+            local.conditioning = dict(zip(self._condition_outputs, outputs))
+        step_feeds = {
+            name: local.conditioning[name] if name in local.conditioning else feeds[name]
+            for name in self._step_inputs
+        }
+        return self.step.run(output_names, step_feeds, run_options)
+
+    def get_providers(self) -> list[str]:
+        return self.step.get_providers()
+
+
 class SupertonicTTS:
     """SupertonicTTS class for text-to-speech generation using ONNX models."""
     
@@ -24,6 +100,46 @@ class SupertonicTTS:
     STYLE_DIM = 128
     LATENT_SIZE = BASE_CHUNK_SIZE * CHUNK_COMPRESS_FACTOR
     LANGUAGES = ["en", "ko", "es", "pt", "fr"]
+    SESSION_NAMES = ("text_encoder", "latent_denoiser", "voice_decoder")
+    # Tuned host settings written by benchmarks/autotune.py
+    ORT_PROFILE_ENV = "SUPERTONIC_ORT_PROFILE"
+    # Weight precisions; INT8 variants are written by benchmarks/quantize.py
+    # as onnx/<session>_<precision>.onnx and only used on the CPU backend
+    PRECISIONS = ("fp32", "int8_dynamic", "int8_static")
+    QUANTIZABLE_SESSIONS = ("latent_denoiser", "voice_decoder")
+    # Default for early_exit_tolerance (unset or 0 runs every step)
+    EARLY_EXIT_ENV = "SUPERTONIC_EARLY_EXIT_TOLERANCE"
+    # Share of the steps every item runs before it may exit early; the first
+    # steps move far from the noise whatever the tolerance
+    EARLY_EXIT_MIN_STEP_FRACTION = 0.5
+    # Suffixes of the conditioning and per-step halves of the denoiser
+    # written by benchmarks/split_denoiser.py next to the model they split
+    SPLIT_DENOISER_SUFFIXES = ("condition", "step")
+    # Suffix of the Loop-wrapped denoiser written by benchmarks/fuse_denoiser.py,
+    # which runs a block of steps per call
+    FUSED_DENOISER_SUFFIX = "loop"
+    # Longest fused block while cancellation tokens are watched, so a
+    # cancelled request still stops within a few steps
+    FUSED_CANCEL_CHECK_STEPS = 4
+    # Shape buckets: token and latent lengths are padded up to the next
+    # bucket so OpenVINO compiles a handful of static shapes instead of one
+    # per input length. Comma-separated lengths, or "off"; the defaults
+    # apply on the OpenVINO backend only
+    TOKEN_BUCKETS_ENV = "SUPERTONIC_TOKEN_BUCKETS"
+    LATENT_BUCKETS_ENV = "SUPERTONIC_LATENT_BUCKETS"
+    DEFAULT_TOKEN_BUCKETS = (32, 64, 128, 256, 384)
+    DEFAULT_LATENT_BUCKETS = (32, 64, 128, 256, 512)
+    # Where OpenVINO caches compiled models ("" disables the cache)
+    OPENVINO_CACHE_ENV = "OPENVINO_CACHE_DIR"
+    # CPU memory arena policy. The arena keeps the peak allocation of the
+    # longest input it has seen; "same_as_requested" grows it by exactly
+    # what is needed instead of doubling, a byte cap bounds it, and a
+    # shrink every ORT_ARENA_SHRINK_INTERVAL generations returns free chunks
+    ARENA_EXTEND_STRATEGIES = {"next_power_of_two": 0, "same_as_requested": 1}
+    ARENA_SHRINK_ENV = "ORT_ARENA_SHRINK_INTERVAL"
+    # The capped/extended arena is registered once per process and shared
+    _env_arena_registered = False
+    _env_arena_lock = threading.Lock()
 
     @staticmethod
     def _get_env_int(name: str) -> Optional[int]:
@@ -37,6 +153,54 @@ class SupertonicTTS:
             return None
         return parsed if parsed > 0 else None
 
+    @classmethod
+    def _load_ort_profile(cls) -> dict:
+        """Load the tuning profile named by SUPERTONIC_ORT_PROFILE (empty if unset)."""
+        path = os.getenv(cls.ORT_PROFILE_ENV)
+        if not path:
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as profile_file:
+                return json.load(profile_file)
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Failed to load ORT tuning profile {path}: {e}")
+
+    @staticmethod
+    def _parse_cpu_list(value: str) -> set[int]:
+        """Parse a taskset-style CPU list such as "0-3,8"."""
+        cpus: set[int] = set()
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                first, last = part.split("-", 1)
+                cpus.update(range(int(first), int(last) + 1))
+            else:
+                cpus.add(int(part))
+        return cpus
+
+    @classmethod
+    def _apply_cpu_affinity(cls, profile: Optional[dict] = None) -> Optional[set[int]]:
+        """Pin the process to SUPERTONIC_CPU_AFFINITY or the profile's CPU set.
+
+        CPUs outside the current affinity (e.g. a taskset mask) are ignored.
+        Returns the applied set, or None when nothing was changed.
+        """
+        if not hasattr(os, "sched_setaffinity"):
+            return None
+        requested = os.getenv("SUPERTONIC_CPU_AFFINITY")
+        if requested:
+            cpus = cls._parse_cpu_list(requested)
+        else:
+            profile = cls._load_ort_profile() if profile is None else profile
+            cpus = set(profile.get("cpu_affinity") or ())
+        cpus &= os.sched_getaffinity(0)
+        if not cpus or cpus == os.sched_getaffinity(0):
+            return None
+        os.sched_setaffinity(0, cpus)
+        return cpus
+
     @classmethod
     def _recommended_cpu_threads(cls) -> int:
         """Prefer physical cores to avoid SMT oversubscription in ONNX Runtime."""
@@ -87,7 +251,12 @@ class SupertonicTTS:
         backend: str = "cpu",
         use_gpu: Optional[bool] = None,
     ) -> ort.SessionOptions:
-        """Create ONNX Runtime session options tuned for CPU execution."""
+        """Create ONNX Runtime session options tuned for CPU execution.
+
+        Thread counts and execution mode come from the ORT_* environment
+        variables, then the SUPERTONIC_ORT_PROFILE tuning profile, then
+        the physical core count.
+        """
         if use_gpu is not None:
             backend = "cuda" if use_gpu else "cpu"
 
@@ -97,13 +266,21 @@ class SupertonicTTS:
         if backend in {"cuda", "openvino"}:
             return sess_options
 
+        cls._apply_arena_policy(sess_options)
+
+        tuned = cls._load_ort_profile().get("session_options", {})
         intra_threads = (
             cls._get_env_int("ORT_INTRA_OP_NUM_THREADS")
             or cls._get_env_int("OMP_NUM_THREADS")
+            or tuned.get("intra_op_num_threads")
             or cls._recommended_cpu_threads()
         )
-        inter_threads = cls._get_env_int("ORT_INTER_OP_NUM_THREADS")
+        inter_threads = cls._get_env_int("ORT_INTER_OP_NUM_THREADS") or tuned.get(
+            "inter_op_num_threads"
+        )
         execution_mode = os.getenv("ORT_EXECUTION_MODE")
+        if execution_mode is None and tuned.get("execution_mode") == "parallel":
+            execution_mode = "1"
 
         sess_options.intra_op_num_threads = intra_threads
         if inter_threads is not None:
@@ -114,6 +291,62 @@ class SupertonicTTS:
 
         return sess_options
 
+    @staticmethod
+    def _get_env_flag(name: str, default: bool) -> bool:
+        """Read a boolean environment variable (1/0, true/false, on/off)."""
+        value = os.getenv(name)
+        if value is None or not value.strip():
+            return default
+        return value.strip().lower() not in {"0", "false", "off", "no"}
+
+    @classmethod
+    def _apply_arena_policy(cls, sess_options: ort.SessionOptions) -> None:
+        """Apply the ORT_* CPU memory arena settings to ``sess_options``.
+
+        ORT_ENABLE_CPU_MEM_ARENA and ORT_ENABLE_MEM_PATTERN switch the arena
+        and the memory pattern planner. ORT_ARENA_EXTEND_STRATEGY
+        (next_power_of_two or same_as_requested) or ORT_ARENA_MAX_BYTES put
+        every session on one process-wide arena configured that way.
+        """
+        sess_options.enable_cpu_mem_arena = cls._get_env_flag("ORT_ENABLE_CPU_MEM_ARENA", True)
+        sess_options.enable_mem_pattern = cls._get_env_flag("ORT_ENABLE_MEM_PATTERN", True)
+        if not sess_options.enable_cpu_mem_arena:
+            return
+
+        strategy_name = os.getenv("ORT_ARENA_EXTEND_STRATEGY", "").strip().lower()
+        max_bytes = cls._get_env_int("ORT_ARENA_MAX_BYTES") or 0
+        if not strategy_name and not max_bytes:
+            return
+        strategy_name = strategy_name or "next_power_of_two"
+        if strategy_name not in cls.ARENA_EXTEND_STRATEGIES:
+            raise ValueError(
+                f"Unknown ORT_ARENA_EXTEND_STRATEGY '{strategy_name}'. "
+                f"Choose from {tuple(cls.ARENA_EXTEND_STRATEGIES)}."
+            )
+        with cls._env_arena_lock:
+            if not cls._env_arena_registered:
+                ort.create_and_register_allocator(
+                    ort.OrtMemoryInfo(
+                        "Cpu", ort.OrtAllocatorType.ORT_ARENA_ALLOCATOR, 0, ort.OrtMemType.DEFAULT
+                    ),
+                    ort.OrtArenaCfg(max_bytes, cls.ARENA_EXTEND_STRATEGIES[strategy_name], -1, -1),
+                )
+                cls._env_arena_registered = True
+        sess_options.add_session_config_entry("session.use_env_allocators", "1")
+
+    def _arena_run_options(self) -> Optional[ort.RunOptions]:
+        """Run options that shrink the CPU arena, every arena_shrink_interval generations."""
+        if not self.arena_shrink_interval:
+            return None
+        with self._arena_lock:
+            self._generations_since_shrink += 1
+            if self._generations_since_shrink < self.arena_shrink_interval:
+                return None
+            self._generations_since_shrink = 0
+        run_options = ort.RunOptions()
+        run_options.add_run_config_entry("memory.enable_memory_arena_shrinkage", "cpu:0")
+        return run_options
+
     @staticmethod
     def _normalize_backend(use_gpu: bool, backend: Optional[str]) -> str:
         """Resolve the requested ONNX Runtime backend."""
@@ -129,16 +362,70 @@ class SupertonicTTS:
             return "openvino"
         return "cpu"
 
+    @staticmethod
+    def _normalize_precision(precision: Optional[str]) -> str:
+        """Resolve the requested weight precision."""
+        if precision is None:
+            precision = os.getenv("SUPERTONIC_PRECISION", "fp32")
+        normalized = precision.strip().lower().replace("-", "_") or "fp32"
+        if normalized == "int8":
+            normalized = "int8_dynamic"
+        if normalized not in SupertonicTTS.PRECISIONS:
+            raise ValueError(
+                f"Unknown precision '{precision}'. Choose from {SupertonicTTS.PRECISIONS}."
+            )
+        return normalized
+
     @staticmethod
     def _openvino_device() -> str:
         """Return the requested OpenVINO device name."""
         return os.getenv("OPENVINO_DEVICE", "GPU").strip().upper() or "GPU"
 
+    @classmethod
+    def _openvino_cache_dir(cls) -> Optional[str]:
+        """Return the OpenVINO model cache directory, or None when disabled."""
+        value = os.getenv(
+            cls.OPENVINO_CACHE_ENV,
+            os.path.join(os.path.expanduser("~"), ".cache", "supertonic", "openvino"),
+        ).strip()
+        return value or None
+
+    def _resolve_buckets(
+        self, buckets: Optional[Sequence[int]], env: str, default: Sequence[int]
+    ) -> tuple[int, ...]:
+        """Shape buckets from the argument, then ``env``, then the backend default."""
+        if buckets is None:
+            value = os.getenv(env)
+            if value is None:
+                buckets = default if self.backend == "openvino" else ()
+            elif value.strip().lower() in {"", "0", "off", "none", "false"}:
+                buckets = ()
+            else:
+                buckets = [int(part) for part in value.split(",") if part.strip()]
+        if any(bucket <= 0 for bucket in buckets):
+            raise ValueError(f"Shape buckets must be positive, got {list(buckets)}")
+        return tuple(sorted(set(buckets)))
+
+    @staticmethod
+    def _bucket(length: int, buckets: Sequence[int]) -> int:
+        """Smallest bucket holding ``length``; past the largest, a multiple of it."""
+        for bucket in buckets:
+            if length <= bucket:
+                return bucket
+        if not buckets:
+            return length
+        largest = buckets[-1]
+        return -(-length // largest) * largest
+
     def __init__(
         self,
         model_path: str,
         use_gpu: bool = False,
         backend: Optional[str] = None,
+        precision: Optional[str] = None,
+        early_exit_tolerance: Optional[float] = None,
+        token_buckets: Optional[Sequence[int]] = None,
+        latent_buckets: Optional[Sequence[int]] = None,
     ):
         """
         Initialize SupertonicTTS model.
@@ -146,13 +433,45 @@ class SupertonicTTS:
         Args:
             model_path: Path to the model directory containing ONNX models
             use_gpu: Whether to use GPU for inference (default: False)
+            precision: fp32, int8_dynamic or int8_static (default:
+                SUPERTONIC_PRECISION, else fp32)
+            early_exit_tolerance: Default relative latent change below which
+                an item stops denoising early on CPU (default:
+                SUPERTONIC_EARLY_EXIT_TOLERANCE, else disabled)
+            token_buckets, latent_buckets: Lengths that token and latent
+                sequences are padded up to (default: SUPERTONIC_TOKEN_BUCKETS
+                and SUPERTONIC_LATENT_BUCKETS, else the DEFAULT_* buckets on
+                OpenVINO and none elsewhere; empty disables)
         """
         self.model_path = model_path
         self.sample_rate = self.SAMPLE_RATE
         self.backend = self._normalize_backend(use_gpu, backend)
         self.use_gpu = self.backend == "cuda"
         self.device = "cuda" if self.use_gpu else "cpu"
+        self.precision = self._normalize_precision(precision)
+        if self.precision != "fp32" and self.backend != "cpu":
+            print(f"{self.precision} models are CPU-only; using fp32 on {self.backend}")
+            self.precision = "fp32"
+        # Precision each session was actually loaded with
+        self.session_precisions: dict[str, str] = {}
+        if early_exit_tolerance is None:
+            early_exit_tolerance = float(os.getenv(self.EARLY_EXIT_ENV) or 0.0)
+        self.early_exit_tolerance = early_exit_tolerance
+        self.token_buckets = self._resolve_buckets(
+            token_buckets, self.TOKEN_BUCKETS_ENV, self.DEFAULT_TOKEN_BUCKETS
+        )
+        self.latent_buckets = self._resolve_buckets(
+            latent_buckets, self.LATENT_BUCKETS_ENV, self.DEFAULT_LATENT_BUCKETS
+        )
+        # Generations between CPU arena shrinks (0 never shrinks)
+        self.arena_shrink_interval = self._get_env_int(self.ARENA_SHRINK_ENV) or 0
+        self._generations_since_shrink = 0
+        self._arena_lock = threading.Lock()
         self._style_cache: dict[str, np.ndarray] = {}
+        self.style_cache_hits = 0
+        self.style_cache_misses = 0
+        # Sessions temporarily replaced by profiling copies, by session name
+        self._profiled_sessions: dict[str, ort.InferenceSession] = {}
         
         # Initialize tokenizer with error handling
         try:
@@ -170,33 +489,216 @@ class SupertonicTTS:
             print("Using CUDA GPU for inference (if available)")
         elif self.backend == "openvino":
             openvino_device = self._openvino_device()
+            openvino_options = {"device_type": openvino_device}
+            cache_dir = self._openvino_cache_dir()
+            if cache_dir is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                openvino_options["cache_dir"] = cache_dir
+            if self.token_buckets and self.latent_buckets:
+                # Every bucket is a static shape, compiled once and cached
+                openvino_options["disable_dynamic_shapes"] = "True"
             providers = [
-                ("OpenVINOExecutionProvider", {"device_type": openvino_device}),
+                ("OpenVINOExecutionProvider", openvino_options),
                 "CPUExecutionProvider",
             ]
             print(f"Using OpenVINO for inference on {openvino_device}")
         else:
             providers = ["CPUExecutionProvider"]
             print("Using CPU for inference")
+            pinned = self._apply_cpu_affinity()
+            if pinned is not None:
+                print(f"Pinned to CPUs {sorted(pinned)}")
 
         # Load ONNX sessions
-        onnx_dir = os.path.join(self.model_path, "onnx")
+        self.providers = providers
         sess_options = self._create_session_options(self.backend)
-        self.text_encoder = ort.InferenceSession(
-            os.path.join(onnx_dir, "text_encoder.onnx"),
+        self.text_encoder = self._create_session("text_encoder", sess_options)
+        self.latent_denoiser = self._create_session("latent_denoiser", sess_options)
+        self.voice_decoder = self._create_session("voice_decoder", sess_options)
+        # The GPU path binds the denoiser's inputs on the device, so only the
+        # CPU path (and OpenVINO) uses the split model
+        self.split_denoiser = False
+        self.latent_denoiser_loop: Optional[ort.InferenceSession] = None
+        if not self.use_gpu:
+            self.latent_denoiser_loop = self._load_fused_denoiser(sess_options)
+            if self.latent_denoiser_loop is not None:
+                print("Using fused latent denoiser (one call per block of steps)")
+            split = self._load_split_denoiser(sess_options)
+            if split is not None:
+                self.latent_denoiser = split
+                self.split_denoiser = True
+                print("Using split latent denoiser (conditioning runs once per chunk)")
+
+    def _create_session(
+        self, name: str, sess_options: Optional[ort.SessionOptions] = None
+    ) -> ort.InferenceSession:
+        """Create the InferenceSession for one of SESSION_NAMES."""
+        if sess_options is None:
+            sess_options = self._create_session_options(self.backend)
+        return ort.InferenceSession(
+            self._session_path(name),
             sess_options=sess_options,
-            providers=providers
+            providers=self.providers,
         )
-        self.latent_denoiser = ort.InferenceSession(
-            os.path.join(onnx_dir, "latent_denoiser.onnx"),
-            sess_options=sess_options,
-            providers=providers
-        )
-        self.voice_decoder = ort.InferenceSession(
-            os.path.join(onnx_dir, "voice_decoder.onnx"),
-            sess_options=sess_options,
-            providers=providers
+
+    def _session_path(self, name: str) -> str:
+        """Model file for one session at the requested precision.
+
+        Sessions without a quantized variant on disk fall back to fp32, so
+        e.g. only the denoiser can be shipped in INT8.
+        """
+        onnx_dir = os.path.join(self.model_path, "onnx")
+        precision = "fp32"
+        path = os.path.join(onnx_dir, f"{name}.onnx")
+        if self.precision != "fp32" and name in self.QUANTIZABLE_SESSIONS:
+            variant = os.path.join(onnx_dir, f"{name}_{self.precision}.onnx")
+            if os.path.exists(variant):
+                precision, path = self.precision, variant
+            elif name not in self.session_precisions:
+                print(f"No {self.precision} variant of {name}; using fp32")
+        self.session_precisions[name] = precision
+        return path
+
+    def _load_split_denoiser(
+        self, sess_options: Optional[ort.SessionOptions] = None
+    ) -> Optional[SplitDenoiserSession]:
+        """Load the split form of the denoiser at its precision, if written."""
+        base = os.path.splitext(self._session_path("latent_denoiser"))[0]
+        paths = [f"{base}_{suffix}.onnx" for suffix in self.SPLIT_DENOISER_SUFFIXES]
+        if not all(os.path.exists(path) for path in paths):
+            return None
+        if sess_options is None:
+            sess_options = self._create_session_options(self.backend)
+        condition, step = (
+            ort.InferenceSession(path, sess_options=sess_options, providers=self.providers)
+            for path in paths
         )
+        return SplitDenoiserSession(condition, step)
+
+    def _load_fused_denoiser(
+        self, sess_options: Optional[ort.SessionOptions] = None
+    ) -> Optional[ort.InferenceSession]:
+        """Load the Loop-wrapped denoiser at its precision, if written."""
+        base = os.path.splitext(self._session_path("latent_denoiser"))[0]
+        path = f"{base}_{self.FUSED_DENOISER_SUFFIX}.onnx"
+        if not os.path.exists(path):
+            return None
+        if sess_options is None:
+            sess_options = self._create_session_options(self.backend)
+        return ort.InferenceSession(path, sess_options=sess_options, providers=self.providers)
+
+    def start_profiling(self, session_name: str, file_prefix: str) -> float:
+        """
+        Swap in a copy of one session with ONNX Runtime profiling enabled.
+
+        Profiling the denoiser also turns off the fused denoiser until
+        stop_profiling, so every step goes through the profiled session.
+
+        Args:
+            session_name: One of SESSION_NAMES
+            file_prefix: Path prefix for the JSON trace ORT writes
+
+        Returns:
+            Profiling start time on the time.perf_counter() clock, used to
+            align Python spans with the ORT trace
+        """
+        if session_name not in self.SESSION_NAMES:
+            raise ValueError(
+                f"Unknown session '{session_name}'. Choose from {self.SESSION_NAMES}."
+            )
+        if session_name in self._profiled_sessions:
+            raise RuntimeError(f"Session '{session_name}' is already being profiled")
+
+        sess_options = self._create_session_options(self.backend)
+        sess_options.enable_profiling = True
+        sess_options.profile_file_prefix = file_prefix
+        session = self._create_session(session_name, sess_options)
+
+        self._profiled_sessions[session_name] = getattr(self, session_name)
+        setattr(self, session_name, session)
+        if session_name == "latent_denoiser" and getattr(self, "latent_denoiser_loop", None) is not None:
+            # The fused loop would run the steps without the profiled copy;
+            # run them one call at a time until profiling stops
+            self._profiled_sessions["latent_denoiser_loop"] = self.latent_denoiser_loop
+            self.latent_denoiser_loop = None
+        # ORT reports its start on the system or the monotonic clock depending
+        # on version and platform; map whichever is closer to perf_counter.
+        start_ns = session.get_profiling_start_time_ns()
+        if abs(start_ns - time.time_ns()) < abs(start_ns - time.monotonic_ns()):
+            reference = time.time()
+        else:
+            reference = time.monotonic()
+        return start_ns / 1e9 + time.perf_counter() - reference
+
+    def stop_profiling(self, session_name: str) -> str:
+        """
+        Restore the original session and finish its profiling copy.
+
+        Returns:
+            Path of the JSON trace written by ONNX Runtime
+        """
+        original = self._profiled_sessions.pop(session_name)
+        session = getattr(self, session_name)
+        setattr(self, session_name, original)
+        if session_name == "latent_denoiser" and "latent_denoiser_loop" in self._profiled_sessions:
+            self.latent_denoiser_loop = self._profiled_sessions.pop("latent_denoiser_loop")
+        return session.end_profiling()
+
+    def warmup_buckets(self, voice: Optional[str] = None) -> int:
+        """
+        Run every session once per shape bucket at batch size 1.
+
+        On OpenVINO each bucket is then compiled before the first request
+        needs it, and with a cache directory later processes load the
+        compiled models from disk. The denoiser runs for every pair of
+        token and latent bucket.
+
+        Args:
+            voice: Style to run with (default: the first voice on disk)
+
+        Returns:
+            Number of session runs
+        """
+        if not (self.token_buckets and self.latent_buckets):
+            return 0
+        if voice is None:
+            voices_dir = os.path.join(self.model_path, "voices")
+            voice = sorted(
+                name[: -len(".bin")] for name in os.listdir(voices_dir) if name.endswith(".bin")
+            )[0]
+        style = self._load_style(voice)
+        channels = self.LATENT_DIM * self.CHUNK_COMPRESS_FACTOR
+        pad_id = self.tokenizer.pad_token_id or 0
+        runs = 0
+        for tokens in self.token_buckets:
+            input_ids = np.full((1, tokens), pad_id, dtype=np.int64)
+            attn_mask = np.ones((1, tokens), dtype=np.int64)
+            last_hidden_state, _ = self.text_encoder.run(
+                None, {"input_ids": input_ids, "attention_mask": attn_mask, "style": style}
+            )
+            runs += 1
+            for frames in self.latent_buckets:
+                feeds = {
+                    "noisy_latents": np.zeros((1, channels, frames), dtype=np.float32),
+                    "latent_mask": np.ones((1, frames), dtype=np.int64),
+                    "style": style,
+                    "encoder_outputs": last_hidden_state,
+                    "attention_mask": attn_mask,
+                    "timestep": np.zeros(1, dtype=np.float32),
+                    "num_inference_steps": np.ones(1, dtype=np.float32),
+                }
+                self.latent_denoiser.run(None, feeds)
+                runs += 1
+                if self.latent_denoiser_loop is not None:
+                    feeds["num_steps"] = np.array(1, dtype=np.int64)
+                    self.latent_denoiser_loop.run(None, feeds)
+                    runs += 1
+        for frames in self.latent_buckets:
+            self.voice_decoder.run(
+                None, {"latents": np.zeros((1, channels, frames), dtype=np.float32)}
+            )
+            runs += 1
+        return runs
 
     def _load_style(self, voice: str) -> np.ndarray:
         """
@@ -213,8 +715,10 @@ class SupertonicTTS:
             raise ValueError(f"Voice '{voice}' not found at {voice_path}.")
 
         if voice in self._style_cache:
+            self.style_cache_hits += 1
             return self._style_cache[voice]
 
+        self.style_cache_misses += 1
         style_vec = np.fromfile(voice_path, dtype=np.float32)
         
         # Reshape to (1, -1, STYLE_DIM) where -1 infers the middle dimension
@@ -222,6 +726,29 @@ class SupertonicTTS:
         self._style_cache[voice] = style
         return style
 
+    def _initial_latents(self, latent_lengths: np.ndarray, max_len: int) -> np.ndarray:
+        """Gaussian noise for the longest item, zero-padded to the bucketed ``max_len``.
+
+        Drawing for the unpadded length keeps seeded output independent of
+        the shape buckets.
+        """
+        latents = np.random.randn(
+            len(latent_lengths), self.LATENT_DIM * self.CHUNK_COMPRESS_FACTOR, int(latent_lengths.max())
+        ).astype(np.float32)
+        return np.pad(latents, ((0, 0), (0, 0), (0, max_len - latents.shape[2])))
+
+    def _pad_tokens(
+        self, input_ids: np.ndarray, attn_mask: np.ndarray, length: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Right-pad token ids (with the pad token) and mask (with 0) to ``length``."""
+        extra = length - input_ids.shape[1]
+        if extra <= 0:
+            return input_ids, attn_mask
+        pad_id = self.tokenizer.pad_token_id or 0
+        input_ids = np.pad(input_ids, ((0, 0), (0, extra)), constant_values=pad_id)
+        attn_mask = np.pad(attn_mask, ((0, 0), (0, extra)), constant_values=0)
+        return input_ids, attn_mask
+
     def _to_ort(self, arr: np.ndarray) -> ort.OrtValue:
         """Convert numpy array to OrtValue on the configured device."""
         if self.use_gpu:
@@ -235,7 +762,10 @@ class SupertonicTTS:
         voice: str = "M1",
         speed: float = 1.0,
         steps: int = 15,
-        language: str = "en"
+        language: str = "en",
+        cancel_token: CancelTokens = None,
+        profile: Optional[dict] = None,
+        early_exit_tolerance: Optional[float] = None,
     ) -> list[np.ndarray]:
         """
         Generate audio from text.
@@ -246,6 +776,22 @@ class SupertonicTTS:
             speed: Speech speed multiplier (default: 1.0)
             steps: Number of inference steps (default: 15, higher = better quality)
             language: Language code (default: "en")
+            cancel_token: Optional CancellationToken for the whole batch, or one
+                token per text. Cancelled items are dropped from the remaining
+                denoiser steps and come back as empty arrays; GenerationCancelled
+                is raised once every item is cancelled.
+            profile: Optional dict filled with stage timings ("tokenize_seconds",
+                "text_encoder_seconds", "denoise_step_seconds" list,
+                "voice_decoder_seconds", "generate_seconds") and batch
+                statistics ("batch_size", "token_padding_ratio",
+                "latent_padding_ratio", "steps"). If it holds a "spans" list,
+                (stage, start, end) perf_counter spans are appended to it.
+                With early exit, "early_exit_items" and
+                "early_exit_steps_saved" (item-steps skipped) are added.
+            early_exit_tolerance: Stop denoising an item once one step changes
+                its latents by less than this fraction of their norm
+                (default: self.early_exit_tolerance; 0 runs every step).
+                CPU path only.
             
         Returns:
             List of audio arrays (one per input text)
@@ -255,25 +801,112 @@ class SupertonicTTS:
                 f"Language '{language}' not supported. Choose from {self.LANGUAGES}."
             )
 
+        cancel_tokens = self._normalize_cancel_tokens(cancel_token, len(text))
+        self._check_cancelled(cancel_tokens)
+
+        generate_start = time.perf_counter()
+
         # 1. Prepare Text Inputs
         text = [f"<{language}>{t}</{language}>" for t in text]
         inputs = self.tokenizer(text, return_tensors="np", padding=True, truncation=True)
         input_ids = inputs["input_ids"]
         attn_mask = inputs["attention_mask"]
+        if self.token_buckets:
+            input_ids, attn_mask = self._pad_tokens(
+                input_ids, attn_mask, self._bucket(input_ids.shape[1], self.token_buckets)
+            )
         batch_size = input_ids.shape[0]
+        self._record_stage(profile, "tokenize", generate_start)
+        if profile is not None:
+            profile["batch_size"] = batch_size
+            profile["steps"] = steps
+            profile["token_padding_ratio"] = 1.0 - float(attn_mask.sum()) / attn_mask.size
 
         # 2. Prepare Style
         style = self._load_style(voice).repeat(batch_size, axis=0)
 
         # Optimization: Use IO Binding for GPU to keep tensors on device
         if self.use_gpu:
-            return self._generate_gpu(input_ids, attn_mask, style, speed, steps)
-        
-        # Fallback to CPU/Standard path
-        return self._generate_cpu(input_ids, attn_mask, style, speed, steps)
+            results = self._generate_gpu(
+                input_ids, attn_mask, style, speed, steps, cancel_tokens, profile
+            )
+        else:
+            # Fallback to CPU/Standard path
+            if early_exit_tolerance is None:
+                early_exit_tolerance = self.early_exit_tolerance
+            results = self._generate_cpu(
+                input_ids, attn_mask, style, speed, steps, cancel_tokens, profile,
+                early_exit_tolerance, self._arena_run_options(),
+            )
 
-    def _generate_gpu(self, input_ids, attn_mask, style, speed, steps):
-        """GPU optimized generation using IO Binding"""
+        self._record_stage(profile, "generate", generate_start)
+        return results
+
+    @staticmethod
+    def _record_stage(profile: Optional[dict], stage: str, start: float) -> None:
+        """Add the time since ``start`` to ``profile["<stage>_seconds"]``."""
+        if profile is not None:
+            end = time.perf_counter()
+            key = f"{stage}_seconds"
+            profile[key] = profile.get(key, 0.0) + end - start
+            if "spans" in profile:
+                profile["spans"].append((stage, start, end))
+
+    @staticmethod
+    def _record_step(profile: Optional[dict], start: float, steps: int = 1) -> None:
+        """Append the time since ``start`` to the per-step denoiser timings.
+
+        A fused block of ``steps`` steps is recorded as that many equal steps.
+        """
+        if profile is not None:
+            end = time.perf_counter()
+            profile.setdefault("denoise_step_seconds", []).extend(
+                [(end - start) / steps] * steps
+            )
+            if "spans" in profile:
+                profile["spans"].append(("denoise_step", start, end))
+
+    @staticmethod
+    def _record_latent_padding(profile: Optional[dict], latent_mask: np.ndarray) -> None:
+        if profile is not None:
+            profile["latent_padding_ratio"] = (
+                1.0 - float(latent_mask.sum()) / latent_mask.size
+            )
+
+    @staticmethod
+    def _normalize_cancel_tokens(
+        cancel_token: CancelTokens, batch_size: int
+    ) -> Optional[list[Optional[CancellationToken]]]:
+        """Expand a cancel_token argument to one (optional) token per batch item."""
+        if cancel_token is None:
+            return None
+        if isinstance(cancel_token, CancellationToken):
+            return [cancel_token] * batch_size
+        tokens = list(cancel_token)
+        if len(tokens) != batch_size:
+            raise ValueError(
+                f"Expected {batch_size} cancellation tokens, got {len(tokens)}."
+            )
+        return tokens
+
+    @staticmethod
+    def _check_cancelled(
+        cancel_tokens: Optional[list[Optional[CancellationToken]]],
+    ) -> None:
+        """Raise GenerationCancelled when every item has been cancelled."""
+        if cancel_tokens is not None and all(
+            token is not None and token.cancelled for token in cancel_tokens
+        ):
+            raise GenerationCancelled()
+
+    def _generate_gpu(
+        self, input_ids, attn_mask, style, speed, steps, cancel_tokens=None, profile=None
+    ):
+        """GPU optimized generation using IO Binding
+
+        Cancellation is checked between steps, but cancelled items are not
+        dropped from the batch so the tensors can stay bound on the device.
+        """
         
         # Move inputs to GPU
         input_ids_ort = self._to_ort(input_ids)
@@ -291,7 +924,9 @@ class SupertonicTTS:
         io_binding.bind_output("last_hidden_state", "cuda")
         io_binding.bind_output("durations", "cpu") # Raw durations needed for latent calc
         
+        stage_start = time.perf_counter()
         self.text_encoder.run_with_iobinding(io_binding)
+        self._record_stage(profile, "text_encoder", stage_start)
         outputs = io_binding.get_outputs()
         last_hidden_state_ort = outputs[0] # OrtValue on GPU
         raw_durations = outputs[1].numpy() # Numpy on CPU
@@ -300,12 +935,11 @@ class SupertonicTTS:
 
         # 4. Latent Preparation (CPU Math)
         latent_lengths = (durations + self.LATENT_SIZE - 1) // self.LATENT_SIZE
-        max_len = latent_lengths.max()
+        max_len = self._bucket(int(latent_lengths.max()), self.latent_buckets)
         latent_mask = (np.arange(max_len) < latent_lengths[:, None]).astype(np.int64)
-        latents = np.random.randn(
-            len(durations), self.LATENT_DIM * self.CHUNK_COMPRESS_FACTOR, max_len
-        ).astype(np.float32)
+        latents = self._initial_latents(latent_lengths, max_len)
         latents *= latent_mask[:, None, :]
+        self._record_latent_padding(profile, latent_mask)
 
         # Move prepared latents to GPU
         latents_ort = self._to_ort(latents)
@@ -317,6 +951,7 @@ class SupertonicTTS:
         # Since we loop, preserving GPU residence is key.
         
         for step in range(steps):
+            self._check_cancelled(cancel_tokens)
             timestep_ort = self._to_ort(np.full(len(durations), step, dtype=np.float32))
             
             io_binding = self.latent_denoiser.io_binding()
@@ -331,17 +966,22 @@ class SupertonicTTS:
             # Output stays on GPU and becomes next input
             io_binding.bind_output("denoised_latents", "cuda")
             
+            step_start = time.perf_counter()
             self.latent_denoiser.run_with_iobinding(io_binding)
             latents_ort = io_binding.get_outputs()[0]
+            self._record_step(profile, step_start)
 
         # 6. Decode Latents to Audio
+        self._check_cancelled(cancel_tokens)
         io_binding = self.voice_decoder.io_binding()
         io_binding.bind_ortvalue_input("latents", latents_ort)
         # Final output moves to CPU
         io_binding.bind_output("waveform", "cpu")
         
+        stage_start = time.perf_counter()
         self.voice_decoder.run_with_iobinding(io_binding)
         waveforms = io_binding.get_outputs()[0].numpy()
+        self._record_stage(profile, "voice_decoder", stage_start)
 
         # 7. Post-process
         results = []
@@ -352,54 +992,190 @@ class SupertonicTTS:
 
         return results
 
-    def _generate_cpu(self, input_ids, attn_mask, style, speed, steps):
-        """Standard CPU generation (Original Implementation)"""
+    def _generate_cpu(
+        self, input_ids, attn_mask, style, speed, steps, cancel_tokens=None, profile=None,
+        early_exit_tolerance=0.0, run_options=None,
+    ):
+        """Standard CPU generation (Original Implementation)
+
+        When per-item cancellation tokens are given, cancelled items are removed
+        from the batch between denoiser steps so the remaining steps run on a
+        smaller tensor. With ``early_exit_tolerance``, items whose latents
+        stopped changing are frozen and removed the same way.
+
+        When the fused denoiser is loaded, steps run in blocks of one call
+        each: the whole loop at once, blocks of FUSED_CANCEL_CHECK_STEPS
+        while cancellation tokens are watched, and single steps wherever
+        early exit compares consecutive latents.
+
+        ``run_options`` (e.g. an arena shrink) go to the encoder run, the last
+        denoiser call and the decoder run.
+        """
         
         # 3. Text Encoding
+        stage_start = time.perf_counter()
         last_hidden_state, raw_durations = self.text_encoder.run(
             None,
-            {"input_ids": input_ids, "attention_mask": attn_mask, "style": style}
+            {"input_ids": input_ids, "attention_mask": attn_mask, "style": style},
+            run_options,
         )
+        self._record_stage(profile, "text_encoder", stage_start)
         durations = (raw_durations / speed * self.SAMPLE_RATE).astype(np.int64)
 
         # 4. Latent Preparation
         latent_lengths = (durations + self.LATENT_SIZE - 1) // self.LATENT_SIZE
-        max_len = latent_lengths.max()
+        max_len = self._bucket(int(latent_lengths.max()), self.latent_buckets)
         latent_mask = (np.arange(max_len) < latent_lengths[:, None]).astype(np.int64)
-        latents = np.random.randn(
-            len(durations), self.LATENT_DIM * self.CHUNK_COMPRESS_FACTOR, max_len
-        ).astype(np.float32)
+        latents = self._initial_latents(latent_lengths, max_len)
         latents *= latent_mask[:, None, :]
+        self._record_latent_padding(profile, latent_mask)
 
         # 5. Denoising Loop
-        num_inference_steps = np.full(len(durations), steps, dtype=np.float32)
-        timesteps = [np.full(len(durations), step, dtype=np.float32) for step in range(steps)]
-        for step in range(steps):
-            latents = self.latent_denoiser.run(
-                None,
-                {
-                    "noisy_latents": latents,
-                    "latent_mask": latent_mask,
-                    "style": style,
-                    "encoder_outputs": last_hidden_state,
-                    "attention_mask": attn_mask,
-                    "timestep": timesteps[step],
-                    "num_inference_steps": num_inference_steps,
-                },
-            )[0]
+        # `active` maps rows of the (possibly shrunk) batch back to input items.
+        active = np.arange(len(durations))
+        num_inference_steps = np.full(len(active), steps, dtype=np.float32)
+        timesteps = [np.full(len(active), step, dtype=np.float32) for step in range(steps)]
+        # Items that converged early, with their final latents
+        frozen_items: list[int] = []
+        frozen_latents: list[np.ndarray] = []
+        converged = np.zeros(len(active), dtype=bool)
+        steps_saved = 0
+        min_steps = int(np.ceil(steps * self.EARLY_EXIT_MIN_STEP_FRACTION))
+        step = 0
+        while step < steps:
+            if cancel_tokens is not None or converged.any():
+                keep = np.flatnonzero(~converged)
+                for row in np.flatnonzero(converged):
+                    frozen_items.append(int(active[row]))
+                    frozen_latents.append(latents[row])
+                if cancel_tokens is not None:
+                    if frozen_items:
+                        keep = keep[self._live_rows(cancel_tokens, active[keep])]
+                    else:
+                        keep = keep[self._surviving_rows(cancel_tokens, active[keep])]
+                converged = np.zeros(len(keep), dtype=bool)
+                if len(keep) < len(active):
+                    active = active[keep]
+                    latents = latents[keep]
+                    latent_mask = latent_mask[keep]
+                    style = style[keep]
+                    last_hidden_state = last_hidden_state[keep]
+                    attn_mask = attn_mask[keep]
+                    num_inference_steps = num_inference_steps[keep]
+                    timesteps = [timestep[keep] for timestep in timesteps]
+                if len(active) == 0:
+                    break
+
+            # Read once: start_profiling may clear it from another thread
+            fused = self.latent_denoiser_loop
+            block = self._fused_block(
+                fused, steps - step, step, cancel_tokens, early_exit_tolerance, min_steps
+            )
+            feeds = {
+                "noisy_latents": latents,
+                "latent_mask": latent_mask,
+                "style": style,
+                "encoder_outputs": last_hidden_state,
+                "attention_mask": attn_mask,
+                "timestep": timesteps[step],
+                "num_inference_steps": num_inference_steps,
+            }
+            step_options = run_options if step + block == steps else None
+            step_start = time.perf_counter()
+            previous = latents
+            if block > 1:
+                feeds["num_steps"] = np.array(block, dtype=np.int64)
+                latents = fused.run(None, feeds, step_options)[0]
+            else:
+                latents = self.latent_denoiser.run(None, feeds, step_options)[0]
+            self._record_step(profile, step_start, block)
+            step += block
+            if early_exit_tolerance and min_steps <= step < steps:
+                change = self._latent_change(previous, latents, latent_mask)
+                converged = change < early_exit_tolerance
+                steps_saved += int(converged.sum()) * (steps - step)
+
+        if profile is not None and early_exit_tolerance:
+            profile["early_exit_items"] = len(frozen_items)
+            profile["early_exit_steps_saved"] = steps_saved
 
         # 6. Decode Latents to Audio
-        waveforms = self.voice_decoder.run(None, {"latents": latents})[0]
+        if frozen_items:
+            # Converged items rejoin the batch for the single decoder run
+            active = np.concatenate([active, np.array(frozen_items, dtype=np.int64)])
+            latents = np.concatenate([latents, np.stack(frozen_latents)])
+        if cancel_tokens is not None:
+            keep = self._surviving_rows(cancel_tokens, active)
+            active = active[keep]
+            latents = latents[keep]
+        stage_start = time.perf_counter()
+        waveforms = self.voice_decoder.run(None, {"latents": latents}, run_options)[0]
+        self._record_stage(profile, "voice_decoder", stage_start)
 
         # 7. Post-process
-        results = []
+        results = [np.zeros(0, dtype=np.float32) for _ in range(len(durations))]
         output_lengths = latent_lengths * self.LATENT_SIZE
-        for i, length in enumerate(output_lengths):
-            length_int = int(length)
-            results.append(waveforms[i, :length_int])
+        for row, item in enumerate(active):
+            length_int = int(output_lengths[item])
+            results[item] = waveforms[row, :length_int]
 
         return results
 
+    def _fused_block(
+        self,
+        fused: Optional[ort.InferenceSession],
+        remaining: int,
+        step: int,
+        cancel_tokens: Optional[list[Optional[CancellationToken]]],
+        early_exit_tolerance: float,
+        min_steps: int,
+    ) -> int:
+        """Steps the next denoiser call runs (1 without the fused denoiser ``fused``)."""
+        if fused is None:
+            return 1
+        block = remaining
+        if cancel_tokens is not None:
+            block = min(block, self.FUSED_CANCEL_CHECK_STEPS)
+        if early_exit_tolerance:
+            # Early exit compares the latents before and after each step
+            # from step min_steps on
+            block = min(block, max(1, min_steps - 1 - step))
+        return block
+
+    @staticmethod
+    def _live_rows(
+        cancel_tokens: list[Optional[CancellationToken]], active: np.ndarray
+    ) -> np.ndarray:
+        """Return batch rows whose items are not cancelled."""
+        return np.array(
+            [
+                row
+                for row, item in enumerate(active)
+                if cancel_tokens[item] is None or not cancel_tokens[item].cancelled
+            ],
+            dtype=np.int64,
+        )
+
+    @classmethod
+    def _surviving_rows(
+        cls, cancel_tokens: list[Optional[CancellationToken]], active: np.ndarray
+    ) -> np.ndarray:
+        """Return batch rows whose items are not cancelled; raise if none are left."""
+        keep = cls._live_rows(cancel_tokens, active)
+        if len(keep) == 0:
+            raise GenerationCancelled()
+        return keep
+
+    @staticmethod
+    def _latent_change(
+        previous: np.ndarray, current: np.ndarray, latent_mask: np.ndarray
+    ) -> np.ndarray:
+        """Per-item norm of one step's latent update relative to the latents."""
+        mask = latent_mask[:, None, :].astype(np.float32)
+        delta = np.sqrt((((current - previous) * mask) ** 2).sum(axis=(1, 2)))
+        norm = np.sqrt(((previous * mask) ** 2).sum(axis=(1, 2)))
+        return delta / np.maximum(norm, 1e-8)
+
     def __call__(
         self,
         text: str,
@@ -407,6 +1183,7 @@ class SupertonicTTS:
         voice: str,
         total_step: int,
         speed: float = 1.0,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> tuple[np.ndarray, np.ndarray]:
         """
         Legacy interface for compatibility with existing API.
@@ -417,6 +1194,7 @@ class SupertonicTTS:
             voice: Voice name
             total_step: Number of inference steps
             speed: Speech speed multiplier
+            cancel_token: Optional token checked between chunks and denoiser steps
             
         Returns:
             Tuple of (waveform, duration)
@@ -435,7 +1213,8 @@ class SupertonicTTS:
                 voice=voice,
                 speed=speed,
                 steps=total_step,
-                language=lang
+                language=lang,
+                cancel_token=cancel_token,
             )
             wav_list.append(results[0])
             total_duration += len(results[0]) / self.SAMPLE_RATE
@@ -510,6 +1289,8 @@ def load_text_to_speech(
     model_path: str,
     use_gpu: bool = False,
     backend: Optional[str] = None,
+    precision: Optional[str] = None,
+    early_exit_tolerance: Optional[float] = None,
 ) -> SupertonicTTS:
     """
     Load the text-to-speech model.
@@ -518,11 +1299,19 @@ def load_text_to_speech(
         model_path: Path to model directory
         use_gpu: Whether to use CUDA GPU
         backend: Optional backend override: cpu, cuda, or openvino
+        precision: Optional precision override: fp32, int8_dynamic or int8_static
+        early_exit_tolerance: Optional early-exit tolerance (0 disables)
         
     Returns:
         SupertonicTTS instance
     """
-    return SupertonicTTS(model_path, use_gpu, backend=backend)
+    return SupertonicTTS(
+        model_path,
+        use_gpu,
+        backend=backend,
+        precision=precision,
+        early_exit_tolerance=early_exit_tolerance,
+    )
 
 
 def load_voice_style(voice_paths: list[str], verbose: bool = False) -> str:
@@ -0,0 +1,110 @@
+"""
+Tests for the pluggable audio encoder backends.
+"""
+
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.src.services.audio_converter import (
+    AudioConverter,
+    EncoderBackend,
+    SoundfileEncoder,
+    get_encoder_backends,
+)
+
+
+def _wav_bytes(seconds: float = 0.5, sample_rate: int = 44100) -> bytes:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    data = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    buffer = io.BytesIO()
+    sf.write(buffer, data, sample_rate, format="WAV")
+    return buffer.getvalue()
+
+
+class _FailingEncoder(EncoderBackend):
+    name = "failing"
+    formats = frozenset({"flac"})
+
+    def encode(self, audio_data, output_format, sample_rate):
+        raise RuntimeError("boom")
+
+
+def test_soundfile_backend_encodes_flac_in_process():
+    output = AudioConverter.wav_to_format(
+        _wav_bytes(), "flac", backends=[SoundfileEncoder()]
+    )
+
+    data, sample_rate = sf.read(io.BytesIO(output))
+    assert sample_rate == 44100
+    assert len(data) == 22050
+
+
+def test_soundfile_backend_resamples_opus_to_supported_rate():
+    encoder = SoundfileEncoder()
+    if not encoder.supports("opus"):
+        pytest.skip("libsndfile was built without Ogg/Opus")
+
+    output = AudioConverter.wav_to_format(_wav_bytes(), "opus", backends=[encoder])
+
+    assert output[:4] == b"OggS"
+    info = sf.info(io.BytesIO(output))
+    assert info.samplerate == 48000
+
+
+def test_soundfile_opus_matches_ffmpeg_bitrate():
+    encoder = SoundfileEncoder()
+    if not encoder.supports("opus"):
+        pytest.skip("libsndfile was built without Ogg/Opus")
+    # Noise keeps the variable bitrate near its target; at 24 kHz the
+    # libsndfile default would be about half of it
+    noise = 0.2 * np.random.default_rng(0).standard_normal(4 * 24000)
+    buffer = io.BytesIO()
+    sf.write(buffer, noise.astype(np.float32), 24000, format="WAV")
+
+    output = encoder.encode(buffer.getvalue(), "opus", 24000)
+
+    kbps = len(output) * 8 / 4 / 1000
+    assert 56 <= kbps <= 72
+
+
+@pytest.mark.parametrize("sample_rate", [44100, 24000])
+def test_soundfile_mp3_matches_lame_bitrate(sample_rate):
+    encoder = SoundfileEncoder()
+    if not encoder.supports("mp3"):
+        pytest.skip("libsndfile was built without MP3")
+    noise = 0.2 * np.random.default_rng(0).standard_normal(4 * sample_rate)
+    buffer = io.BytesIO()
+    sf.write(buffer, noise.astype(np.float32), sample_rate, format="WAV")
+
+    output = encoder.encode(buffer.getvalue(), "mp3", sample_rate)
+
+    kbps = len(output) * 8 / 4 / 1000
+    assert 120 <= kbps <= 136
+
+
+def test_falls_back_to_next_backend_on_failure():
+    output = AudioConverter.wav_to_format(
+        _wav_bytes(), "flac", backends=[_FailingEncoder(), SoundfileEncoder()]
+    )
+
+    assert output[:4] == b"fLaC"
+
+
+def test_wav_and_pcm_bypass_encoder_backends():
+    wav = _wav_bytes()
+
+    assert AudioConverter.wav_to_format(wav, "wav", backends=[]) == wav
+    assert len(AudioConverter.wav_to_format(wav, "pcm", backends=[])) == 22050 * 2
+
+
+def test_get_encoder_backends_skips_unknown_names():
+    backends = get_encoder_backends(["soundfile", "missing", "ffmpeg"])
+
+    assert [backend.name for backend in backends] == ["soundfile", "ffmpeg"]
@@ -0,0 +1,197 @@
+"""
+Tests for mid-inference cancellation in SupertonicTTS.
+"""
+
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from helper import CancellationToken, GenerationCancelled, SupertonicTTS
+
+
+class _FakeSession:
+    def __init__(self, fn):
+        self.fn = fn
+        self.batch_sizes = []
+
+    def run(self, output_names, feeds, run_options=None):
+        first = next(iter(feeds.values()))
+        self.batch_sizes.append(first.shape[0])
+        return self.fn(feeds)
+
+
+def _fake_tts(on_denoise=None) -> SupertonicTTS:
+    tts = object.__new__(SupertonicTTS)
+    hidden = 8
+
+    def encode(feeds):
+        batch, tokens = feeds["input_ids"].shape
+        return [
+            np.zeros((batch, tokens, hidden), dtype=np.float32),
+            np.full(batch, 0.1, dtype=np.float32),
+        ]
+
+    def denoise(feeds):
+        if on_denoise is not None:
+            on_denoise(feeds)
+        return [feeds["noisy_latents"] * 0.5]
+
+    def decode(feeds):
+        latents = feeds["latents"]
+        return [np.ones((latents.shape[0], latents.shape[2] * tts.LATENT_SIZE), dtype=np.float32)]
+
+    tts.text_encoder = _FakeSession(encode)
+    tts.latent_denoiser = _FakeSession(denoise)
+    tts.voice_decoder = _FakeSession(decode)
+    tts.latent_denoiser_loop = None
+    tts.latent_buckets = ()
+    return tts
+
+
+def _inputs(batch_size: int):
+    input_ids = np.ones((batch_size, 5), dtype=np.int64)
+    attn_mask = np.ones((batch_size, 5), dtype=np.int64)
+    style = np.zeros((batch_size, 4, SupertonicTTS.STYLE_DIM), dtype=np.float32)
+    return input_ids, attn_mask, style
+
+
+def test_cancelled_token_stops_between_denoiser_steps():
+    token = CancellationToken()
+    calls = []
+
+    def on_denoise(feeds):
+        calls.append(1)
+        if len(calls) == 3:
+            token.cancel()
+
+    tts = _fake_tts(on_denoise)
+    tokens = tts._normalize_cancel_tokens(token, 1)
+
+    with pytest.raises(GenerationCancelled):
+        tts._generate_cpu(*_inputs(1), 1.0, 10, tokens)
+
+    assert len(calls) == 3
+    assert tts.voice_decoder.batch_sizes == []
+
+
+def test_cancelled_items_are_dropped_from_shared_batch():
+    keep, drop = CancellationToken(), CancellationToken()
+
+    def on_denoise(feeds):
+        drop.cancel()
+
+    tts = _fake_tts(on_denoise)
+    results = tts._generate_cpu(*_inputs(2), 1.0, 4, [keep, drop])
+
+    # First step runs on the full batch, the rest only on the surviving item.
+    assert tts.latent_denoiser.batch_sizes == [2, 1, 1, 1]
+    assert tts.voice_decoder.batch_sizes == [1]
+    assert len(results[0]) > 0
+    assert len(results[1]) == 0
+
+
+def test_generate_without_tokens_runs_every_step():
+    tts = _fake_tts()
+
+    results = tts._generate_cpu(*_inputs(2), 1.0, 5)
+
+    assert tts.latent_denoiser.batch_sizes == [2] * 5
+    assert all(len(result) > 0 for result in results)
+
+
+def test_converged_items_exit_early_and_rejoin_for_decoding():
+    tts = _fake_tts()
+    input_ids, attn_mask, style = _inputs(2)
+    # Row 0 changes by 1% per step, row 1 by 50%
+    style[:, 0, 0] = [0.01, 0.5]
+
+    def denoise(feeds):
+        rate = feeds["style"][:, 0, 0][:, None, None]
+        return [feeds["noisy_latents"] * (1.0 - rate)]
+
+    tts.latent_denoiser = _FakeSession(denoise)
+    profile = {}
+    results = tts._generate_cpu(
+        input_ids, attn_mask, style, 1.0, 8, profile=profile, early_exit_tolerance=0.05
+    )
+
+    # Nobody exits before half the steps; then row 0 is frozen
+    assert tts.latent_denoiser.batch_sizes == [2, 2, 2, 2, 1, 1, 1, 1]
+    assert tts.voice_decoder.batch_sizes == [2]
+    assert profile["early_exit_items"] == 1
+    assert profile["early_exit_steps_saved"] == 4
+    assert all(len(result) > 0 for result in results)
+
+
+def test_fused_denoiser_runs_blocks_between_checks():
+    def fused_tts():
+        tts = _fake_tts()
+        blocks = []
+
+        def denoise_block(feeds):
+            blocks.append(int(feeds["num_steps"]))
+            return [feeds["noisy_latents"] * 0.5 ** int(feeds["num_steps"])]
+
+        tts.latent_denoiser_loop = _FakeSession(denoise_block)
+        return tts, blocks
+
+    tts, blocks = fused_tts()
+    profile = {}
+    tts._generate_cpu(*_inputs(1), 1.0, 10, profile=profile)
+    assert blocks == [10] and tts.latent_denoiser.batch_sizes == []
+    assert len(profile["denoise_step_seconds"]) == 10
+
+    # Cancellation is checked every FUSED_CANCEL_CHECK_STEPS steps
+    tts, blocks = fused_tts()
+    tts._generate_cpu(*_inputs(1), 1.0, 10, [CancellationToken()])
+    assert blocks == [4, 4, 2] and tts.latent_denoiser.batch_sizes == []
+
+    # Early exit needs single steps from min_steps on
+    tts, blocks = fused_tts()
+    tts._generate_cpu(*_inputs(1), 1.0, 10, early_exit_tolerance=0.01)
+    assert blocks == [4] and len(tts.latent_denoiser.batch_sizes) == 6
+
+
+def test_profiling_started_mid_generation_does_not_break_a_fused_block():
+    tts = _fake_tts()
+    blocks = []
+
+    def denoise_block(feeds):
+        blocks.append(int(feeds["num_steps"]))
+        return [feeds["noisy_latents"] * 0.5 ** int(feeds["num_steps"])]
+
+    tts.latent_denoiser_loop = _FakeSession(denoise_block)
+    tts._profiled_sessions = {}
+    profiled = _FakeSession(lambda feeds: [feeds["noisy_latents"] * 0.5])
+    profiled.get_profiling_start_time_ns = lambda: 0
+    tts._create_session_options = lambda backend: type("Options", (), {})()
+    tts._create_session = lambda name, sess_options=None: profiled
+    tts.backend = "cpu"
+    choose_block = tts._fused_block
+
+    def fused_block(*args):
+        block = choose_block(*args)
+        # Another executor thread starts a denoiser capture after this
+        # thread chose a fused block but before it runs it
+        if not blocks:
+            worker = threading.Thread(
+                target=tts.start_profiling, args=("latent_denoiser", "trace")
+            )
+            worker.start()
+            worker.join()
+        return block
+
+    tts._fused_block = fused_block
+    results = tts._generate_cpu(*_inputs(1), 1.0, 10, [CancellationToken()])
+
+    # The block already chosen still runs fused; later steps reach the
+    # profiled session one at a time
+    assert blocks == [4]
+    assert tts.latent_denoiser_loop is None
+    assert profiled.batch_sizes == [1] * 6
+    assert len(results[0]) > 0
@@ -8,6 +8,7 @@ import tempfile
 from unittest import mock
 
 import onnxruntime as ort
+import pytest
 
 sys.path.insert(0, os.path.dirname(__file__))
 
@@ -67,3 +68,49 @@ def test_init_passes_optimized_session_options_to_all_cpu_sessions():
             ort.GraphOptimizationLevel.ORT_ENABLE_ALL
         )
         assert session["sess_options"].intra_op_num_threads == 5
+
+
+def test_tuning_profile_sets_defaults_and_env_vars_win(tmp_path):
+    profile_path = tmp_path / "ort_profile.json"
+    profile_path.write_text(
+        '{"session_options": {"intra_op_num_threads": 6, "inter_op_num_threads": 2,'
+        ' "execution_mode": "parallel"}}'
+    )
+    env = {"SUPERTONIC_ORT_PROFILE": str(profile_path)}
+
+    with mock.patch.dict(os.environ, env, clear=False):
+        for name in ("OMP_NUM_THREADS", "ORT_INTRA_OP_NUM_THREADS", "ORT_INTER_OP_NUM_THREADS", "ORT_EXECUTION_MODE"):
+            os.environ.pop(name, None)
+        tuned = SupertonicTTS._create_session_options(use_gpu=False)
+        os.environ["ORT_INTRA_OP_NUM_THREADS"] = "3"
+        overridden = SupertonicTTS._create_session_options(use_gpu=False)
+
+    assert tuned.intra_op_num_threads == 6
+    assert tuned.inter_op_num_threads == 2
+    assert tuned.execution_mode == ort.ExecutionMode.ORT_PARALLEL
+    assert overridden.intra_op_num_threads == 3
+    assert overridden.inter_op_num_threads == 2
+
+
+def test_parse_cpu_list_accepts_taskset_syntax():
+    assert SupertonicTTS._parse_cpu_list("0-3, 8,10-11") == {0, 1, 2, 3, 8, 10, 11}
+
+
+def test_arena_env_vars_set_flags_and_shrink_cadence():
+    with mock.patch.dict(
+        os.environ, {"ORT_ENABLE_CPU_MEM_ARENA": "0", "ORT_ENABLE_MEM_PATTERN": "false"}, clear=False
+    ):
+        sess_options = SupertonicTTS._create_session_options(use_gpu=False)
+    assert not sess_options.enable_cpu_mem_arena
+    assert not sess_options.enable_mem_pattern
+
+    with mock.patch.dict(os.environ, {"ORT_ARENA_EXTEND_STRATEGY": "doubling"}, clear=False):
+        with pytest.raises(ValueError, match="ORT_ARENA_EXTEND_STRATEGY"):
+            SupertonicTTS._create_session_options(use_gpu=False)
+
+    tts = object.__new__(SupertonicTTS)
+    tts.arena_shrink_interval = 3
+    tts._generations_since_shrink = 0
+    tts._arena_lock = mock.MagicMock()
+    shrinks = [tts._arena_run_options() is not None for _ in range(6)]
+    assert shrinks == [False, False, True, False, False, True]
@@ -0,0 +1,205 @@
+"""
+Tests for the stand-in ONNX models used for hermetic tests and benchmarks.
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+onnx = pytest.importorskip("onnx")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_models import build_fake_models
+from helper import SupertonicTTS
+from api.src.services.tts_service import TTSService
+
+
+@pytest.fixture(scope="module")
+def fake_tts(tmp_path_factory):
+    model_dir = build_fake_models(str(tmp_path_factory.mktemp("fake-supertonic")))
+    return SupertonicTTS(model_dir)
+
+
+def test_fake_sessions_match_real_io_names(fake_tts):
+    def names(values):
+        return [value.name for value in values]
+
+    assert names(fake_tts.text_encoder.get_inputs()) == ["input_ids", "attention_mask", "style"]
+    assert names(fake_tts.text_encoder.get_outputs()) == ["last_hidden_state", "durations"]
+    assert names(fake_tts.latent_denoiser.get_inputs()) == [
+        "noisy_latents",
+        "latent_mask",
+        "style",
+        "encoder_outputs",
+        "attention_mask",
+        "timestep",
+        "num_inference_steps",
+    ]
+    assert names(fake_tts.latent_denoiser.get_outputs()) == ["denoised_latents"]
+    assert names(fake_tts.voice_decoder.get_outputs()) == ["waveform"]
+
+
+def test_generate_runs_batched_with_text_dependent_lengths(fake_tts):
+    profile = {}
+    short, long = fake_tts.generate(
+        ["Hi.", "A much longer sentence, with more characters."],
+        voice="F1",
+        steps=3,
+        profile=profile,
+    )
+
+    assert 0 < len(short) < len(long)
+    assert len(long) % SupertonicTTS.LATENT_SIZE == 0
+    assert np.isfinite(long).all()
+    assert profile["batch_size"] == 2
+    assert len(profile["denoise_step_seconds"]) == 3
+    assert profile["token_padding_ratio"] > 0
+
+
+def test_cost_scales_with_layers(tmp_path):
+    small = build_fake_models(str(tmp_path / "small"), denoiser_layers=1)
+    large = build_fake_models(str(tmp_path / "large"), denoiser_layers=6)
+
+    def matmuls(model_dir):
+        model = onnx.load(os.path.join(model_dir, "onnx", "latent_denoiser.onnx"))
+        return sum(node.op_type == "MatMul" for node in model.graph.node)
+
+    assert matmuls(large) == matmuls(small) + 5
+
+
+def test_service_streams_wav_chunks_from_fake_models(fake_tts):
+    service = TTSService()
+    service.tts_model = fake_tts
+    service._initialized = True
+
+    async def collect():
+        return [
+            chunk
+            async for chunk in service.generate_audio_stream(
+                "First sentence here. Second sentence follows.", total_steps=2
+            )
+        ]
+
+    chunks = asyncio.run(collect())
+
+    assert chunks
+    assert all(chunk[:4] == b"RIFF" for chunk in chunks)
+
+
+def test_precision_loads_quantized_variants_with_fp32_fallback(tmp_path):
+    from onnxruntime.quantization import quantize_dynamic
+
+    model_dir = build_fake_models(str(tmp_path))
+    onnx_dir = os.path.join(model_dir, "onnx")
+    quantize_dynamic(
+        os.path.join(onnx_dir, "latent_denoiser.onnx"),
+        os.path.join(onnx_dir, "latent_denoiser_int8_dynamic.onnx"),
+    )
+
+    tts = SupertonicTTS(model_dir, precision="int8")
+    wav, _ = tts("Quantized weights still speak.", "en", "M1", 2)
+
+    assert tts.precision == "int8_dynamic"
+    assert tts.session_precisions == {
+        "text_encoder": "fp32",
+        "latent_denoiser": "int8_dynamic",
+        "voice_decoder": "fp32",
+    }
+    assert np.isfinite(wav).all()
+    with pytest.raises(ValueError, match="Unknown precision"):
+        SupertonicTTS(model_dir, precision="fp8")
+
+
+def test_split_denoiser_matches_original_and_conditions_once(tmp_path):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+    from split_denoiser import split_denoiser
+
+    model_dir = build_fake_models(str(tmp_path))
+    original = SupertonicTTS(model_dir)
+    condition, step, report = split_denoiser(
+        onnx.load(os.path.join(model_dir, "onnx", "latent_denoiser.onnx"))
+    )
+    onnx.save(condition, os.path.join(model_dir, "onnx", "latent_denoiser_condition.onnx"))
+    onnx.save(step, os.path.join(model_dir, "onnx", "latent_denoiser_step.onnx"))
+    assert report["condition_heavy_ops"] > 0
+    assert "noisy_latents" not in report["condition_inputs"]
+
+    split = SupertonicTTS(model_dir)
+    assert split.split_denoiser and not original.split_denoiser
+    runs = []
+    conditioning = split.latent_denoiser.condition
+
+    class _CountingSession:
+        def run(self, *args):
+            runs.append(args)
+            return conditioning.run(*args)
+
+    split.latent_denoiser.condition = _CountingSession()
+
+    texts = ["Short one.", "A somewhat longer sentence to batch with it."]
+    np.random.seed(0)
+    expected = original.generate(texts, steps=4)
+    np.random.seed(0)
+    actual = split.generate(texts, steps=4)
+
+    assert len(runs) == 1
+    for a, b in zip(expected, actual):
+        np.testing.assert_allclose(a, b, atol=1e-5)
+
+
+def test_fused_denoiser_matches_step_by_step(tmp_path):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+    from fuse_denoiser import fuse_denoiser
+
+    model_dir = build_fake_models(str(tmp_path))
+    original = SupertonicTTS(model_dir)
+    fused, report = fuse_denoiser(onnx.load(os.path.join(model_dir, "onnx", "latent_denoiser.onnx")))
+    onnx.save(fused, os.path.join(model_dir, "onnx", "latent_denoiser_loop.onnx"))
+    assert report["hoisted_nodes"] > 0
+
+    looped = SupertonicTTS(model_dir)
+    assert looped.latent_denoiser_loop is not None
+    texts = ["Short one.", "A somewhat longer sentence to batch with it."]
+    np.random.seed(0)
+    expected = original.generate(texts, steps=6)
+    np.random.seed(0)
+    profile = {}
+    actual = looped.generate(texts, steps=6, profile=profile)
+
+    assert len(profile["denoise_step_seconds"]) == 6
+    for a, b in zip(expected, actual):
+        np.testing.assert_allclose(a, b, atol=1e-5)
+
+
+def test_shape_buckets_pad_to_fixed_lengths_without_changing_audio(tmp_path):
+    model_dir = build_fake_models(str(tmp_path))
+    plain = SupertonicTTS(model_dir)
+    bucketed = SupertonicTTS(model_dir, token_buckets=[16, 64], latent_buckets=[8, 64])
+    assert plain.token_buckets == () and bucketed.latent_buckets == (8, 64)
+
+    shapes = []
+    denoiser = bucketed.latent_denoiser
+
+    class _ShapeRecorder:
+        def run(self, output_names, feeds, *args):
+            shapes.append((feeds["attention_mask"].shape[1], feeds["noisy_latents"].shape[2]))
+            return denoiser.run(output_names, feeds, *args)
+
+    bucketed.latent_denoiser = _ShapeRecorder()
+    texts = ["Hi.", "A somewhat longer sentence, to land in another bucket."]
+    for text in texts:
+        np.random.seed(0)
+        expected = plain.generate([text], steps=2)[0]
+        np.random.seed(0)
+        actual = bucketed.generate([text], steps=2)[0]
+        np.testing.assert_allclose(expected, actual, atol=1e-5)
+
+    assert set(shapes) == {(16, 8), (64, 64)}
+    assert SupertonicTTS._bucket(70, (8, 64)) == 128
+    bucketed.latent_denoiser = denoiser
+    # Encoder per token bucket, denoiser per pair, decoder per latent bucket
+    assert bucketed.warmup_buckets() == 2 + 4 + 2
@@ -0,0 +1,110 @@
+"""
+Tests for the bounded inference executor and its admission control.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.src.services.inference_executor import InferenceExecutor, OverloadedError
+
+
+def test_runs_blocking_calls_off_the_event_loop():
+    executor = InferenceExecutor(max_workers=1)
+
+    async def run():
+        return await executor.run(lambda: threading.current_thread().name)
+
+    assert asyncio.run(run()).startswith("tts-inference")
+    assert executor.stats()["completed_total"] == 1
+
+
+def test_rejects_when_queue_is_full():
+    executor = InferenceExecutor(max_workers=1, max_queue=1, queue_timeout=5.0)
+    release = threading.Event()
+
+    async def run():
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(executor.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(OverloadedError) as excinfo:
+            await executor.run(lambda: "rejected")
+        depth = executor.queue_depth
+        release.set()
+        return excinfo.value, depth, await running, await queued
+
+    error, depth, _, queued_result = asyncio.run(run())
+
+    assert depth == 1
+    assert error.retry_after >= 1
+    assert queued_result == "queued"
+    assert executor.rejected_total == 1
+
+
+def test_rejects_after_queue_time_budget():
+    executor = InferenceExecutor(max_workers=1, max_queue=4, queue_timeout=0.05)
+    release = threading.Event()
+
+    async def run():
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.02)
+        with pytest.raises(OverloadedError):
+            await executor.run(lambda: "late")
+        depth_after_timeout = executor.queue_depth
+        release.set()
+        await running
+        # The slot is free again once the running call completes.
+        return depth_after_timeout, await executor.run(lambda: "next")
+
+    depth_after_timeout, result = asyncio.run(run())
+
+    assert depth_after_timeout == 0
+    assert result == "next"
+    assert executor.active == 0
+
+
+def test_unadmitted_calls_wait_without_deadline():
+    executor = InferenceExecutor(max_workers=1, max_queue=0, queue_timeout=0.01)
+    release = threading.Event()
+
+    async def run():
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.02)
+        waiting = asyncio.create_task(executor.run(lambda: "chunk", admission=False))
+        await asyncio.sleep(0.05)
+        release.set()
+        await running
+        return await waiting
+
+    assert asyncio.run(run()) == "chunk"
+
+
+def test_cancelled_request_keeps_its_slot_until_the_call_returns():
+    executor = InferenceExecutor(max_workers=1, max_queue=4, queue_timeout=5.0)
+    release = threading.Event()
+    started = []
+
+    async def run():
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        await asyncio.sleep(0.05)
+        # The worker thread is still busy, so the next call must wait
+        queued = asyncio.create_task(executor.run(lambda: started.append(True)))
+        await asyncio.sleep(0.05)
+        active, waiting, early = executor.active, executor.queue_depth, list(started)
+        release.set()
+        await queued
+        return active, waiting, early
+
+    active, waiting, early = asyncio.run(run())
+
+    assert (active, waiting, early) == (1, 1, [])
+    assert started == [True]
+    assert executor.active == 0
@@ -0,0 +1,72 @@
+"""
+Tests for the Prometheus metrics registry and the /metrics endpoint.
+"""
+
+import os
+import sys
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.src.core import metrics
+from api.src.main import app
+from helper import SupertonicTTS
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("test_latency_seconds", "Test", ["stage"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="a")
+    histogram.observe(0.5, stage="a")
+    histogram.observe(5.0, stage="a")
+
+    lines = histogram.samples()
+
+    assert 'test_latency_seconds_bucket{stage="a",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{stage="a",le="1.0"} 2' in lines
+    assert 'test_latency_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{stage="a"} 3' in lines
+
+
+def test_generate_profile_feeds_stage_histograms():
+    profile = {
+        "tokenize_seconds": 0.001,
+        "text_encoder_seconds": 0.01,
+        "denoise_step_seconds": [0.02, 0.02],
+        "voice_decoder_seconds": 0.03,
+        "generate_seconds": 0.1,
+        "batch_size": 1,
+        "token_padding_ratio": 0.0,
+        "latent_padding_ratio": 0.25,
+    }
+    metrics.observe_generation(profile, audio_seconds=1.0)
+
+    text = metrics.render()
+
+    assert 'supertonic_stage_seconds_count{stage="voice_decoder"}' in text
+    assert 'supertonic_denoise_step_seconds_count{step="1"}' in text
+    assert "supertonic_realtime_factor_count" in text
+
+
+def test_record_helpers_fill_profile():
+    profile = {}
+    SupertonicTTS._record_stage(profile, "text_encoder", 0.0)
+    SupertonicTTS._record_step(profile, 0.0)
+    SupertonicTTS._record_latent_padding(profile, np.array([[1.0, 1.0, 0.0, 0.0]]))
+
+    assert profile["text_encoder_seconds"] > 0
+    assert len(profile["denoise_step_seconds"]) == 1
+    assert profile["latent_padding_ratio"] == 0.5
+
+    # Without a profile dict the helpers are no-ops
+    SupertonicTTS._record_stage(None, "text_encoder", 0.0)
+
+
+def test_metrics_endpoint_serves_text_format():
+    client = TestClient(app)
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE" in response.text
@@ -0,0 +1,157 @@
+"""
+Tests for on-demand ONNX Runtime profiling.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import onnxruntime as ort
+import pytest
+
+onnx = pytest.importorskip("onnx")
+from onnx import TensorProto, helper as onnx_helper
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.src.core.server_timing import RequestTimings
+from api.src.routers.openai_compatible import _profiled
+from api.src.services.inference_executor import InferenceExecutor
+from api.src.services.ort_profiler import OrtProfiler, summarize_ort_trace
+from helper import SupertonicTTS
+
+
+def _tts_with_decoder(tmp_path) -> SupertonicTTS:
+    """SupertonicTTS whose voice_decoder is a tiny real ONNX model."""
+    graph = onnx_helper.make_graph(
+        [onnx_helper.make_node("Relu", ["latents"], ["waveform"])],
+        "voice_decoder",
+        [onnx_helper.make_tensor_value_info("latents", TensorProto.FLOAT, [None, 4])],
+        [onnx_helper.make_tensor_value_info("waveform", TensorProto.FLOAT, [None, 4])],
+    )
+    model = onnx_helper.make_model(graph, opset_imports=[onnx_helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    os.makedirs(tmp_path / "onnx")
+    onnx.save(model, str(tmp_path / "onnx" / "voice_decoder.onnx"))
+
+    tts = object.__new__(SupertonicTTS)
+    tts.model_path = str(tmp_path)
+    tts.backend = "cpu"
+    tts.precision = "fp32"
+    tts.session_precisions = {}
+    tts.providers = ["CPUExecutionProvider"]
+    tts._profiled_sessions = {}
+    tts.voice_decoder = tts._create_session("voice_decoder")
+    return tts
+
+
+def _decode(tts):
+    return tts.voice_decoder.run(None, {"latents": np.ones((1, 4), dtype=np.float32)})
+
+
+def test_start_and_stop_profiling_swaps_session(tmp_path):
+    tts = _tts_with_decoder(tmp_path)
+    original = tts.voice_decoder
+
+    origin = tts.start_profiling("voice_decoder", str(tmp_path / "trace"))
+    assert tts.voice_decoder is not original
+    assert abs(origin - time.perf_counter()) < 60
+    _decode(tts)
+    trace = tts.stop_profiling("voice_decoder")
+
+    assert tts.voice_decoder is original
+    assert os.path.exists(trace)
+    with pytest.raises(ValueError):
+        tts.start_profiling("vocoder", str(tmp_path / "trace"))
+
+
+def test_profiling_the_denoiser_suspends_the_fused_loop(tmp_path):
+    tts = _tts_with_decoder(tmp_path)
+    os.replace(tmp_path / "onnx" / "voice_decoder.onnx", tmp_path / "onnx" / "latent_denoiser.onnx")
+    tts.latent_denoiser = original = object()
+    tts.latent_denoiser_loop = loop = object()
+
+    tts.start_profiling("latent_denoiser", str(tmp_path / "trace"))
+    # Every step must reach the profiled copy, not the fused model
+    assert tts.latent_denoiser_loop is None
+    tts.stop_profiling("latent_denoiser")
+
+    assert tts.latent_denoiser is original
+    assert tts.latent_denoiser_loop is loop
+    assert tts._profiled_sessions == {}
+
+
+def test_capture_merges_python_spans_and_summarizes_ops(tmp_path):
+    tts = _tts_with_decoder(tmp_path)
+    profiler = OrtProfiler(InferenceExecutor(max_workers=1), str(tmp_path / "profiles"))
+
+    async def run():
+        await profiler.start(tts, "voice_decoder", requests=1)
+        timings = RequestTimings()
+        assert profiler.attach(timings)
+        assert not profiler.attach(RequestTimings())
+
+        profile = timings.new_profile()
+        start = time.perf_counter()
+        _decode(tts)
+        SupertonicTTS._record_stage(profile, "voice_decoder", start)
+
+        await profiler.release(timings)
+
+    asyncio.run(run())
+    result = profiler.last_result
+
+    assert not profiler.active
+    assert result["requests"] == 1
+    assert result["top_operators"][0]["op_type"] == "Relu"
+    with open(result["trace"]) as f:
+        events = json.load(f)["traceEvents"]
+    assert any(e.get("cat") == "Python" and e["name"] == "voice_decoder" for e in events)
+
+
+def test_cancelled_request_still_completes_the_capture(tmp_path):
+    tts = _tts_with_decoder(tmp_path)
+    service = type("Service", (), {})()
+    service.profiler = OrtProfiler(InferenceExecutor(max_workers=1), str(tmp_path / "profiles"))
+
+    async def request():
+        async with _profiled(service, RequestTimings()):
+            await asyncio.sleep(10)
+
+    async def run():
+        await service.profiler.start(tts, "voice_decoder", requests=1)
+        task = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.sleep(0)
+        # A second cancellation lands while the release is stopping the capture
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        for _ in range(100):
+            if service.profiler.last_result is not None:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+    assert not service.profiler.active
+    assert service.profiler.last_result["requests"] == 1
+
+
+def test_summary_ranks_operator_types_by_time():
+    events = [
+        {"cat": "Node", "name": "a_kernel_time", "dur": 10, "args": {"op_name": "MatMul"}},
+        {"cat": "Node", "name": "b_kernel_time", "dur": 30, "args": {"op_name": "Conv"}},
+        {"cat": "Node", "name": "c_kernel_time", "dur": 15, "args": {"op_name": "MatMul"}},
+        {"cat": "Session", "name": "model_run", "dur": 100},
+    ]
+
+    summary = summarize_ort_trace(events)
+
+    assert [row["op_type"] for row in summary] == ["Conv", "MatMul"]
+    assert summary[1]["calls"] == 2
+    assert summary[1]["nodes"] == 2
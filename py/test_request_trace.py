@@ -0,0 +1,67 @@
+"""
+Tests for the anonymized request trace.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+from api.src.core.config import settings
+from api.src.core.request_trace import RequestTrace
+from api.src.main import app
+from api.src.structures.schemas import OpenAISpeechRequest
+from test_tts_service import _FakeModel, _service
+
+
+TEXT = "Hello there, this is private."
+
+
+def test_trace_entry_never_contains_text(tmp_path):
+    request = OpenAISpeechRequest(input=TEXT, voice="F1", response_format="wav")
+
+    plain = RequestTrace(str(tmp_path / "plain.jsonl")).entry(request, "default", 200)
+    hashed = RequestTrace(str(tmp_path / "hashed.jsonl"), hash_text=True, salt="s").entry(
+        request, "default", 200
+    )
+
+    assert TEXT not in json.dumps(plain)
+    assert plain["input_chars"] == len(TEXT)
+    assert plain["input_words"] == 5
+    assert plain["voice"] == "F1"
+    assert "text_sha256" not in plain
+    assert hashed["text_sha256"] == hashlib.sha256(("s" + TEXT).encode()).hexdigest()
+
+
+def test_router_appends_one_line_per_request(tmp_path):
+    service = _service(_FakeModel())
+
+    async def get_service():
+        return service
+
+    async def voices():
+        return ["M1"]
+
+    service.get_available_voices = voices
+    path = tmp_path / "trace" / "requests.jsonl"
+    client = TestClient(app)
+    with mock.patch.object(settings, "request_trace_path", str(path)), mock.patch(
+        "api.src.routers.openai_compatible.get_tts_service", get_service
+    ):
+        payload = {"input": TEXT, "response_format": "wav"}
+        assert client.post("/v1/audio/speech", json={**payload, "stream": False}).status_code == 200
+        assert client.post("/v1/audio/speech", json={**payload, "stream": True}).status_code == 200
+        assert client.post("/v1/audio/speech", json={**payload, "voice": "X9"}).status_code == 400
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert [(r["stream"], r["status"]) for r in records] == [(False, 200), (True, 200), (True, 400)]
+    assert records[0]["chunks"] == 1
+    assert records[0]["audio_seconds"] > 0
+    assert all(r["input_chars"] == len(TEXT) for r in records)
+    assert TEXT not in path.read_text()
@@ -0,0 +1,96 @@
+"""
+Tests for priority classes and weighted fair queuing.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.src.services.inference_executor import InferenceExecutor
+from api.src.services.scheduler import FairScheduler, parse_client_weights
+
+
+def _drain(scheduler: FairScheduler) -> list:
+    order = []
+    while scheduler:
+        order.append(scheduler.pop())
+    return order
+
+
+def test_higher_priority_class_runs_first():
+    scheduler = FairScheduler()
+    scheduler.push("bulk-1", priority="bulk")
+    scheduler.push("default-1")
+    scheduler.push("interactive-1", priority="interactive")
+
+    assert _drain(scheduler) == ["interactive-1", "default-1", "bulk-1"]
+
+
+def test_clients_share_a_class_fairly():
+    scheduler = FairScheduler()
+    for index in range(4):
+        scheduler.push(f"heavy-{index}", client_id="heavy", cost=300)
+    scheduler.push("light-0", client_id="light", cost=300)
+    scheduler.push("light-1", client_id="light", cost=300)
+
+    order = _drain(scheduler)
+
+    # The light client is interleaved instead of waiting behind all heavy chunks.
+    assert order.index("light-0") <= 1
+    assert order.index("light-1") <= 3
+
+
+def test_client_weights_skew_the_share():
+    scheduler = FairScheduler({"gold": 3.0})
+    for index in range(3):
+        scheduler.push(f"gold-{index}", client_id="gold", cost=100)
+        scheduler.push(f"std-{index}", client_id="std", cost=100)
+
+    order = _drain(scheduler)
+
+    assert order[:3].count("std-0") == 1
+    assert sum(item.startswith("gold") for item in order[:4]) == 3
+
+
+def test_remove_drops_a_waiting_item():
+    scheduler = FairScheduler()
+    scheduler.push("a")
+    scheduler.push("b")
+    scheduler.remove("a")
+
+    assert len(scheduler) == 1
+    assert _drain(scheduler) == ["b"]
+
+
+def test_parse_client_weights_ignores_invalid_entries():
+    assert parse_client_weights("a=2, b=0.5,c=x,d=-1,e") == {"a": 2.0, "b": 0.5}
+
+
+def test_executor_preempts_bulk_chunks_for_interactive_work():
+    executor = InferenceExecutor(max_workers=1, max_queue=8)
+    release = threading.Event()
+    order = []
+
+    async def run():
+        blocker = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.02)
+        bulk = [
+            asyncio.create_task(
+                executor.run(lambda i=i: order.append(f"bulk-{i}"), priority="bulk")
+            )
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.02)
+        interactive = asyncio.create_task(
+            executor.run(lambda: order.append("interactive"), priority="interactive")
+        )
+        await asyncio.sleep(0.02)
+        release.set()
+        await asyncio.gather(blocker, interactive, *bulk)
+
+    asyncio.run(run())
+
+    assert order[0] == "interactive"
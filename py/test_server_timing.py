@@ -0,0 +1,90 @@
+"""
+Tests for Server-Timing headers and stream trailers.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.src.core.server_timing import RequestTimings, TimedStreamingResponse
+from test_tts_service import _FakeModel, _service
+
+
+def test_timings_sum_chunk_profiles():
+    timings = RequestTimings()
+    for _ in range(2):
+        timings.add_profile(
+            {
+                "queue_seconds": 0.5,
+                "text_encoder_seconds": 0.01,
+                "denoise_step_seconds": [0.1, 0.1, 0.1],
+                "voice_decoder_seconds": 0.02,
+                "generate_seconds": 0.35,
+            },
+            audio_seconds=1.5,
+        )
+    timings.add_profile({"convert_seconds": 0.004})
+    timings.mark_first_chunk()
+
+    header = timings.header()
+
+    assert "queue;dur=1000.0" in header
+    assert "denoise;dur=600.0" in header
+    assert "convert;dur=4.0" in header
+    assert 'audio;desc="3.000s"' in header
+    assert 'steps;desc="3"' in header
+    assert "ttfc;dur=" in header
+    assert timings.chunks == 2
+
+
+def test_generate_audio_fills_request_timings():
+    service = _service(_FakeModel())
+    timings = RequestTimings()
+
+    asyncio.run(service.generate_audio("Hello there.", timings=timings))
+
+    assert timings.chunks == 1
+    assert timings.audio_seconds > 0
+
+
+def _run_stream(extensions):
+    async def body():
+        yield b"first"
+        yield b"second"
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def receive():
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    timings = RequestTimings()
+    response = TimedStreamingResponse(body(), timings, media_type="audio/pcm")
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}, "extensions": extensions}
+    asyncio.run(response(scope, receive, send))
+    return messages
+
+
+def test_stream_sends_server_timing_with_first_chunk():
+    messages = _run_stream({})
+
+    start = messages[0]
+    headers = dict(start["headers"])
+    assert start["type"] == "http.response.start"
+    assert b"queue;dur=" in headers[b"server-timing"]
+    assert b"trailer" not in headers
+    assert [m.get("body") for m in messages[1:]] == [b"first", b"second", b""]
+
+
+def test_stream_sends_trailers_when_supported():
+    messages = _run_stream({"http.response.trailers": {}})
+
+    assert messages[0]["trailers"] is True
+    assert dict(messages[0]["headers"])[b"trailer"] == b"Server-Timing"
+    assert messages[-1]["type"] == "http.response.trailers"
+    assert messages[-1]["headers"][0][0] == b"server-timing"
@@ -0,0 +1,87 @@
+"""
+Tests for the adaptive denoising step controller.
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.src.core.server_timing import RequestTimings
+from api.src.services.step_controller import StepController
+from test_tts_service import _service
+
+
+class _Executor:
+    max_workers = 1
+    queue_depth = 0
+
+
+def _profile(steps: int, step_seconds: float, overhead: float = 0.0) -> dict:
+    return {
+        "denoise_step_seconds": [step_seconds] * steps,
+        "generate_seconds": steps * step_seconds + overhead,
+    }
+
+
+def test_full_steps_until_latency_is_known_or_when_disabled():
+    executor = _Executor()
+    executor.queue_depth = 10
+
+    assert StepController(executor, slo_seconds=1.0, floor=4).steps_for(15, 100) == 15
+
+    disabled = StepController(executor, slo_seconds=1.0, floor=4, enabled=False)
+    disabled.observe(_profile(15, 0.1), 100)
+    assert disabled.steps_for(15, 100) == 15
+
+
+def test_steps_drop_within_floor_under_load_and_recover_gradually():
+    executor = _Executor()
+    controller = StepController(executor, slo_seconds=1.5, floor=4, max_increase=2)
+    # 0.1 s per step for a 100-character chunk: 15 steps fit the SLO when idle
+    controller.observe(_profile(15, 0.1), 100)
+    assert controller.steps_for(15, 100) == 15
+
+    # Two chunks queued: the budget drops to a third of the SLO
+    executor.queue_depth = 2
+    assert controller.steps_for(15, 100) == 5
+    # A chunk that already waited past the SLO gets the floor
+    assert controller.steps_for(15, 100, waited=2.0) == 4
+    assert controller.cap == 4
+
+    executor.queue_depth = 0
+    assert [controller.steps_for(15, 100) for _ in range(6)] == [6, 8, 10, 12, 14, 15]
+    assert controller.cap is None
+    # Requests asking for fewer steps than the floor keep them
+    executor.queue_depth = 5
+    assert controller.steps_for(3, 100) == 3
+
+
+class _SteppingModel:
+    sample_rate = 44100
+
+    def __init__(self):
+        self.steps = []
+
+    def generate(self, text, *, steps=15, profile=None, **kwargs):
+        self.steps.append(steps)
+        if profile is not None:
+            profile.update(_profile(steps, 0.05))
+        return [np.zeros(441, dtype=np.float32) for _ in text]
+
+
+def test_service_reports_reduced_steps_in_timings():
+    model = _SteppingModel()
+    service = _service(model)
+    service.step_controller = StepController(service.executor, slo_seconds=0.01, floor=5)
+    service.step_controller.observe(_profile(10, 0.05), 12)
+    timings = RequestTimings()
+
+    asyncio.run(service.generate_audio("Short input.", total_steps=10, timings=timings))
+
+    assert model.steps == [5]
+    assert timings.steps_used == 5
+    assert 'steps;desc="5"' in timings.header()
@@ -0,0 +1,114 @@
+"""
+Tests for TTSService scheduling behaviour, using a stand-in model.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.src.core.config import settings
+from api.src.services.tts_service import TTSService
+
+
+class _FakeModel:
+    """Minimal stand-in for SupertonicTTS.generate."""
+
+    sample_rate = 44100
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self.chunks = []
+        self.steps = []
+        self._lock = threading.Lock()
+
+    def generate(self, text, *, voice="M1", speed=1.0, steps=15, language="en", **kwargs):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            self.chunks.extend(text)
+            self.steps.append(steps)
+        return [np.zeros(441, dtype=np.float32) for _ in text]
+
+
+def _service(model) -> TTSService:
+    service = TTSService()
+    service.tts_model = model
+    service._initialized = True
+    return service
+
+
+def _patched_chunks(count: int):
+    """Force chunk_text to split LONG_TEXT into `count` chunks."""
+    chunks = [f"Chunk {i}." for i in range(count)]
+    return mock.patch(
+        "api.src.services.tts_service.chunk_text",
+        side_effect=lambda text, max_len=300: chunks if text == LONG_TEXT else [text],
+    )
+
+
+LONG_TEXT = " ".join(f"Sentence number {i} is here." for i in range(6))
+
+
+def test_stream_synthesizes_ahead_of_consumer():
+    model = _FakeModel()
+    service = _service(model)
+
+    async def run():
+        stream = service.generate_audio_stream(LONG_TEXT, lookahead=2)
+        first = await stream.__anext__()
+        # Give the background producer time to fill the lookahead queue.
+        await asyncio.sleep(0.1)
+        produced = model.calls
+        await stream.aclose()
+        return first, produced
+
+    with _patched_chunks(6):
+        first, produced = asyncio.run(run())
+
+    assert first[:4] == b"RIFF"
+    # One chunk consumed, two buffered, one in flight blocked on the full queue.
+    assert produced >= 3
+    assert produced < 6
+
+
+def test_closing_stream_stops_background_synthesis():
+    model = _FakeModel(delay=0.02)
+    service = _service(model)
+
+    async def run():
+        stream = service.generate_audio_stream(LONG_TEXT, lookahead=1)
+        await stream.__anext__()
+        await stream.aclose()
+        calls_at_close = model.calls
+        await asyncio.sleep(0.2)
+        return calls_at_close, model.calls
+
+    with _patched_chunks(6):
+        calls_at_close, calls_later = asyncio.run(run())
+
+    # At most the in-flight chunk finishes after the consumer went away.
+    assert calls_later <= calls_at_close + 1
+
+
+def test_stream_step_schedule_speeds_up_first_chunk():
+    async def collect(service, **kwargs):
+        return [wav async for wav in service.generate_audio_stream(LONG_TEXT, **kwargs)]
+
+    model = _FakeModel()
+    with _patched_chunks(4):
+        asyncio.run(collect(_service(model), step_schedule=[5, 10, 15], lookahead=2))
+    # The last entry repeats for the remaining chunks
+    assert model.steps == [5, 10, 15, 15]
+
+    model = _FakeModel()
+    with _patched_chunks(3), mock.patch.object(settings, "stream_first_chunk_steps", 6):
+        asyncio.run(collect(_service(model), total_steps=12, lookahead=0))
+    assert model.steps == [6, 12, 12]
@@ -7,6 +7,8 @@ ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 export ONNX_DIR="${ONNX_DIR:-${ROOT_DIR}/assets}"
 export SUPERTONIC_ORT_BACKEND="${SUPERTONIC_ORT_BACKEND:-openvino}"
 export OPENVINO_DEVICE="${OPENVINO_DEVICE:-GPU}"
+# Compiled shape buckets are cached here across restarts (OPENVINO_DEVICE=CPU works without an iGPU)
+export OPENVINO_CACHE_DIR="${OPENVINO_CACHE_DIR:-${HOME}/.cache/supertonic/openvino}"
 export USE_GPU=false
 
 cd "${ROOT_DIR}/py"